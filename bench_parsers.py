@@ -0,0 +1,69 @@
+"""
+Compare parse throughput of the available parser backends.
+
+By default the pages in tests/fixtures are used; pass --archive to measure
+against a real crawl recorded with get_mutual_fund_details.py --archive.
+
+    python bench_parsers.py --archive crawl.jsonl.gz --limit 200
+"""
+import argparse
+import glob
+import itertools
+import os
+import time
+
+from get_mutual_fund_details import FundScraper, available_parser_backends
+from page_archive import iter_archive
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tests', 'fixtures', '*.html')
+
+
+def load_pages(archive=None, limit=None):
+    if archive:
+        pages = [html for _, html in itertools.islice(iter_archive(archive), limit)]
+    else:
+        pages = []
+        for path in sorted(glob.glob(FIXTURES)):
+            with open(path, 'r', encoding='utf-8') as f:
+                pages.append(f.read())
+    return pages
+
+
+def bench(backend, pages, iterations):
+    scraper = FundScraper(parser_backend=backend)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for html in pages:
+            scraper._parse_html(html)
+    elapsed = time.perf_counter() - start
+    return len(pages) * iterations / elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark HTML parser backends on fund pages.")
+    parser.add_argument('--archive', help="Page archive to benchmark against instead of the test fixtures")
+    parser.add_argument('--limit', type=int, default=None, help="Use at most this many archived pages")
+    parser.add_argument('--iterations', type=int, default=20, help="Passes over the page set (default: 20)")
+    args = parser.parse_args(argv)
+
+    pages = load_pages(args.archive, args.limit)
+    if not pages:
+        print("No pages to benchmark.")
+        return
+
+    backends = available_parser_backends()
+    reference = [FundScraper(parser_backend='html.parser')._parse_html(html) for html in pages]
+    print(f"{len(pages)} pages x {args.iterations} iterations")
+    print(f"{'backend':<12} {'pages/s':>10} {'speedup':>8} {'mismatches':>11}")
+
+    baseline = None
+    for backend in backends:
+        scraper = FundScraper(parser_backend=backend)
+        mismatches = sum(scraper._parse_html(html) != ref for html, ref in zip(pages, reference))
+        rate = bench(backend, pages, args.iterations)
+        baseline = baseline or rate
+        print(f"{backend:<12} {rate:>10.1f} {rate / baseline:>7.2f}x {mismatches:>11}")
+
+
+if __name__ == "__main__":
+    main()
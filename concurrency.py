@@ -0,0 +1,133 @@
+import logging
+import statistics
+import threading
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+# How a page went, as reported to AimdController.release().
+OUTCOMES = ("ok", "error", "blocked")
+
+DEFAULT_MIN_LIMIT = 1
+DEFAULT_MAX_LIMIT = 16
+
+# Window medians remembered for the latency baseline; the best of them is
+# the baseline, so it follows the network if it gets slower for good.
+BASELINE_WINDOWS = 10
+
+
+class AimdController:
+    """
+    Additive-increase/multiplicative-decrease limit on the pages in flight.
+
+    Workers take a slot with acquire() (or try_acquire()) before fetching a
+    page and give it back with release(), reporting the page's latency and
+    outcome. Outcomes are judged a window at a time, a window being as many
+    pages as the current limit: a window with at most error_threshold
+    errors and a median latency within latency_factor of the baseline
+    raises the limit by one; any other window multiplies it by `decrease`.
+    A blocked page (throttled or served an empty or bot page) cuts the
+    limit at once.
+
+    Pages started before the last cut were slowed or blocked by the old
+    limit, so their outcomes are dropped instead of cutting it again.
+    """
+
+    def __init__(self, initial, min_limit=DEFAULT_MIN_LIMIT, max_limit=DEFAULT_MAX_LIMIT, decrease=0.5,
+                 latency_factor=2.0, error_threshold=0.2):
+        if not 1 <= min_limit <= max_limit:
+            raise ValueError("need 1 <= min_limit <= max_limit")
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.decrease = decrease
+        self.latency_factor = latency_factor
+        self.error_threshold = error_threshold
+        self.limit = min(max(initial, min_limit), max_limit)
+        self.active = 0
+        self.lowest = self.highest = self.limit
+        self.increases = 0
+        self.decreases = 0
+        self._cond = threading.Condition()
+        self._started = 0  # pages started so far; each slot's ticket
+        self._cut_at = 0  # _started when the limit was last cut
+        self._window = []  # (latency, outcome) since the last change
+        self._medians = deque(maxlen=BASELINE_WINDOWS)
+
+    def acquire(self):
+        """
+        Block until fewer than `limit` pages are in flight; returns the
+        ticket to hand back to release().
+        """
+        with self._cond:
+            while self.active >= self.limit:
+                self._cond.wait()
+            return self._start()
+
+    def try_acquire(self):
+        """
+        Like acquire(), but return None instead of waiting for a slot.
+        """
+        with self._cond:
+            if self.active >= self.limit:
+                return None
+            return self._start()
+
+    def _start(self):
+        self.active += 1
+        self._started += 1
+        return self._started
+
+    def release(self, ticket, latency=None, outcome=None):
+        """
+        Free the slot taken as ticket. outcome is one of OUTCOMES, or None
+        for a slot that fetched nothing (e.g. the queue ran dry).
+        """
+        with self._cond:
+            self.active -= 1
+            if outcome is not None and ticket > self._cut_at:
+                self._observe(latency, outcome)
+            self._cond.notify_all()
+
+    def _observe(self, latency, outcome):
+        if outcome == "blocked":
+            self._set_limit(self.limit * self.decrease, "page blocked")
+            return
+
+        self._window.append((latency, outcome))
+        if len(self._window) < self.limit:
+            return
+
+        window, self._window = self._window, []
+        errors = sum(1 for _, o in window if o != "ok")
+        latencies = [l for l, o in window if o == "ok" and l is not None]
+        median = statistics.median(latencies) if latencies else None
+        baseline = min(self._medians) if self._medians else None
+        if median is not None:
+            self._medians.append(median)
+
+        if errors / len(window) > self.error_threshold:
+            self._set_limit(self.limit * self.decrease, f"{errors}/{len(window)} pages failed")
+        elif median is not None and baseline is not None and median > baseline * self.latency_factor:
+            self._set_limit(self.limit * self.decrease,
+                            f"median page time {median:.1f}s vs {baseline:.1f}s baseline")
+        else:
+            self._set_limit(self.limit + 1, "window healthy")
+
+    def _set_limit(self, limit, reason):
+        limit = min(max(int(limit), self.min_limit), self.max_limit)
+        if limit == self.limit:
+            return
+        if limit > self.limit:
+            self.increases += 1
+        else:
+            self.decreases += 1
+            self._cut_at = self._started
+        logger.info(f"Concurrency {self.limit} -> {limit} ({reason}); {self.active} pages in flight")
+        self.limit = limit
+        self.lowest = min(self.lowest, limit)
+        self.highest = max(self.highest, limit)
+        self._window = []
+
+    def summary(self):
+        return (f"Concurrency ended at {self.limit} pages in flight (range {self.lowest}-{self.highest}; "
+                f"{self.increases} increases, {self.decreases} decreases)")
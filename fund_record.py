@@ -0,0 +1,92 @@
+import sys
+from collections.abc import Mapping
+
+import pandas as pd
+
+NA = "NA"
+
+FIELDS = (
+    'Fund Name', 'Fund Type', 'AUM',
+    '1Y Fund Return', '1Y Category Avg', '1Y Rank',
+    '3Y Fund Return', '3Y Category Avg', '3Y Rank',
+    '5Y Fund Return', '5Y Category Avg', '5Y Rank',
+    'All Fund Return', 'All Category Avg', 'All Rank',
+    'P/E Ratio', 'P/B Ratio', 'Alpha', 'Beta', 'Sharpe', 'Sortino',
+    'Expense Ratio', 'Exit Load', 'Benchmark', 'Fund Managers', 'URL'
+)
+FIELD_INDEX = {field: i for i, field in enumerate(FIELDS)}
+
+# Fields whose values repeat across many funds (a category, an AMC's exit
+# load, a benchmark index) share one string object per distinct value.
+INTERNED_FIELDS = frozenset({
+    'Fund Type', 'Benchmark', 'Exit Load', 'Expense Ratio', 'Fund Managers',
+    '1Y Category Avg', '3Y Category Avg', '5Y Category Avg', 'All Category Avg',
+})
+_INTERNED_SLOTS = frozenset(FIELD_INDEX[field] for field in INTERNED_FIELDS)
+
+
+def _store(index, value):
+    if value == NA:
+        return NA
+    if index in _INTERNED_SLOTS and type(value) is str:
+        return sys.intern(value)
+    return value
+
+
+class FundRecord(Mapping):
+    """
+    One fund's fields as a fixed-size list in FIELDS order, read like a
+    dict. Unset fields are "NA"; keys outside FIELDS are rejected.
+
+    A record costs one small list instead of a 26-key dict, pickles as a
+    bare tuple of values, and converts to a DataFrame row without any
+    per-key lookups (see records_frame).
+    """
+    __slots__ = ('_values',)
+
+    def __init__(self, values=None):
+        self._values = [NA] * len(FIELDS)
+        if values:
+            self.update(values)
+
+    @classmethod
+    def _from_values(cls, values):
+        record = cls.__new__(cls)
+        record._values = [_store(i, value) for i, value in enumerate(values)]
+        return record
+
+    def __reduce__(self):
+        return FundRecord._from_values, (tuple(self._values),)
+
+    def __getitem__(self, field):
+        return self._values[FIELD_INDEX[field]]
+
+    def __setitem__(self, field, value):
+        index = FIELD_INDEX[field]
+        self._values[index] = _store(index, value)
+
+    def __iter__(self):
+        return iter(FIELDS)
+
+    def __len__(self):
+        return len(FIELDS)
+
+    def __repr__(self):
+        return f"FundRecord({self.to_dict()!r})"
+
+    def update(self, values):
+        for field, value in values.items():
+            self[field] = value
+
+    def to_dict(self):
+        return dict(zip(FIELDS, self._values))
+
+
+def records_frame(records):
+    """
+    Build the results DataFrame in one step; FundRecords contribute their
+    value lists directly, plain dicts are accepted too.
+    """
+    if all(isinstance(record, FundRecord) for record in records):
+        return pd.DataFrame.from_records([record._values for record in records], columns=FIELDS)
+    return pd.DataFrame([record.to_dict() if isinstance(record, FundRecord) else record for record in records])
@@ -0,0 +1,129 @@
+import json
+import sqlite3
+import threading
+import time
+
+from fund_record import FIELDS, FundRecord
+
+FUND_STATE_FILE = "fund_state.db"
+DEFAULT_REFRESH_TTL_HOURS = 72
+
+# Fields expected to move rarely. A change to one of them is news, so the
+# fund is scraped again on the next incremental run whatever its age;
+# returns, AUM and ratios change daily and only count towards the history.
+STABLE_FIELDS = ('Fund Name', 'Fund Type', 'Expense Ratio', 'Exit Load', 'Benchmark', 'Fund Managers')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS funds (
+    url TEXT PRIMARY KEY,
+    record TEXT NOT NULL,
+    first_scraped REAL NOT NULL,
+    last_scraped REAL NOT NULL,
+    last_changed REAL NOT NULL,
+    stable_changed INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS field_changes (
+    url TEXT NOT NULL,
+    field TEXT NOT NULL,
+    old_value TEXT,
+    new_value TEXT,
+    changed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS field_changes_url ON field_changes (url, changed_at);
+"""
+
+
+class FundState:
+    """
+    Per-fund scrape state kept in SQLite across runs.
+
+    For every fund URL it stores the latest record, when the fund was first
+    and last scraped, when any field last changed and whether a
+    STABLE_FIELDS value changed on the last scrape; every field change is
+    appended to field_changes with its old and new value. due() uses this
+    to pick the funds an incremental run has to scrape.
+    """
+
+    def __init__(self, path=FUND_STATE_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def record(self, records, now=None):
+        """
+        Store freshly scraped records; returns {url: [changed fields]} for
+        the funds that were already known.
+        """
+        now = time.time() if now is None else now
+        changes = {}
+        with self._lock, self._conn:
+            for record in records:
+                url = record["URL"]
+                values = {field: record.get(field, "NA") for field in FIELDS}
+                row = self._conn.execute("SELECT record, last_changed FROM funds WHERE url = ?", (url,)).fetchone()
+                if row is None:
+                    self._conn.execute(
+                        "INSERT INTO funds VALUES (?, ?, ?, ?, ?, 0)", (url, json.dumps(values), now, now, now))
+                    continue
+
+                old = json.loads(row[0])
+                changed = [field for field in FIELDS if old.get(field, "NA") != values[field]]
+                self._conn.executemany(
+                    "INSERT INTO field_changes VALUES (?, ?, ?, ?, ?)",
+                    [(url, field, _text(old.get(field)), _text(values[field]), now) for field in changed])
+                self._conn.execute(
+                    "UPDATE funds SET record = ?, last_scraped = ?, last_changed = ?, stable_changed = ? "
+                    "WHERE url = ?",
+                    (json.dumps(values), now, now if changed else row[1],
+                     int(any(field in STABLE_FIELDS for field in changed)), url))
+                changes[url] = changed
+        return changes
+
+    def due(self, urls, ttl, now=None):
+        """
+        The urls an incremental run should scrape, in order: never scraped,
+        last scraped more than ttl seconds ago, or with a STABLE_FIELDS
+        change on their last scrape.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            known = dict(self._conn.execute(
+                "SELECT url, last_scraped < ? OR stable_changed FROM funds", (now - ttl,)).fetchall())
+        return [url for url in urls if known.get(url, True)]
+
+    def records(self, urls):
+        """
+        The stored records of urls, as {url: FundRecord}; unknown urls are left out.
+        """
+        wanted = set(urls)
+        with self._lock:
+            rows = self._conn.execute("SELECT url, record FROM funds").fetchall()
+        return {url: FundRecord(json.loads(record)) for url, record in rows if url in wanted}
+
+    def history(self, url):
+        """
+        Every recorded change of url's fields, oldest first, as
+        (field, old value, new value, changed_at) tuples.
+        """
+        with self._lock:
+            return self._conn.execute(
+                "SELECT field, old_value, new_value, changed_at FROM field_changes WHERE url = ? "
+                "ORDER BY changed_at, rowid", (url,)).fetchall()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def _text(value):
+    if value is None or isinstance(value, str):
+        return value
+    return json.dumps(value)
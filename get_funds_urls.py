@@ -1,31 +1,168 @@
+import argparse
+import asyncio
+import logging
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
 
-# Initialize a set to keep track of unique URLs
-unique_links = set()
+from rate_limiter import DEFAULT_BURST, DEFAULT_RATE, RateLimiter
 
-with open("mutual_funds_links.txt", 'w') as f:
-    # Fetch the first page and extract links
-    page = requests.get("https://groww.in/mutual-funds/filter")
-    soup = BeautifulSoup(page.text, 'html.parser')
-    rows = soup.find_all('a', attrs={'class': 'pos-rel f22Link'})
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
 
-    # Add unique links to the file
-    for row in rows:
-        link = f"https://groww.in{row.get('href')}"
+BASE_URL = "https://groww.in"
+FILTER_URL = f"{BASE_URL}/mutual-funds/filter"
+PAGE_URL = FILTER_URL + "?q=&fundSize=&pageNo={page_number}&sortBy=3"
+LINK_CLASS = 'pos-rel f22Link'
+OUTPUT_FILE = "mutual_funds_links.txt"
+
+# Discovery stops at the first page without new links; this is only a
+# ceiling in case the listing ever starts repeating itself forever.
+MAX_PAGES = 1000
+
+
+def create_session(pool_size=8):
+    """
+    Build a requests.Session whose keep-alive pool is large enough for
+    pool_size concurrent page fetches.
+    """
+    session = requests.Session()
+    retries = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retries)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def fetch_page(session, url, rate_limiter=None):
+    if rate_limiter is not None:
+        rate_limiter.acquire(url)
+    response = session.get(url, timeout=20)
+    response.raise_for_status()
+    return response.text
+
+
+def extract_links(html):
+    soup = BeautifulSoup(html, 'html.parser')
+    rows = soup.find_all('a', attrs={'class': LINK_CLASS})
+    return [f"{BASE_URL}{row.get('href')}" for row in rows]
+
+
+def record_links(links, unique_links, f):
+    """
+    Write links not seen before to f and return how many were new.
+    """
+    new_links = 0
+    for link in links:
+        # Only add if it's not already in the set
         if link not in unique_links:
             unique_links.add(link)
             f.write(f"{link}\n")
+            new_links += 1
+    return new_links
+
+
+def adds_page_links(links, page_links):
+    """
+    Add links to page_links, the links seen on pageNo pages so far, and
+    return whether any were new. The filter page is left out of this: it
+    usually lists the same funds as page 0, and counting it would end
+    discovery after a single page.
+    """
+    new = set(links) - page_links
+    page_links.update(new)
+    return bool(new)
+
+
+def discover_sequential(session, f, max_pages=MAX_PAGES, rate_limiter=None):
+    """
+    Fetch the filter page and then each pageNo page one at a time.
+    """
+    unique_links = set()
+    record_links(extract_links(fetch_page(session, FILTER_URL, rate_limiter)), unique_links, f)
+
+    page_links = set()
+    for page_number in range(max_pages):
+        links = extract_links(fetch_page(session, PAGE_URL.format(page_number=page_number), rate_limiter))
+        record_links(links, unique_links, f)
+        if not adds_page_links(links, page_links):
+            logger.info(f"No new links on page {page_number}, stopping.")
+            break
+    return unique_links
+
+
+async def discover_async(session, f, concurrency=8, max_pages=MAX_PAGES, rate_limiter=None):
+    """
+    Fetch pageNo pages in windows of `concurrency` concurrent requests over
+    the session's shared connection pool.
+
+    Pages are recorded in page order, so the output file matches the
+    sequential crawl, and discovery stops at the first page that adds no
+    links beyond the earlier pageNo pages. At most concurrency - 1 pages
+    past the end are fetched and discarded. With a rate_limiter, requests
+    are started no faster than its budget however high the concurrency.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(url):
+        async with semaphore:
+            html = await asyncio.to_thread(fetch_page, session, url, rate_limiter)
+        # Parsing off the event loop too, so it overlaps the other fetches.
+        return await asyncio.to_thread(extract_links, html)
+
+    unique_links = set()
+    record_links(await fetch(FILTER_URL), unique_links, f)
+
+    page_links = set()
+    for start in range(0, max_pages, concurrency):
+        batch = range(start, min(start + concurrency, max_pages))
+        pages = await asyncio.gather(*(fetch(PAGE_URL.format(page_number=n)) for n in batch))
+        for page_number, links in zip(batch, pages):
+            record_links(links, unique_links, f)
+            if not adds_page_links(links, page_links):
+                logger.info(f"No new links on page {page_number}, stopping.")
+                return unique_links
+
+    logger.warning(f"Reached the {max_pages} page ceiling without running out of links.")
+    return unique_links
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Collect Groww mutual fund page URLs.")
+    parser.add_argument('--mode', choices=['async', 'sequential'], default='async',
+                        help="Fetch listing pages concurrently or one at a time (default: async)")
+    parser.add_argument('--concurrency', type=int, default=8,
+                        help="Maximum listing pages in flight in async mode (default: 8)")
+    parser.add_argument('--max-pages', type=int, default=MAX_PAGES,
+                        help=f"Upper bound on pageNo pages to fetch (default: {MAX_PAGES})")
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE,
+                        help=f"Listing pages fetched per second; 0 disables the limit (default: {DEFAULT_RATE})")
+    parser.add_argument('--burst', type=int, default=DEFAULT_BURST,
+                        help=f"Pages allowed back to back after an idle spell (default: {DEFAULT_BURST})")
+    parser.add_argument('--rate-state-dir',
+                        help="Share the per-host budget with every other process using this directory, "
+                             "e.g. a concurrent get_mutual_fund_details.py run")
+    parser.add_argument('--output', default=OUTPUT_FILE,
+                        help=f"File to write links to (default: {OUTPUT_FILE})")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    session = create_session(pool_size=args.concurrency)
+    rate_limiter = None
+    if args.rate > 0:
+        rate_limiter = RateLimiter(args.rate, args.burst, state_dir=args.rate_state_dir)
+
+    with open(args.output, 'w') as f:
+        if args.mode == 'async':
+            unique_links = asyncio.run(discover_async(session, f, args.concurrency, args.max_pages, rate_limiter))
+        else:
+            unique_links = discover_sequential(session, f, args.max_pages, rate_limiter)
+
+    logger.info(f"Wrote {len(unique_links)} links to {args.output}")
+
 
-    # Loop through subsequent pages and extract links
-    for page_number in range(0, 105):
-        page = requests.get(f"https://groww.in/mutual-funds/filter?q=&fundSize=&pageNo={page_number}&sortBy=3")
-        soup = BeautifulSoup(page.text, 'html.parser')
-        rows = soup.find_all('a', attrs={'class': 'pos-rel f22Link'})
-
-        for row in rows:
-            link = f"https://groww.in{row.get('href')}"
-            # Only add if it's not already in the set
-            if link not in unique_links:
-                unique_links.add(link)
-                f.write(f"{link}\n")
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,43 @@
+import argparse
+import functools
+import itertools
+import json
 import logging
+import multiprocessing
+import os
 import time
-import random
 import threading
 import queue
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 import pandas as pd
-from bs4 import BeautifulSoup
+import requests
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, SoupStrainer
+from bs4.builder import builder_registry
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service as ChromeService
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
 import re
 
+try:
+    import psutil
+except ImportError:  # Memory-based recycling and reporting are skipped without it.
+    psutil = None
+
+from concurrency import DEFAULT_MAX_LIMIT, AimdController
+from fund_record import FIELDS as RECORD_FIELDS, FundRecord, records_frame
+from fund_state import DEFAULT_REFRESH_TTL_HOURS, FUND_STATE_FILE, FundState
+from html_cache import HtmlCache
+from journal import JOURNAL_FILE, Journal, load_journal
+from normalize import normalize_frame
+from page_archive import PageArchive, iter_archive
+from rate_limiter import DEFAULT_BURST, DEFAULT_RATE, RateLimiter
+from retry import (DEFAULT_BASE_DELAY, DEFAULT_MAX_ATTEMPTS, DEFAULT_MAX_DELAY, FAILURES_FILE,
+                   PERMANENT_STATUS_CODES, PermanentError, RetryableError, RetryScheduler)
+from scrape_stats import ScrapeStats
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -25,314 +49,2117 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-class FundScraper:
+COLUMNS = list(RECORD_FIELDS)
+
+# Browser-like headers for the HTTP-only engine; Groww serves the same
+# server-rendered markup to these as it does to Chrome.
+HTTP_HEADERS = {
+    'User-Agent': ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                   '(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'),
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-IN,en;q=0.9',
+}
+HTTP_TIMEOUT = 20
+
+# A page scraped without a browser is only accepted if these were found;
+# anything else is re-scraped through Chrome.
+REQUIRED_FIELDS = ("Fund Name", "Fund Type", "AUM")
+
+
+# Ceiling for the in-browser wait for the sections our extractors read, and
+# how long the DOM has to stay unchanged before a page missing some of them
+# (e.g. debt funds without a P/E table) is considered fully loaded.
+SECTION_WAIT_TIMEOUT = 10
+SECTION_QUIET_MS = 750
+
+# Elements a page must have before its source is captured. Optional sections
+# may be missing once the page is quiet; these are waited for until timeout.
+REQUIRED_SELECTORS = ['.mfh239SchemeName']
+
+# Signs that Groww is throttling or blocking us rather than serving a fund
+# page: these HTTP statuses, a page with an empty body, or a page missing
+# the classes of REQUIRED_SELECTORS (checked as plain substrings).
+BLOCK_STATUS_CODES = (403, 429)
+EMPTY_BODY_RE = re.compile(r'<body[^>]*>\s*</body>', re.IGNORECASE)
+REQUIRED_CLASSES = [selector.lstrip('.') for selector in REQUIRED_SELECTORS]
+
+# Resolves once every section _parse_data reads is in the DOM, the DOM has been
+# quiet for quietMs after document load with the required elements present, or
+# timeoutMs has passed. Scrolls to the bottom on every burst of mutations so
+# lazily rendered sections get triggered.
+WAIT_FOR_SECTIONS_JS = """
+const timeoutMs = arguments[0];
+const quietMs = arguments[1];
+const requiredSelectors = arguments[2];
+const done = arguments[arguments.length - 1];
+const started = Date.now();
+
+function required() {
+    return requiredSelectors.every(s => document.querySelector(s) !== null);
+}
+
+function sections() {
+    const tables = Array.from(document.querySelectorAll('table'), t => t.textContent);
+    return {
+        returns: tables.some(t => t.includes('Rank with in category') || t.includes('Category average')),
+        ratios: tables.some(t => t.includes('Alpha') && t.includes('Beta')),
+        managers: document.querySelector('.fm982CardText') !== null,
+        headings: document.querySelector('.mf320Heading') !== null,
+    };
+}
+
+let observer = null;
+let quietTimer = null;
+let hardTimer = null;
+let finished = false;
+
+function finish(reason) {
+    if (finished) return;
+    finished = true;
+    if (observer) observer.disconnect();
+    clearTimeout(quietTimer);
+    clearTimeout(hardTimer);
+    done({reason: reason, required: required(), sections: sections(), elapsed_ms: Date.now() - started});
+}
+
+function check() {
+    const found = sections();
+    if (required() && Object.values(found).every(Boolean)) {
+        finish('ready');
+        return;
+    }
+    window.scrollTo(0, document.body.scrollHeight);
+    clearTimeout(quietTimer);
+    quietTimer = setTimeout(() => {
+        if (document.readyState === 'complete' && required()) finish('quiet');
+    }, quietMs);
+}
+
+observer = new MutationObserver(check);
+observer.observe(document.documentElement, {childList: true, subtree: true});
+hardTimer = setTimeout(() => finish('timeout'), timeoutMs);
+check();
+"""
+
+
+# Resource types dropped in the browser, as DevTools URL patterns. None of
+# the _extract_* methods read images, fonts or media.
+BLOCKED_RESOURCE_TYPES = {
+    'image': ['*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.avif', '*.svg', '*.ico'],
+    'font': ['*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot'],
+    'media': ['*.mp4', '*.webm', '*.m3u8', '*.mp3', '*.ogg'],
+}
+# Hosts the browser may resolve at all; analytics, ads and other third
+# parties fail DNS resolution inside Chrome.
+ALLOWED_DOMAINS = ['groww.in', '*.groww.in']
+
+
+class ResourceBlocker:
+    """
+    Keeps Chrome from loading resources the scraper never reads.
+
+    Resource types are blocked with DevTools Network.setBlockedURLs (plus the
+    image content setting), and every host outside `allowed_domains` is
+    mapped to an unresolvable address with --host-resolver-rules. Request
+    counts are read back from Chrome's performance log after each page and
+    totalled across all workers sharing the blocker.
+    """
+
+    def __init__(self, block_types=tuple(BLOCKED_RESOURCE_TYPES), allowed_domains=tuple(ALLOWED_DOMAINS)):
+        self.block_types = list(block_types)
+        self.allowed_domains = list(allowed_domains)
+        self.url_patterns = [p for t in self.block_types for p in BLOCKED_RESOURCE_TYPES[t]]
+        self.allowed = 0
+        self.blocked = 0
+        self._lock = threading.Lock()
+
+    def apply_options(self, options):
+        if 'image' in self.block_types:
+            options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+        if self.allowed_domains:
+            excludes = ', '.join(f'EXCLUDE {domain}' for domain in self.allowed_domains)
+            options.add_argument(f'--host-resolver-rules=MAP * ~NOTFOUND, {excludes}')
+        options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+
+    def install(self, driver):
+        driver.execute_cdp_cmd('Network.enable', {})
+        if self.url_patterns:
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.url_patterns})
+
+    def count_requests(self, driver):
+        """
+        Drain the driver's performance log and return (allowed, blocked)
+        request counts for the page just loaded.
+        """
+        requested = 0
+        blocked = 0
+        try:
+            entries = driver.get_log('performance')
+        except Exception as e:
+            logger.debug(f"Could not read performance log: {e}")
+            return 0, 0
+
+        for entry in entries:
+            try:
+                message = json.loads(entry['message'])['message']
+            except (KeyError, TypeError, ValueError):
+                continue
+            method = message.get('method')
+            params = message.get('params', {})
+            if method == 'Network.requestWillBeSent':
+                requested += 1
+            elif method == 'Network.loadingFailed' and (
+                    params.get('blockedReason') or 'ERR_NAME_NOT_RESOLVED' in params.get('errorText', '')):
+                blocked += 1
+
+        allowed = max(requested - blocked, 0)
+        with self._lock:
+            self.allowed += allowed
+            self.blocked += blocked
+        return allowed, blocked
+
+
+def build_chrome_options(blocker=None):
+    options = webdriver.ChromeOptions()
+    options.add_argument('--headless')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    # Suppress logging from chrome
+    options.add_argument("--log-level=3")
+    # Keep background tabs loading at full speed for MultiTabScraper.
+    options.add_argument('--disable-background-timer-throttling')
+    options.add_argument('--disable-backgrounding-occluded-windows')
+    options.add_argument('--disable-renderer-backgrounding')
+    if blocker is not None:
+        blocker.apply_options(options)
+    return options
+
+
+# A pooled browser that doesn't answer a trivial script within this many
+# seconds is treated as hung and replaced.
+HEALTH_CHECK_TIMEOUT = 10
+PAGE_LOAD_TIMEOUT = 60
+
+_chromedriver_path = None
+_chromedriver_lock = threading.Lock()
+
+
+def resolve_chromedriver():
+    """
+    Resolve (and download if needed) the chromedriver binary once per process.
+    """
+    global _chromedriver_path
+    with _chromedriver_lock:
+        if _chromedriver_path is None:
+            _chromedriver_path = ChromeDriverManager().install()
+        return _chromedriver_path
+
+
+def create_driver(blocker=None):
+    driver = webdriver.Chrome(service=ChromeService(resolve_chromedriver()), options=build_chrome_options(blocker))
+    if blocker is not None:
+        blocker.install(driver)
+    return driver
+
+
+class DriverPool:
+    """
+    A fixed set of pre-warmed Chrome sessions shared by the worker threads.
+
+    Workers lease a driver with acquire() and hand it back with release().
+    check() health-checks a leased driver between URLs and swaps in a fresh
+    browser if the old one crashed or stopped responding, so a dead Chrome
+    costs one page load instead of a worker's share of the queue.
+    """
+
+    def __init__(self, size, blocker=None, health_check_timeout=HEALTH_CHECK_TIMEOUT):
+        self.size = size
+        self.blocker = blocker
+        self.health_check_timeout = health_check_timeout
+        self.replaced = 0  # unhealthy browsers swapped out
+        self.recycled = 0  # healthy browsers restarted by the recycle policy
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        # Browsers currently alive (idle or leased); a replacement that fails
+        # to start frees its slot so acquire() can try again later.
+        self._live = 0
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def start(self, count=None):
+        """
+        Pre-warm count browsers (default: size); acquire() starts the rest
+        on demand.
+        """
+        count = self.size if count is None else min(count, self.size)
+        resolve_chromedriver()
+        logger.info(f"Starting {count} browsers...")
+        with ThreadPoolExecutor(max_workers=max(1, count)) as executor:
+            for driver in executor.map(lambda _: self._create(), range(count)):
+                self._idle.put(driver)
+
+    def _create(self):
+        driver = create_driver(self.blocker)
+        driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+        with self._lock:
+            self._live += 1
+        return driver
+
+    def acquire(self):
+        try:
+            return self._idle.get(block=False)
+        except queue.Empty:
+            pass
+        with self._lock:
+            start_new = self._live < self.size
+        if start_new:
+            return self._create()
+        return self._idle.get()
+
+    def release(self, driver):
+        self._idle.put(driver)
+
+    def is_healthy(self, driver):
+        # Run the probe on a helper thread so a hung browser can't hang the worker.
+        probe = ThreadPoolExecutor(max_workers=1)
+        future = probe.submit(driver.execute_script, "return 1")
+        probe.shutdown(wait=False)
+        try:
+            return future.result(timeout=self.health_check_timeout) == 1
+        except Exception:
+            return False
+
+    def check(self, driver):
+        """
+        Return driver if it is still responsive, otherwise a replacement.
+        """
+        if self.is_healthy(driver):
+            return driver
+        logger.warning("Browser failed its health check; replacing it")
+        return self.replace(driver)
+
+    def replace(self, driver, recycle=False):
+        """
+        Quit driver and return a new browser in its place, counting it as
+        recycled (a policy restart) or replaced (a dead or hung browser).
+        """
+        self._discard(driver)
+        with self._lock:
+            if recycle:
+                self.recycled += 1
+            else:
+                self.replaced += 1
+        return self._create()
+
+    def _discard(self, driver):
+        with self._lock:
+            self._live -= 1
+        # quit() can block on a hung browser; don't make the worker wait for it.
+        threading.Thread(target=self._quit, args=(driver,), daemon=True).start()
+
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.debug(f"Error quitting browser: {e}")
+
+    def close(self):
+        while True:
+            try:
+                driver = self._idle.get(block=False)
+            except queue.Empty:
+                break
+            with self._lock:
+                self._live -= 1
+            self._quit(driver)
+
+
+def browser_rss_mb(driver):
+    """
+    Resident memory of the chromedriver process and every Chrome process it
+    spawned, in MB, or None if psutil is unavailable or the tree is gone.
+    """
+    if psutil is None:
+        return None
+    try:
+        root = psutil.Process(driver.service.process.pid)
+        processes = [root] + root.children(recursive=True)
+    except (AttributeError, psutil.Error):
+        return None
+
+    total = 0
+    for process in processes:
+        try:
+            total += process.memory_info().rss
+        except psutil.Error:
+            continue
+    return total / (1024 * 1024)
+
+
+class RecyclePolicy:
+    """
+    When to replace a long-lived browser: after max_pages page loads, after
+    max_age seconds, or once its process tree's RSS exceeds max_rss_mb.
+    Any limit left as None is not applied.
+    """
+
+    def __init__(self, max_pages=None, max_age=None, max_rss_mb=None):
+        self.max_pages = max_pages
+        self.max_age = max_age
+        self.max_rss_mb = max_rss_mb
+
+    def reason(self, pages, age, rss_mb):
+        if self.max_pages is not None and pages >= self.max_pages:
+            return f"{pages} pages"
+        if self.max_age is not None and age >= self.max_age:
+            return f"{age / 60:.0f} minutes old"
+        if self.max_rss_mb is not None and rss_mb is not None and rss_mb >= self.max_rss_mb:
+            return f"{rss_mb:.0f} MB RSS"
+        return None
+
+
+class MemoryTracker:
+    """
+    Collects per-page browser RSS samples from all workers for the end-of-run
+    peak/average report.
+    """
+
     def __init__(self):
+        self.samples = 0
+        self.total_mb = 0.0
+        self.peak_mb = 0.0
+        self.recycled = 0
+        self._lock = threading.Lock()
+
+    def record(self, rss_mb):
+        if rss_mb is None:
+            return
+        with self._lock:
+            self.samples += 1
+            self.total_mb += rss_mb
+            self.peak_mb = max(self.peak_mb, rss_mb)
+
+    def record_recycle(self):
+        with self._lock:
+            self.recycled += 1
+
+    def summary(self):
+        if not self.samples:
+            return f"Browsers recycled: {self.recycled}; no memory samples (psutil not installed?)"
+        return (f"Per-browser memory: peak {self.peak_mb:.0f} MB, average {self.total_mb / self.samples:.0f} MB "
+                f"over {self.samples} samples; browsers recycled: {self.recycled}")
+
+
+def create_http_session(pool_size=10):
+    """
+    Build a keep-alive requests.Session whose connection pool can be shared
+    by all worker threads.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update(HTTP_HEADERS)
+    return session
+
+
+def missing_required_fields(data):
+    return [field for field in REQUIRED_FIELDS if data.get(field, "NA") in ("NA", "")]
+
+
+def block_signal(page_source):
+    """
+    Why page_source looks like a throttled or blocked response rather than
+    a fund page, or None if it looks like a fund page.
+    """
+    if not page_source or not page_source.strip() or EMPTY_BODY_RE.search(page_source):
+        return "empty_page"
+    for name in REQUIRED_CLASSES:
+        if name not in page_source:
+            return f"missing_{name}"
+    return None
+
+
+# Groww fund pages are server-rendered by Next.js, which ships the page's data
+# as JSON in this script tag. Matching it with a regex avoids building a tree.
+PAGE_STATE_RE = re.compile(
+    r'<script[^>]*\bid=["\']__NEXT_DATA__["\'][^>]*>(.*?)</script>', re.DOTALL | re.IGNORECASE
+)
+PAGE_STATE_ROOT = ('props', 'pageProps', 'mfServerSideData')
+
+
+def _format_text(value):
+    return str(value).strip()
+
+
+def _format_percent(value):
+    return f"{value}%"
+
+
+def _format_aum(value):
+    # Same spelling as the DOM's fund-size row, e.g. "₹5,234.56 Cr".
+    return f"₹{float(value):,.2f} Cr"
+
+
+def _format_managers(managers):
+    formatted = []
+    for m in managers:
+        name = (m.get('person_name') or "Unknown").strip()
+        tenure = "Unknown"
+        if m.get('date_from'):
+            try:
+                tenure = "Since " + datetime.strptime(m['date_from'][:10], "%Y-%m-%d").strftime("%b %Y")
+            except ValueError:
+                tenure = str(m['date_from'])
+        formatted.append(f"{name} ({tenure})")
+    return ', '.join(formatted)
+
+
+# Record key -> (path below PAGE_STATE_ROOT, formatter). Keys the page state
+# does not carry (category ranks, the since-inception category average, P/E
+# and P/B) are read from the page's returns and ratios tables; see
+# FundScraper._fill_state_gaps.
+PAGE_STATE_FIELDS = {
+    "Fund Name": (('scheme_name',), _format_text),
+    "Fund Type": (('sub_category',), _format_text),
+    "AUM": (('aum',), _format_aum),
+    "1Y Fund Return": (('return_stats', 0, 'return1y'), _format_percent),
+    "1Y Category Avg": (('return_stats', 0, 'cat_return1y'), _format_percent),
+    "3Y Fund Return": (('return_stats', 0, 'return3y'), _format_percent),
+    "3Y Category Avg": (('return_stats', 0, 'cat_return3y'), _format_percent),
+    "5Y Fund Return": (('return_stats', 0, 'return5y'), _format_percent),
+    "5Y Category Avg": (('return_stats', 0, 'cat_return5y'), _format_percent),
+    "All Fund Return": (('return_stats', 0, 'return_since_created'), _format_percent),
+    "Alpha": (('return_stats', 0, 'alpha'), _format_text),
+    "Beta": (('return_stats', 0, 'beta'), _format_text),
+    "Sharpe": (('return_stats', 0, 'sharpe_ratio'), _format_text),
+    "Sortino": (('return_stats', 0, 'sortino_ratio'), _format_text),
+    "Expense Ratio": (('expense_ratio',), _format_percent),
+    "Exit Load": (('exit_load',), _format_text),
+    "Benchmark": (('benchmark_name',), _format_text),
+    "Fund Managers": (('fund_manager_details',), _format_managers),
+}
+
+
+def extract_page_state(page_source):
+    """
+    Return the fund's server-side state dict from the embedded __NEXT_DATA__
+    blob, or None if the page doesn't carry one.
+    """
+    match = PAGE_STATE_RE.search(page_source)
+    if not match:
+        return None
+    try:
+        state = json.loads(match.group(1))
+    except ValueError as e:
+        logger.warning(f"Could not decode page state JSON: {e}")
+        return None
+    for key in PAGE_STATE_ROOT:
+        if not isinstance(state, dict) or key not in state:
+            return None
+        state = state[key]
+    return state if isinstance(state, dict) else None
+
+
+def _lookup(state, path):
+    for key in path:
+        try:
+            state = state[key]
+        except (KeyError, IndexError, TypeError):
+            return None
+    return state
+
+
+# BeautifulSoup tree builders the extractors can run on. html.parser is the
+# pure-Python reference; lxml (optional dependency) tokenizes in C.
+PARSER_BACKENDS = ('html.parser', 'lxml')
+
+
+def available_parser_backends():
+    return [backend for backend in PARSER_BACKENDS if builder_registry.lookup(backend) is not None]
+
+
+# (tag, class) of every element the extractors read; None matches any class.
+# Extractors look elements up through these, and partial parsing builds
+# only these subtrees, so a new extractor must register its elements here.
+FUND_NAME_TARGET = ('h1', 'mfh239SchemeName')
+FUND_TYPE_TARGET = ('div', 'mfh239PillsContainer')
+TABLE_TARGET = ('table', None)
+HEADING_TARGET = ('div', 'mf320Heading')
+MANAGER_TARGET = ('div', 'fm982CardText')
+PARSE_TARGETS = (FUND_NAME_TARGET, FUND_TYPE_TARGET, TABLE_TARGET, HEADING_TARGET, MANAGER_TARGET)
+
+
+# AUM text fallback: the label is matched case-insensitively against every
+# text node, the value is read from the (lowercased) text after the label.
+FUND_SIZE_LABEL_RE = re.compile('fund size', re.IGNORECASE)
+AUM_VALUE_RE = re.compile(r'(?:₹\s?)?[\d,.]+\s*cr', re.IGNORECASE)
+
+
+def find_target(soup, target):
+    name, class_ = target
+    return soup.find(name, class_=class_) if class_ else soup.find(name)
+
+
+def find_all_targets(soup, target):
+    name, class_ = target
+    return soup.find_all(name, class_=class_) if class_ else soup.find_all(name)
+
+
+class TargetStrainer(SoupStrainer):
+    """
+    parse_only filter that lets the tree builder create only the top-level
+    elements matching one of `targets`, with their whole subtrees; scripts,
+    navigation, footers and stray text are skipped during tokenizing.
+    """
+
+    def __init__(self, targets=PARSE_TARGETS):
+        super().__init__()
+        self.targets = targets
+
+    def _allowed(self, name, attrs):
+        classes = dict(attrs or {}).get('class') or ''
+        if isinstance(classes, str):
+            classes = classes.split()
+        return any(name == t_name and (t_class is None or t_class in classes) for t_name, t_class in self.targets)
+
+    # beautifulsoup4 >= 4.13
+    def allow_tag_creation(self, nsprefix, name, attrs):
+        return self._allowed(name, attrs)
+
+    def allow_string_creation(self, string):
+        return False
+
+    # beautifulsoup4 < 4.13
+    def search_tag(self, markup_name=None, markup_attrs={}):
+        return self._allowed(markup_name, markup_attrs)
+
+
+def make_soup(page_source, backend='html.parser', partial=False, targets=PARSE_TARGETS):
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown parser backend: {backend}")
+    if partial:
+        return BeautifulSoup(page_source, backend, parse_only=TargetStrainer(targets))
+    return BeautifulSoup(page_source, backend)
+
+
+class IndexedRow:
+    """
+    A table row's stripped cell texts, plus its first <th>/<td> texts
+    (None if the row has none), computed once.
+    """
+    __slots__ = ('cells', 'th', 'td')
+
+    def __init__(self, row):
+        self.cells = [c.text.strip() for c in row.find_all(['td', 'th'])]
+        th = row.find('th')
+        td = row.find('td')
+        self.th = th.text.strip() if th else None
+        self.td = td.text.strip() if td else None
+
+
+class IndexedTable:
+    __slots__ = ('text', 'headers', 'rows', 'roles')
+
+    def __init__(self, table):
+        self.text = table.text
+        self.headers = [th.text.strip() for th in table.find_all('th')]
+        self.rows = [IndexedRow(row) for row in table.find_all('tr')]
+        self.roles = {role for role, matches in TABLE_ROLES.items() if matches(self.text)}
+
+
+# Role -> test on the table's text; a table can have several roles.
+TABLE_ROLES = {
+    'fund_size': lambda text: "Fund Size" in text or "Fund size" in text,
+    'benchmark': lambda text: "Fund benchmark" in text,
+    'returns': lambda text: "Rank with in category" in text or "Category average" in text,
+    'ratios': lambda text: "P/E Ratio" in text,
+    'stats': lambda text: "Alpha" in text and "Beta" in text,
+}
+
+
+class TableIndex:
+    """
+    Every <table> on a page, serialized and classified by role in one pass
+    so each extractor only looks at the tables relevant to it.
+    """
+
+    def __init__(self, tables):
+        self.tables = [IndexedTable(table) for table in tables]
+        self._by_role = {role: [] for role in TABLE_ROLES}
+        for table in self.tables:
+            for role in table.roles:
+                self._by_role[role].append(table)
+
+    def by_role(self, role):
+        return self._by_role[role]
+
+    @classmethod
+    def of(cls, tables):
+        return tables if isinstance(tables, cls) else cls(tables)
+
+
+class FieldSpec:
+    """
+    Where one record field is read from.
+
+    Element fields name a PARSE_TARGETS `target` and a `read` callable that
+    turns the list of matching elements into a value. Table fields name a
+    TABLE_ROLES `role` and a `row_label` (a substring, or a callable taking
+    the label and the record so far); with layout 'row' the label is the
+    first cell and the value is the cell under the `column` header (or the
+    second cell), with layout 'th' they are the row's <th> and <td>.
+    `first_table` reads only the first table with the role, `first_match`
+    keeps the first value found instead of the last. `normalize` is applied
+    to every value other than "NA". Fields with neither a target nor a role
+    are filled in by the scraper itself.
+    """
+    __slots__ = ('field', 'target', 'read', 'role', 'row_label', 'column', 'layout',
+                 'first_table', 'first_match', 'normalize')
+
+    def __init__(self, field, target=None, read=None, role=None, row_label=None, column=None, layout='row',
+                 first_table=False, first_match=False, normalize=None):
+        self.field = field
+        self.target = target
+        self.read = read
+        self.role = role
+        self.row_label = row_label
+        self.column = column
+        self.layout = layout
+        self.first_table = first_table
+        self.first_match = first_match
+        self.normalize = normalize
+
+    def value(self, raw):
+        if self.normalize is None or raw == "NA":
+            return raw
+        return self.normalize(raw)
+
+
+def _first_text(elements):
+    return elements[0].text if elements else "NA"
+
+
+def _second_text(elements):
+    return elements[1].text if len(elements) > 1 else "NA"
+
+
+def _last_heading(match, value):
+    """
+    Reader returning value(div) for the last mf320Heading block match(div) accepts.
+    """
+    def read(divs):
+        result = "NA"
+        for div in divs:
+            if match(div):
+                result = value(div)
+        return result
+    return read
+
+
+def _manager_list(cards):
+    managers = []
+    for m in cards:
+        name = m.find('div', class_='fm982PersonName')
+        tenure = m.find('div', class_='contentSecondary')
+        n_text = name.text.strip() if name else "Unknown"
+        t_text = tenure.text.strip() if tenure else "Unknown"
+        managers.append(f"{n_text} ({t_text})")
+    return ', '.join(managers)
+
+
+def _fund_returns_row(label, data):
+    # Sometimes the fund's own row is labelled with the fund name
+    return "Fund returns" in label or data.get("Fund Name", "") in label
+
+
+RETURN_PERIODS = ["1Y", "3Y", "5Y", "All"]
+RETURN_FIELDS = [f"{period} {kind}" for period in RETURN_PERIODS for kind in ("Fund Return", "Category Avg", "Rank")]
+RATIO_FIELDS = ["P/E Ratio", "P/B Ratio", "Alpha", "Beta", "Sharpe", "Sortino"]
+
+# Every field _parse_data produces, in record order. Within a role, rows are
+# matched against the row labels in the order they first appear here and
+# only the first matching label is used.
+FIELD_SCHEMA = [
+    FieldSpec("Fund Name", target=FUND_NAME_TARGET, read=_first_text),
+    FieldSpec("Fund Type", target=FUND_TYPE_TARGET, read=_second_text),
+    FieldSpec("AUM"),  # name-matched table row, then a text search: FundScraper._extract_aum
+    FieldSpec("Expense Ratio", target=HEADING_TARGET,
+              read=_last_heading(lambda div: 'Expense Ratio' in div.text and ':' in div.text,
+                                 lambda div: div.text.split(':')[1]),
+              normalize=lambda v: v.replace('Inclusive of GST', '').strip()),
+    FieldSpec("Exit Load", target=HEADING_TARGET,
+              read=_last_heading(lambda div: div.h3 and "Exit load" in div.h3.text,
+                                 lambda div: div.p.text if div.p else "NA"),
+              normalize=str.strip),
+    FieldSpec("Benchmark", role='benchmark', row_label="Fund benchmark", layout='th', first_match=True),
+    *[FieldSpec(f"{period} {kind}", role='returns', row_label=row_label, column=period, first_table=True)
+      for period in RETURN_PERIODS
+      for kind, row_label in (("Fund Return", _fund_returns_row),
+                              ("Category Avg", "Category average"),
+                              ("Rank", "Rank with in category"))],
+    FieldSpec("P/E Ratio", role='ratios', row_label="P/E Ratio"),
+    FieldSpec("P/B Ratio", role='ratios', row_label="P/B Ratio"),
+    FieldSpec("Alpha", role='stats', row_label="Alpha", layout='th'),
+    FieldSpec("Beta", role='stats', row_label="Beta", layout='th'),
+    FieldSpec("Sharpe", role='stats', row_label="Sharpe", layout='th'),
+    FieldSpec("Sortino", role='stats', row_label="Sortino", layout='th'),
+    FieldSpec("Fund Managers", target=MANAGER_TARGET, read=_manager_list),
+]
+
+
+# Table fields a page-state record may lack; filled from a tables-only soup.
+STATE_TABLE_FIELDS = tuple(spec.field for spec in FIELD_SCHEMA if spec.role in ('returns', 'ratios'))
+TABLE_TAG_RE = re.compile(r'<table\b', re.IGNORECASE)
+
+
+def _label_contains(text):
+    return lambda label, data: text in label
+
+
+class ExtractionPlan:
+    """
+    A field schema compiled into a single pass over a page: each element
+    target is looked up once for all the fields read from it, and each
+    indexed table's rows are walked once, every row being dispatched to the
+    first matching row label of each of the table's roles.
+    """
+
+    def __init__(self, schema):
+        self.schema = tuple(schema)
+        self.fields = [spec.field for spec in self.schema]
+        self._elements = {}  # target -> [spec]
+        self._sections = {}  # role -> (layout, first_table, [(matches, [spec])])
+        self._table_fields = []
+        self._subsets = {}
+
+        groups = {}
+        for spec in self.schema:
+            if spec.target is not None:
+                self._elements.setdefault(spec.target, []).append(spec)
+            elif spec.role is not None:
+                self._table_fields.append(spec.field)
+                layout, first_table, role_groups = self._sections.setdefault(
+                    spec.role, (spec.layout, spec.first_table, []))
+                if (layout, first_table) != (spec.layout, spec.first_table):
+                    raise ValueError(f"{spec.field}: every field of table role {spec.role!r} "
+                                     f"must use the same layout and first_table")
+                key = (spec.role, spec.row_label)
+                if key not in groups:
+                    matches = spec.row_label if callable(spec.row_label) else _label_contains(spec.row_label)
+                    groups[key] = []
+                    role_groups.append((matches, groups[key]))
+                groups[key].append(spec)
+
+    def only(self, *fields):
+        """
+        The plan for a subset of the fields, compiled on first use.
+        """
+        if fields not in self._subsets:
+            self._subsets[fields] = ExtractionPlan(spec for spec in self.schema if spec.field in fields)
+        return self._subsets[fields]
+
+    def run(self, soup=None, tables=None, data=None):
+        """
+        Fill data (a new record with every field "NA" if not given) with the
+        element fields read from soup and the table fields read from tables,
+        a TableIndex or a list of <table> tags. Either source may be omitted.
+        """
+        if data is None:
+            data = dict.fromkeys(self.fields, "NA")
+
+        if soup is not None:
+            for target, specs in self._elements.items():
+                elements = find_all_targets(soup, target)
+                for spec in specs:
+                    data[spec.field] = spec.value(spec.read(elements))
+
+        if tables is not None:
+            for field in self._table_fields:
+                data[field] = "NA"
+            self._run_tables(TableIndex.of(tables), data)
+        return data
+
+    def _run_tables(self, index, data):
+        done_roles = set()
+        found = set()
+        for table in index.tables:
+            for role in table.roles:
+                if role not in self._sections:
+                    continue
+                layout, first_table, groups = self._sections[role]
+                if first_table and role in done_roles:
+                    continue
+                done_roles.add(role)
+
+                columns = {}
+                for i, header in enumerate(table.headers):
+                    if i > 0:
+                        columns.setdefault(header, []).append(i)
+
+                for row in table.rows:
+                    if layout == 'th':
+                        if row.th is None or row.td is None:
+                            continue
+                        label = row.th
+                    else:
+                        if not row.cells:
+                            continue
+                        label = row.cells[0]
+
+                    for matches, specs in groups:
+                        if not matches(label, data):
+                            continue
+                        for spec in specs:
+                            if spec.first_match and spec.field in found:
+                                continue
+                            value = self._cell(spec, row, columns)
+                            if value is not None:
+                                data[spec.field] = spec.value(value)
+                                found.add(spec.field)
+                        break
+
+    @staticmethod
+    def _cell(spec, row, columns):
+        if spec.layout == 'th':
+            return row.td
+        if spec.column is None:
+            return row.cells[1] if len(row.cells) >= 2 else None
+        # A repeated header reads the last of its columns this row reaches.
+        in_row = [i for i in columns.get(spec.column, ()) if i < len(row.cells)]
+        return row.cells[in_row[-1]] if in_row else None
+
+
+EXTRACTION_PLAN = ExtractionPlan(FIELD_SCHEMA)
+
+
+# Returned by scrape_url in place of a record when the page source was handed
+# to a ParsePipeline; the record is collected from the pipeline instead.
+PARSE_DEFERRED = object()
+
+
+class FundScraper:
+    def __init__(self, parse_mode='dom', parser_backend='html.parser', partial_parse=False, cache=None,
+                 offline=False, archive=None, blocker=None, pool=None, recycle_policy=None, memory_tracker=None,
+                 parse_pipeline=None, stats=None, rate_limiter=None, concurrency=None, journal=None):
         self.driver = None
+        # 'dom' walks the rendered tables; 'state' decodes the embedded page
+        # state JSON first and only builds a soup when that is incomplete.
+        self.parse_mode = parse_mode
+        # One of PARSER_BACKENDS, used wherever a soup is built.
+        self.parser_backend = parser_backend
+        # Build only the PARSE_TARGETS subtrees instead of the whole page.
+        self.partial_parse = partial_parse
+        # Optional HtmlCache of page sources; with offline=True misses are
+        # reported as failures instead of being fetched.
+        self.cache = cache
+        self.offline = offline
+        # Optional PageArchive that receives every live-captured page source.
+        self.archive = archive
+        # Optional ResourceBlocker applied to the browser this scraper starts.
+        self.blocker = blocker
+        # Optional DriverPool to lease browsers from instead of starting one.
+        self.pool = pool
+        # Optional RecyclePolicy for restarting the browser, and a shared
+        # MemoryTracker that receives its RSS after every page.
+        self.recycle_policy = recycle_policy
+        self.memory_tracker = memory_tracker
+        # Optional ParsePipeline that parses captured pages in other
+        # processes; this scraper then only fetches.
+        self.parse_pipeline = parse_pipeline
+        # ScrapeStats receiving stage timings and field sources; pass one
+        # instance to every scraper of a run to aggregate them.
+        self.stats = stats if stats is not None else ScrapeStats()
+        # Optional RateLimiter shared by all scrapers; every page fetch
+        # (browser navigation or HTTP request) takes a token from it.
+        self.rate_limiter = rate_limiter
+        # Optional AimdController shared by all scrapers; every live page
+        # holds one of its slots and reports its latency and outcome.
+        self.concurrency = concurrency
+        self._block_reason = None
+        # Seconds the current page spent waiting for rate-limit tokens.
+        self._rate_limit_wait = 0.0
+        # Optional Journal that checkpoints every record as it is completed.
+        self.journal = journal
+        # Why the last scrape_url() returned None, for the retry scheduler.
+        self.last_error = None
+        self._driver_pages = 0
+        self._driver_started = time.monotonic()
 
     def __enter__(self):
-        self.setup_driver()
+        # With a cache the browser is only started on the first miss, and
+        # under a concurrency controller once this scraper gets a slot.
+        if self.cache is None and self.concurrency is None:
+            self.setup_driver()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         if self.driver:
-            self.driver.quit()
+            if self.pool is not None:
+                self.pool.release(self.driver)
+            else:
+                self.driver.quit()
+            self.driver = None
 
     def setup_driver(self):
-        options = webdriver.ChromeOptions()
-        options.add_argument('--headless')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        # Suppress logging from chrome
-        options.add_argument("--log-level=3")
-        
+        self._driver_pages = 0
+        self._driver_started = time.monotonic()
+        if self.pool is not None:
+            self.driver = self.pool.acquire()
+            return
+
         try:
-            self.driver = webdriver.Chrome(service=ChromeService(ChromeDriverManager().install()), options=options)
+            self.driver = create_driver(self.blocker)
         except Exception as e:
             logger.error(f"Failed to initialize driver: {e}")
             raise
 
+    def _replace_driver(self, recycle=False):
+        self._driver_pages = 0
+        self._driver_started = time.monotonic()
+        # The old browser is gone even if its replacement fails to start;
+        # setup_driver then starts (or leases) one for the next page.
+        old, self.driver = self.driver, None
+        if self.pool is not None:
+            self.driver = self.pool.replace(old, recycle=recycle)
+        else:
+            DriverPool._quit(old)
+            self.driver = create_driver(self.blocker)
+
+    def _recycle_reason(self):
+        """
+        Count a page against the current browser, report its memory to the
+        tracker and return why it should be recycled, if it should.
+        """
+        self._driver_pages += 1
+        rss_mb = None
+        if self.memory_tracker is not None or (self.recycle_policy and self.recycle_policy.max_rss_mb):
+            rss_mb = browser_rss_mb(self.driver)
+        if self.memory_tracker is not None:
+            self.memory_tracker.record(rss_mb)
+
+        if self.recycle_policy is None:
+            return None
+        return self.recycle_policy.reason(self._driver_pages, time.monotonic() - self._driver_started, rss_mb)
+
+    def _maybe_recycle(self):
+        """
+        Restart the browser once it hits the recycle policy's page, age or
+        memory limit.
+        """
+        if self.driver is None:
+            return
+        reason = self._recycle_reason()
+        if reason:
+            logger.info(f"Recycling browser after {reason}")
+            try:
+                self._replace_driver(recycle=True)
+            except Exception as e:
+                # The next page starts (or leases) a browser through setup_driver.
+                logger.error(f"Failed to start replacement browser: {e}")
+                self.driver = None
+            if self.memory_tracker is not None:
+                self.memory_tracker.record_recycle()
+
     def scrape_url(self, url):
+        self.last_error = None
+        data = self._scrape_from_cache(url)
+        if data is not None:
+            return data
+        if self.offline:
+            logger.warning(f"Not in cache, skipping in offline mode: {url}")
+            self.last_error = PermanentError("not in cache (offline)")
+            return None
+        if self.concurrency is not None:
+            return self._scrape_in_slot(url)
+        return self._scrape_live(url)
+
+    def _scrape_in_slot(self, url):
+        """
+        _scrape_live under one of the concurrency controller's slots,
+        reporting the page's latency and outcome when it is done.
+        """
+        ticket = self.concurrency.acquire()
+        self._block_reason = None
+        self._rate_limit_wait = 0.0
+        data = None
+        start = time.monotonic()
+        try:
+            data = self._scrape_live(url)
+            return data
+        finally:
+            # The token-bucket wait is our own pacing, not the site slowing
+            # down, so it is left out of the latency the controller judges.
+            latency = time.monotonic() - start - self._rate_limit_wait
+            self.concurrency.release(ticket, latency, self._outcome(data))
+
+    def _outcome(self, data):
+        if self._block_reason is not None:
+            return "blocked"
+        return "error" if data is None else "ok"
+
+    def _note_block(self, url, reason):
+        if reason is None:
+            return
+        self._block_reason = reason
+        self.stats.count(f"block.{reason}")
+        logger.warning(f"{url.strip()} looks throttled or blocked ({reason})")
+
+    def _check_blocked(self, url, page_source):
+        """
+        Raise RetryableError for a captured page that is not a fund page,
+        so it is neither cached nor recorded as a row of NAs.
+        """
+        reason = block_signal(page_source)
+        self._note_block(url, reason)
+        if reason is not None:
+            raise RetryableError(f"page blocked ({reason})")
+
+    def _scrape_from_cache(self, url):
+        if self.cache is None:
+            return None
+        with self.stats.timer('cache.get'):
+            page_source = self.cache.get(url)
+        if page_source is None:
+            return None
+
+        try:
+            return self._record(url, page_source)
+        except Exception as e:
+            logger.error(f"Error parsing cached page for {url}: {e}", exc_info=True)
+            return None
+
+    def _scrape_live(self, url):
         if not self.driver:
             self.setup_driver()
-            
+        elif self.pool is not None:
+            driver, self.driver = self.driver, None
+            self.driver = self.pool.check(driver)
+
         try:
-            logger.info(f"Scraping URL: {url}")
-            self.driver.get(url.strip())
-            
-            # Scroll to load content
-            self._scroll_page()
-            
-            page_source = self.driver.page_source
-            soup = BeautifulSoup(page_source, 'html.parser')
-            
-            data = self._parse_data(soup, self.driver)
-            data['URL'] = url
-            return data
-            
+            return self._scrape_with_driver(url)
         except Exception as e:
+            # A pooled browser that died mid-page gets replaced and the page
+            # retried once, so the URL isn't lost along with the browser.
+            if self.pool is not None and not self.pool.is_healthy(self.driver):
+                logger.warning(f"Browser died while scraping {url}; retrying on a fresh one")
+                self.stats.count('browser.retry')
+                try:
+                    self._replace_driver()
+                    return self._scrape_with_driver(url)
+                except Exception as retry_error:
+                    e = retry_error
             logger.error(f"Error scraping {url}: {e}", exc_info=True)
+            self.last_error = e
             return None
+        finally:
+            self._maybe_recycle()
 
-    def _scroll_page(self):
-        last_height = self.driver.execute_script("return document.body.scrollHeight")
-        while True:
-            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(1)
-            new_height = self.driver.execute_script("return document.body.scrollHeight")
-            if new_height == last_height:
-                break
-            last_height = new_height
+    def _scrape_with_driver(self, url):
+        logger.info(f"Scraping URL: {url}")
+        page_source = self._fetch_with_driver(url)
+        self._check_blocked(url, page_source)
+        self._store_page_source(url, page_source)
+        return self._record(url, page_source)
 
-    def _parse_data(self, soup, driver):
-        data = {}
-        
-        # Fund Name
-        try:
-            fund_name_elem = WebDriverWait(driver, 5).until(
-                EC.presence_of_element_located((By.CLASS_NAME, "mfh239SchemeName"))
-            )
-            data["Fund Name"] = fund_name_elem.text
-        except Exception:
-            fund_name_elem = soup.find('h1', class_='mfh239SchemeName')
-            data["Fund Name"] = fund_name_elem.text if fund_name_elem else "NA"
+    def _record(self, url, page_source):
+        """
+        Parse page_source into the record for url, or hand it to the parse
+        pipeline and return PARSE_DEFERRED.
+        """
+        if self.parse_pipeline is not None:
+            self.parse_pipeline.submit(url, page_source)
+            return PARSE_DEFERRED
+        return self._complete(url, self._parse_html(page_source))
 
-        # Fund Type
-        fund_type_elements = soup.find_all('div', attrs={'class': 'mfh239PillsContainer'})
-        data["Fund Type"] = fund_type_elements[1].text if len(fund_type_elements) > 1 else "NA"
+    def _complete(self, url, data):
+        data['URL'] = url
+        if self.journal is not None:
+            self.journal.write(url, data)
+        return data
 
-        # Tables extraction helper
-        tables = soup.find_all('table')
+    def _store_page_source(self, url, page_source):
+        if self.cache is not None:
+            self.cache.put(url, page_source)
+        if self.archive is not None:
+            self.archive.write(url, page_source)
 
-        # AUM
-        data["AUM"] = self._extract_aum(tables, data["Fund Name"])
+    def _wait_for_rate_limit(self, url):
+        if self.rate_limiter is not None:
+            waited = time.monotonic()
+            with self.stats.timer('rate_limit'):
+                self.rate_limiter.acquire(url)
+            self._rate_limit_wait += time.monotonic() - waited
+
+    def _fetch_with_driver(self, url):
+        self._wait_for_rate_limit(url)
+        with self.stats.timer('driver.get'):
+            self.driver.get(url.strip())
 
-        # Expense Ratio & Exit Load
-        self._extract_expense_and_load(soup, data)
+        # Scroll until the sections we parse have rendered
+        with self.stats.timer('wait_for_sections'):
+            self._wait_for_sections()
 
-        # Benchmark
-        data["Benchmark"] = self._extract_benchmark(tables)
+        with self.stats.timer('page_source'):
+            page_source = self.driver.page_source
+        if self.blocker is not None:
+            allowed, blocked = self.blocker.count_requests(self.driver)
+            logger.debug(f"{url.strip()}: {allowed} requests allowed, {blocked} blocked")
+        return page_source
 
-        # Returns and Rank
-        self._extract_returns_and_rank(tables, data)
+    def _parse_html(self, page_source):
+        # Field -> "fallback" for values not found by the field's primary method.
+        sources = {}
+        with self.stats.timer('parse'):
+            data = self._parse_fields(page_source, sources)
+        self.stats.record_fields({field: "na" if value in ("NA", "") else sources.get(field, "primary")
+                                  for field, value in data.items() if field != 'URL'})
+        return data
 
-        # Ratios (P/E, P/B, Alpha, Beta, etc.)
-        self._extract_ratios(tables, data)
+    def _parse_fields(self, page_source, sources):
+        state_data = None
+        if self.parse_mode == 'state':
+            with self.stats.timer('page_state'):
+                state_data = self._parse_page_state(page_source)
+            if state_data is not None and not missing_required_fields(state_data):
+                return self._fill_state_gaps(page_source, FundRecord(state_data), sources)
 
-        # Fund Managers
-        self._extract_managers(soup, data)
+        with self.stats.timer('soup'):
+            soup = make_soup(page_source, self.parser_backend, partial=self.partial_parse)
+        full_soup = None
+        if self.partial_parse:
+            # Only the AUM text fallback needs the rest of the page, and only
+            # when the tables didn't have it.
+            full_soup = functools.partial(make_soup, page_source, self.parser_backend)
+        data = self._parse_data(soup, full_soup, sources)
+        if state_data:
+            # Page state wins where it has a value; the DOM fills the gaps.
+            data.update({k: v for k, v in state_data.items() if v != "NA"})
+            sources.update({k: "fallback" for k, v in state_data.items() if v == "NA"})
+        return data
 
+    def _fill_state_gaps(self, page_source, data, sources):
+        """
+        Read the returns and ratios fields a complete page state left "NA"
+        (ranks, P/E, P/B, ...) from the page's tables, building a soup of
+        the <table> elements only, and only if the page has any.
+        """
+        gaps = tuple(field for field in STATE_TABLE_FIELDS if data[field] == "NA")
+        if not gaps or not TABLE_TAG_RE.search(page_source):
+            return data
+        with self.stats.timer('soup'):
+            soup = make_soup(page_source, self.parser_backend, partial=True, targets=(TABLE_TARGET,))
+        with self.stats.timer('tables'):
+            tables = TableIndex(find_all_targets(soup, TABLE_TARGET))
+        with self.stats.timer('extract'):
+            EXTRACTION_PLAN.only(*gaps).run(tables=tables, data=data)
+        sources.update(dict.fromkeys(gaps, "fallback"))
         return data
 
-    def _extract_aum(self, tables, fund_name):
+    def _parse_page_state(self, page_source):
+        state = extract_page_state(page_source)
+        if state is None:
+            return None
+
+        data = {}
+        for field, (path, formatter) in PAGE_STATE_FIELDS.items():
+            value = _lookup(state, path)
+            if value in (None, "", []):
+                data[field] = "NA"
+                continue
+            try:
+                data[field] = formatter(value)
+            except (TypeError, ValueError, AttributeError):
+                data[field] = "NA"
+        for period in ["1Y", "3Y", "5Y", "All"]:
+            data.setdefault(f"{period} Fund Return", "NA")
+            data.setdefault(f"{period} Category Avg", "NA")
+            data.setdefault(f"{period} Rank", "NA")
+        data.setdefault("P/E Ratio", "NA")
+        data.setdefault("P/B Ratio", "NA")
+        return data
+
+    def _wait_for_sections(self, timeout=SECTION_WAIT_TIMEOUT):
+        """
+        Block until the returns/ratios tables, manager cards and mf320Heading
+        blocks are in the DOM, the page stops changing with REQUIRED_SELECTORS
+        present, or timeout seconds pass.
+        """
+        # Leave the browser-side timer room to fire before Selenium gives up.
+        self.driver.set_script_timeout(timeout + 5)
+        status = self.driver.execute_async_script(WAIT_FOR_SECTIONS_JS, int(timeout * 1000), SECTION_QUIET_MS,
+                                                  REQUIRED_SELECTORS)
+        if isinstance(status, dict):
+            self.stats.count(f"wait.{status.get('reason')}")
+        if isinstance(status, dict) and status.get('required') is False:
+            self.stats.count('wait.required_missing')
+            logger.warning(f"Required elements {', '.join(REQUIRED_SELECTORS)} still missing after {timeout}s; "
+                           f"capturing the page anyway")
+        elif isinstance(status, dict) and status.get('reason') != 'ready':
+            missing = [name for name, found in status.get('sections', {}).items() if not found]
+            logger.debug(f"Page settled ({status.get('reason')}) after {status.get('elapsed_ms')} ms "
+                         f"without sections: {', '.join(missing)}")
+        return status
+
+    def _parse_data(self, soup, full_soup=None, sources=None):
+        """
+        Extract a record from the parsed page alone; the fetch step has
+        already waited for REQUIRED_SELECTORS, so nothing here touches a browser.
+
+        full_soup, if given, is a callable returning the complete page for
+        fallbacks that search beyond PARSE_TARGETS; soup is used otherwise.
+        sources, if given, receives "fallback" for fields found by a fallback.
+        """
+        # Tables extraction helper: every table read and classified once
+        with self.stats.timer('tables'):
+            tables = TableIndex(find_all_targets(soup, TABLE_TARGET))
+
+        with self.stats.timer('extract'):
+            data = EXTRACTION_PLAN.run(soup, tables, FundRecord())
+
+        # AUM
+        with self.stats.timer('extract.aum'):
+            data["AUM"] = self._extract_aum(tables, data["Fund Name"], soup=soup if full_soup is None else None,
+                                            load_full_soup=full_soup, sources=sources)
+        return data
+
+    def _extract_aum(self, tables, fund_name, soup=None, load_full_soup=None, sources=None):
         # Method 1: Table search (Case Insensitive)
-        for table in tables:
-            if "Fund Size" in table.text or "Fund size" in table.text:
-                headers = [th.text.strip() for th in table.find_all('th')]
-                try:
-                    fund_size_idx = -1
-                    for i, h in enumerate(headers):
-                        if "Fund Size" in h or "Fund size" in h:
-                            fund_size_idx = i
-                            break
-                    
-                    if fund_size_idx != -1:
-                        rows = table.find_all('tr')
-                        for row in rows:
-                            cols = row.find_all(['td', 'th'])
-                            if not cols: continue
-                            
-                            row_name = cols[0].text.strip()
-                            norm_fund_name = fund_name.lower().replace(' ', '')
-                            norm_row_name = row_name.lower().replace(' ', '')
-                            
-                            if norm_row_name in norm_fund_name or norm_fund_name in norm_row_name:
-                                if len(cols) > fund_size_idx:
-                                    val = cols[fund_size_idx].text.strip()
-                                    if any(c.isdigit() for c in val):
-                                        return val
+        for table in TableIndex.of(tables).by_role('fund_size'):
+            headers = table.headers
+            try:
+                fund_size_idx = -1
+                for i, h in enumerate(headers):
+                    if "Fund Size" in h or "Fund size" in h:
+                        fund_size_idx = i
+                        break
+                
+                if fund_size_idx != -1:
+                    norm_fund_name = fund_name.lower().replace(' ', '')
+                    for row in table.rows:
+                        cols = row.cells
+                        if not cols: continue
+                        
+                        norm_row_name = cols[0].lower().replace(' ', '')
                         
-                        # Fallback: First data row if no name match
-                        # REMOVED: This was causing issues where it picked the first row of "Similar Funds" table
-                        # resulting in duplicate AUMs for funds in the same category.
-                        # We will rely on Method 2 (Regex) if name match fails.
-                        pass
+                        if norm_row_name in norm_fund_name or norm_fund_name in norm_row_name:
+                            if len(cols) > fund_size_idx:
+                                val = cols[fund_size_idx]
+                                if any(c.isdigit() for c in val):
+                                    return val
+                    
+                    # Fallback: First data row if no name match
+                    # REMOVED: This was causing issues where it picked the first row of "Similar Funds" table
+                    # resulting in duplicate AUMs for funds in the same category.
+                    # We will rely on Method 2 (Regex) if name match fails.
+                    pass
 
-                except Exception as e:
-                    logger.warning(f"Error parsing AUM table: {e}")
+            except Exception as e:
+                logger.warning(f"Error parsing AUM table: {e}")
 
         # Method 2: Search by text in entire soup (Fallback)
+        if sources is not None:
+            sources["AUM"] = "fallback"
+        if soup is None and load_full_soup is not None:
+            soup = load_full_soup()
+        if soup is not None:
+            return self._extract_aum_from_soup(soup)
+        return "NA"
+
+    def _extract_aum_from_soup(self, soup):
+        """
+        Find elements whose own text mentions "fund size" and read the value
+        after the label from their text, then from their parent's text.
+        """
         try:
-            # Find elements containing "Fund size" (case insensitive)
-            target_elems = [
-                elem for elem in self.driver.find_elements(By.XPATH, "//*[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'fund size')]")
-            ]
-            
-            for elem in target_elems:
+            seen = set()
+            for string in soup.find_all(string=FUND_SIZE_LABEL_RE):
+                elem = string.parent
+                if elem is None or id(elem) in seen:
+                    continue
+                seen.add(id(elem))
+
                 # Check element text and parent text
-                texts_to_check = [elem.text, elem.get_attribute("textContent")]
-                try:
-                    parent = elem.find_element(By.XPATH, "..")
-                    texts_to_check.append(parent.text)
-                    texts_to_check.append(parent.get_attribute("textContent"))
-                except:
-                    pass
-                
-                for text in texts_to_check:
-                    if not text: continue
-                    # Regex to find pattern like ₹1,234.56Cr or 1234Cr
-                    # Normalize text
-                    norm_text = text.lower().replace('\n', ' ').replace('\r', '')
-                    if "fund size" in norm_text:
-                        # Extract part after fund size
-                        after_label = norm_text.split("fund size")[1]
-                        match = re.search(r'(?:₹\s?)?[\d,.]+\s*cr', after_label, re.IGNORECASE)
-                        if match:
-                            val = match.group(0)
-                            # Normalize: remove ₹, Cr, CR, space
-                            val = val.replace('₹', '').replace('Cr', '').replace('CR', '').replace('cr', '').strip()
-                            return val
+                texts_to_check = [elem.get_text()]
+                if elem.parent is not None:
+                    texts_to_check.append(elem.parent.get_text())
+
+                val = self._aum_from_texts(texts_to_check)
+                if val:
+                    return val
 
         except Exception as e:
             logger.warning(f"Error in AUM fallback: {e}")
 
         return "NA"
 
+    def _aum_from_texts(self, texts_to_check):
+        for text in texts_to_check:
+            if not text: continue
+            # Regex to find pattern like ₹1,234.56Cr or 1234Cr
+            # Normalize text
+            norm_text = text.lower().replace('\n', ' ').replace('\r', '')
+            if "fund size" in norm_text:
+                # Extract part after fund size
+                after_label = norm_text.split("fund size")[1]
+                match = AUM_VALUE_RE.search(after_label)
+                if match:
+                    val = match.group(0)
+                    # Normalize: remove ₹, Cr, CR, space
+                    val = val.replace('₹', '').replace('Cr', '').replace('CR', '').replace('cr', '').strip()
+                    return val
+        return None
+
+    # Single field groups of EXTRACTION_PLAN, for callers that only need one.
+
     def _extract_expense_and_load(self, soup, data):
-        data["Expense Ratio"] = "NA"
-        data["Exit Load"] = "NA"
-        
-        headings = soup.find_all('div', attrs={'class': 'mf320Heading'})
-        for div in headings:
-            text = div.text
-            if 'Expense Ratio' in text and ':' in text:
-                 data["Expense Ratio"] = text.split(':')[1].replace('Inclusive of GST', '').strip()
-            
-            if div.h3 and "Exit load" in div.h3.text:
-                 data["Exit Load"] = div.p.text.strip() if div.p else "NA"
+        EXTRACTION_PLAN.only("Expense Ratio", "Exit Load").run(soup=soup, data=data)
 
     def _extract_benchmark(self, tables):
-        for table in tables:
-            if "Fund benchmark" in table.text:
-                rows = table.find_all('tr')
-                for row in rows:
-                    th = row.find('th')
-                    td = row.find('td')
-                    if th and td and "Fund benchmark" in th.text:
-                        return td.text.strip()
-        return "NA"
+        return EXTRACTION_PLAN.only("Benchmark").run(tables=tables, data={})["Benchmark"]
 
     def _extract_returns_and_rank(self, tables, data):
-        fund_returns = {}
-        category_averages = {}
-        rank_within_category = {}
-        
-        returns_table = None
-        for table in tables:
-            if "Rank with in category" in table.text or "Category average" in table.text:
-                returns_table = table
-                break
-        
-        if returns_table:
-            headers = [th.text.strip() for th in returns_table.find_all('th')]
-            rows = returns_table.find_all('tr')
-            for row in rows:
-                cols = row.find_all(['td', 'th'])
-                col_texts = [c.text.strip() for c in cols]
-                if not col_texts: continue
-                
-                label = col_texts[0]
-                
-                # Identify row type
-                target_dict = None
-                if "Fund returns" in label or data.get("Fund Name", "") in label: # Sometimes label is fund name
-                    target_dict = fund_returns
-                elif "Category average" in label:
-                    target_dict = category_averages
-                elif "Rank with in category" in label:
-                    target_dict = rank_within_category
-                
-                if target_dict is not None:
-                    for i, header in enumerate(headers):
-                        if i > 0 and i < len(col_texts):
-                            target_dict[header] = col_texts[i]
-
-        for period in ["1Y", "3Y", "5Y", "All"]:
-            data[f"{period} Fund Return"] = fund_returns.get(period, "NA")
-            data[f"{period} Category Avg"] = category_averages.get(period, "NA")
-            data[f"{period} Rank"] = rank_within_category.get(period, "NA")
+        EXTRACTION_PLAN.only(*RETURN_FIELDS).run(tables=tables, data=data)
 
     def _extract_ratios(self, tables, data):
-        data["P/E Ratio"] = "NA"
-        data["P/B Ratio"] = "NA"
-        data["Alpha"] = "NA"
-        data["Beta"] = "NA"
-        data["Sharpe"] = "NA"
-        data["Sortino"] = "NA"
-
-        for table in tables:
-            # P/E & P/B
-            if "P/E Ratio" in table.text:
-                rows = table.find_all('tr')
-                for row in rows:
-                    cols = row.find_all(['td', 'th'])
-                    texts = [c.text.strip() for c in cols]
-                    if len(texts) >= 2:
-                        if "P/E Ratio" in texts[0]: data["P/E Ratio"] = texts[1]
-                        elif "P/B Ratio" in texts[0]: data["P/B Ratio"] = texts[1]
-            
-            # Stats
-            if "Alpha" in table.text and "Beta" in table.text:
-                rows = table.find_all('tr')
-                for row in rows:
-                    header = row.find('th')
-                    value = row.find('td')
-                    if header and value:
-                        h_text = header.text.strip()
-                        v_text = value.text.strip()
-                        if "Alpha" in h_text: data["Alpha"] = v_text
-                        elif "Beta" in h_text: data["Beta"] = v_text
-                        elif "Sharpe" in h_text: data["Sharpe"] = v_text
-                        elif "Sortino" in h_text: data["Sortino"] = v_text
+        EXTRACTION_PLAN.only(*RATIO_FIELDS).run(tables=tables, data=data)
 
     def _extract_managers(self, soup, data):
-        managers = []
-        manager_sections = soup.find_all('div', class_='fm982CardText')
-        for m in manager_sections:
-            name = m.find('div', class_='fm982PersonName')
-            tenure = m.find('div', class_='contentSecondary')
-            n_text = name.text.strip() if name else "Unknown"
-            t_text = tenure.text.strip() if tenure else "Unknown"
-            managers.append(f"{n_text} ({t_text})")
-        data["Fund Managers"] = ', '.join(managers)
+        EXTRACTION_PLAN.only("Fund Managers").run(soup=soup, data=data)
 
 
-def worker(url_queue, results_list, failed_list):
+class HttpFundScraper(FundScraper):
+    """
+    Fetches the server-rendered fund page over a pooled requests.Session and
+    parses it without a browser. Chrome is only started (lazily) for pages
+    where the static HTML is missing one of REQUIRED_FIELDS.
+
+    HTTP pages are always parsed in this thread, since the record decides
+    whether Chrome is needed; only Chrome fallbacks go to a parse pipeline.
+    """
+
+    def __init__(self, session=None, **kwargs):
+        super().__init__(**kwargs)
+        self.session = session or create_http_session()
+
+    def __enter__(self):
+        # No browser up front; FundScraper._scrape_live starts one on first fallback.
+        return self
+
+    def _scrape_live(self, url):
+        logger.info(f"Fetching URL over HTTP: {url}")
+        self._wait_for_rate_limit(url)
+        try:
+            with self.stats.timer('http.get'):
+                response = self.session.get(url.strip(), timeout=HTTP_TIMEOUT)
+        except Exception as e:
+            # Chrome would hit the same network trouble; back off instead.
+            logger.warning(f"HTTP fetch failed for {url}: {e}")
+            self.last_error = RetryableError(f"HTTP fetch failed: {e}")
+            return None
+
+        status = response.status_code
+        if status in BLOCK_STATUS_CODES:
+            self._note_block(url, f"http_{status}")
+        if status in PERMANENT_STATUS_CODES:
+            # Chrome would only render the same error page.
+            logger.error(f"HTTP {status} for {url}; not retrying in Chrome")
+            self.last_error = PermanentError(f"HTTP {status}")
+            return None
+        if not response.ok:
+            # Throttled or a server error: re-fetching it in Chrome right away
+            # would only hit the host again, so leave it to the retry backoff.
+            logger.warning(f"HTTP {status} for {url}; leaving it for a retry")
+            self.last_error = RetryableError(f"HTTP {status}")
+            return None
+
+        # Parsed into its own stats: a page that falls back to Chrome is
+        # parsed again there, and only the record kept should be counted.
+        page_stats = ScrapeStats()
+        parser = FundScraper(parse_mode=self.parse_mode, parser_backend=self.parser_backend,
+                             partial_parse=self.partial_parse, stats=page_stats)
+        data = None
+        try:
+            data = parser._parse_html(response.text)
+        except Exception as e:
+            logger.warning(f"Could not parse the HTTP page for {url}: {e}")
+
+        if data is not None:
+            missing = missing_required_fields(data)
+            if not missing:
+                self.stats.merge(page_stats.to_dict())
+                self._store_page_source(url, response.text)
+                return self._complete(url, data)
+            logger.info(f"Falling back to Chrome for {url} (missing: {', '.join(missing)})")
+        else:
+            logger.info(f"Falling back to Chrome for {url}")
+        if 'parse' in page_stats.stages:
+            self.stats.add_time('http.parse', page_stats.stages['parse'][1])
+        self.stats.count('http.chrome_fallback')
+        return super()._scrape_live(url)
+
+
+# Polled in each busy tab by MultiTabScraper. A tab still showing the
+# previous document (marked stale before navigating) is never ready;
+# otherwise it is ready once every parsed section is present, or the loaded
+# DOM has not changed for quietMs.
+TAB_STATUS_JS = """
+const quietMs = arguments[0];
+const requiredSelectors = arguments[1];
+if (window.__mfStale) return {ready: false};
+if (window.__mfLastMutation === undefined) {
+    window.__mfLastMutation = Date.now();
+    new MutationObserver(() => { window.__mfLastMutation = Date.now(); })
+        .observe(document.documentElement, {childList: true, subtree: true});
+}
+window.scrollTo(0, document.body ? document.body.scrollHeight : 0);
+const tables = Array.from(document.querySelectorAll('table'), t => t.textContent);
+const found = tables.some(t => t.includes('Rank with in category') || t.includes('Category average'))
+    && tables.some(t => t.includes('Alpha') && t.includes('Beta'))
+    && document.querySelector('.fm982CardText') !== null
+    && document.querySelector('.mf320Heading') !== null;
+const quiet = document.readyState === 'complete' && Date.now() - window.__mfLastMutation >= quietMs;
+const required = requiredSelectors.every(s => document.querySelector(s) !== null);
+return {ready: required && (found || quiet)};
+"""
+TAB_NAVIGATE_JS = "window.__mfStale = true; window.location.href = arguments[0];"
+TAB_POLL_INTERVAL = 0.1
+TAB_PAGE_TIMEOUT = 20
+
+
+class MultiTabScraper(FundScraper):
+    """
+    Drives several tabs of one browser concurrently.
+
+    Navigation is started in each tab without waiting for the load, then the
+    tabs are polled round-robin; whichever tab has finished rendering has its
+    page_source captured and parsed and is handed the next URL. Since most of
+    a page's time is network wait, K tabs keep K pages in flight for roughly
+    the memory of a single browser.
+    """
+
+    def __init__(self, tabs=4, **kwargs):
+        super().__init__(**kwargs)
+        self.tabs = tabs
+        self._handles = []
+
+    def _open_tabs(self):
+        self._handles = [self.driver.current_window_handle]
+        for _ in range(self.tabs - 1):
+            self.driver.switch_to.new_window('tab')
+            self._handles.append(self.driver.current_window_handle)
+
+    def scrape_queue(self, url_queue, results_list, failed_list, retries=None):
+        """
+        Scrape URLs from url_queue until it is empty, calling task_done() for
+        each one as its tab finishes.
+
+        Under a concurrency controller a tab is only handed a URL once it
+        gets a slot, so the controller caps pages in flight across all tabs
+        of all browsers. With a RetryScheduler, failed pages are handed to
+        it and come back through the queue once their backoff has passed.
+        """
+        if not self.driver:
+            self.setup_driver()
+        self._open_tabs()
+
+        in_flight = {}  # handle -> (url, deadline, slot ticket, start)
+        try:
+            self._scrape_tabs(url_queue, results_list, failed_list, in_flight, retries)
+        finally:
+            for _, _, ticket, _ in in_flight.values():
+                self._release_slot(ticket)
+
+    def _scrape_tabs(self, url_queue, results_list, failed_list, in_flight, retries):
+        draining = None
+        while True:
+            browser_died = False
+            if not draining:
+                for handle in self._handles:
+                    if handle in in_flight:
+                        continue
+                    ticket = None
+                    if self.concurrency is not None:
+                        # Only wait for a slot with nothing in flight to poll.
+                        ticket = self.concurrency.try_acquire() if in_flight else self.concurrency.acquire()
+                        if ticket is None:
+                            break
+                    url = self._next_url(url_queue, results_list, failed_list, retries, wait=not in_flight)
+                    if url is None:
+                        self._release_slot(ticket)
+                        break
+                    try:
+                        self._navigate(handle, url, in_flight, ticket)
+                    except Exception as e:
+                        if self._browser_healthy():
+                            self._fail_tab(url, e, ticket, None, url_queue, failed_list, retries)
+                            continue
+                        in_flight[handle] = (url, None, ticket, None)
+                        self._recover_browser(url_queue, in_flight, e)
+                        browser_died = True
+                        break
+            if browser_died:
+                continue
+
+            if not in_flight:
+                if draining:
+                    logger.info(f"Recycling browser after {draining}")
+                    self._replace_driver(recycle=True)
+                    self._open_tabs()
+                    if self.memory_tracker is not None:
+                        self.memory_tracker.record_recycle()
+                    draining = None
+                    continue
+                break
+
+            for handle, (url, deadline, ticket, start) in list(in_flight.items()):
+                try:
+                    self.driver.switch_to.window(handle)
+                    timed_out = time.monotonic() >= deadline
+                    if not timed_out and not self.driver.execute_script(TAB_STATUS_JS, SECTION_QUIET_MS, REQUIRED_SELECTORS)['ready']:
+                        continue
+                except Exception as e:
+                    if not self._browser_healthy():
+                        self._recover_browser(url_queue, in_flight, e)
+                        browser_died = True
+                        break
+                    # Only this tab is in trouble; the others keep loading.
+                    del in_flight[handle]
+                    self._fail_tab(url, e, ticket, start, url_queue, failed_list, retries)
+                    continue
+                if timed_out:
+                    self.stats.count('tab.timeout')
+
+                del in_flight[handle]
+                data = self._finish_tab(url, results_list, failed_list, retries)
+                self._release_slot(ticket, start, data)
+                url_queue.task_done()
+                reason = self._recycle_reason()
+                if reason and not draining:
+                    draining = reason
+            if browser_died:
+                continue
+
+            time.sleep(TAB_POLL_INTERVAL)
+
+    def _browser_healthy(self):
+        if self.pool is not None:
+            return self.pool.is_healthy(self.driver)
+        return self._driver_alive()
+
+    def _recover_browser(self, url_queue, in_flight, error):
+        """
+        The browser died: put its in-flight pages back and start a new one.
+        """
+        logger.warning(f"Browser died with {len(in_flight)} pages in flight ({error}); requeueing them")
+        for url, _, ticket, _ in in_flight.values():
+            url_queue.put(url)
+            url_queue.task_done()
+            self._release_slot(ticket)
+        in_flight.clear()
+        self._replace_driver()
+        self._open_tabs()
+
+    def _fail_tab(self, url, error, ticket, start, url_queue, failed_list, retries):
+        """
+        A tab failed on url while the browser is fine: fail just that page.
+        """
+        logger.error(f"Error scraping {url} in its tab: {error}", exc_info=True)
+        record_failure(url, error, failed_list, retries)
+        self._block_reason = None
+        self._release_slot(ticket, start, None)
+        url_queue.task_done()
+
+    def _driver_alive(self):
+        try:
+            self.driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    def _next_url(self, url_queue, results_list, failed_list, retries=None, wait=True):
+        # Cached pages never need a tab. Only wait for a retry to come due
+        # when no tab has a page loading.
+        while True:
+            url = next_url(url_queue, retries, wait)
+            if url is None:
+                return None
+            data = self._scrape_from_cache(url)
+            if data is None and not self.offline:
+                return url
+            if data is PARSE_DEFERRED:
+                pass
+            elif data is not None:
+                results_list.append(data)
+            else:
+                logger.warning(f"Not in cache, skipping in offline mode: {url}")
+                record_failure(url, PermanentError("not in cache (offline)"), failed_list, retries)
+            url_queue.task_done()
+
+    def _navigate(self, handle, url, in_flight, ticket=None):
+        logger.info(f"Scraping URL: {url}")
+        self._wait_for_rate_limit(url)
+        # The page's latency starts once its rate-limit token is granted.
+        start = time.monotonic()
+        self.driver.switch_to.window(handle)
+        self.driver.execute_script(TAB_NAVIGATE_JS, url.strip())
+        in_flight[handle] = (url, time.monotonic() + TAB_PAGE_TIMEOUT, ticket, start)
+
+    def _release_slot(self, ticket, start=None, data=None):
+        """
+        Hand a tab's slot back; with start, report the page's latency and
+        outcome, otherwise it was never fetched.
+        """
+        if ticket is None:
+            return
+        if start is None:
+            self.concurrency.release(ticket)
+        else:
+            self.concurrency.release(ticket, time.monotonic() - start, self._outcome(data))
+
+    def _finish_tab(self, url, results_list, failed_list, retries=None):
+        """
+        Capture and record the page loaded in the current tab; returns the
+        record (or PARSE_DEFERRED), or None if it failed.
+        """
+        self._block_reason = None
+        try:
+            with self.stats.timer('page_source'):
+                page_source = self.driver.page_source
+            self._check_blocked(url, page_source)
+            if self.blocker is not None:
+                # The performance log is shared by all tabs, so these counts
+                # cover whatever loaded since the last finished page.
+                self.blocker.count_requests(self.driver)
+            self._store_page_source(url, page_source)
+            # Parse without the driver: the tab is about to be reused.
+            data = self._record(url, page_source)
+            if data is not PARSE_DEFERRED:
+                results_list.append(data)
+            return data
+        except Exception as e:
+            logger.error(f"Error scraping {url}: {e}", exc_info=True)
+            record_failure(url, e, failed_list, retries)
+            return None
+
+
+def next_url(url_queue, retries=None, wait=True):
+    """
+    The next URL for a worker: through the RetryScheduler if there is one,
+    so due retries are picked up, else straight from url_queue. None once
+    there is nothing left to scrape.
+    """
+    if retries is not None:
+        return retries.next_url(url_queue, wait=wait)
+    try:
+        return url_queue.get(block=False)
+    except queue.Empty:
+        return None
+
+
+def record_failure(url, error, failed_list, retries=None):
+    """
+    Hand a failed URL to the RetryScheduler; it only lands in failed_list
+    if there is none or the URL has failed for good.
+    """
+    if retries is None or not retries.failed(url, error):
+        failed_list.append(url)
+
+
+def tab_worker(url_queue, results_list, failed_list, scraper_factory, retries=None):
+    """
+    Worker thread function for a MultiTabScraper: one browser, many tabs.
+    """
+    with scraper_factory() as scraper:
+        scraper.scrape_queue(url_queue, results_list, failed_list, retries)
+
+
+def parse_page(url, page_source, **parser_options):
+    """
+    Parse one stored page source into a record without a browser.
+    parser_options (parse_mode, parser_backend) are passed to FundScraper.
+
+    Module-level so it can be shipped to ProcessPoolExecutor workers.
+    """
+    data = FundScraper(**parser_options)._parse_html(page_source)
+    data['URL'] = url
+    return data
+
+
+def _parse_page_item(item, parser_options):
+    """
+    Parse one (url, page_source) pair in a parser process; returns the
+    url, the record (None on failure) and the parse's ScrapeStats snapshot.
+    """
+    url, page_source = item
+    stats = ScrapeStats()
+    try:
+        data = parse_page(url, page_source, stats=stats, **parser_options)
+    except Exception as e:
+        logger.error(f"Error parsing page {url}: {e}", exc_info=True)
+        data = None
+    return url, data, stats.to_dict()
+
+
+# Pages per task sent to a replay parser process, and tasks kept queued
+# per process; together they bound how many archived pages are held in
+# memory at once.
+REPLAY_CHUNK = 4
+REPLAY_TASKS_PER_WORKER = 2
+
+
+def _parse_page_chunk(items, parser_options):
+    return [_parse_page_item(item, parser_options) for item in items]
+
+
+def replay_archive(archive_path, max_workers=None, stats=None, **parser_options):
+    """
+    Re-run _parse_data over every page in an archive across all CPU cores.
+    Returns (results, failed_urls) just like a live run, in archive order;
+    the parsers' stats are merged into stats if given.
+
+    The archive is read as results come back, so only
+    REPLAY_CHUNK * REPLAY_TASKS_PER_WORKER pages per process are in flight
+    however large the archive is.
+    """
+    max_workers = max_workers or os.cpu_count()
+    max_pending = max_workers * REPLAY_TASKS_PER_WORKER
+    logger.info(f"Replaying {archive_path} with {max_workers} parser processes...")
+
+    results = []
+    failed = []
+
+    def collect(future):
+        for url, data, snapshot in future.result():
+            if stats is not None:
+                stats.merge(snapshot)
+            if data is None:
+                failed.append(url)
+            else:
+                results.append(data)
+
+    pending = deque()
+    pages = iter_archive(archive_path)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        while True:
+            chunk = list(itertools.islice(pages, REPLAY_CHUNK))
+            if not chunk:
+                break
+            pending.append(executor.submit(_parse_page_chunk, chunk, parser_options))
+            if len(pending) >= max_pending:
+                collect(pending.popleft())
+        while pending:
+            collect(pending.popleft())
+    return results, failed
+
+
+class ParsePipeline:
+    """
+    Parses captured page sources in a pool of processes while the browser
+    and HTTP threads go on fetching.
+
+    submit() blocks once max_pending pages are waiting for or being parsed,
+    so a parser backlog throttles the fetchers instead of piling up page
+    sources in memory. Records and failed URLs are collected as parses
+    finish and returned by close(); the parsers' stage timings and field
+    sources are merged into stats, and records are checkpointed to
+    journal if given.
+    """
+
+    def __init__(self, max_workers=None, max_pending=None, stats=None, journal=None, **parser_options):
+        self.max_workers = max_workers or os.cpu_count()
+        self.max_pending = max_pending or 4 * self.max_workers
+        self.parser_options = parser_options
+        self.stats = stats if stats is not None else ScrapeStats()
+        self.journal = journal
+        self.results = []
+        self.failed = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        # Spawned, not forked: the fetch threads are already running and a
+        # forked child could inherit a lock one of them holds.
+        self._executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                             mp_context=multiprocessing.get_context('spawn'))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def submit(self, url, page_source):
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(_parse_page_item, (url, page_source), self.parser_options)
+        except Exception as e:
+            # Pool broken or shut down: parse here rather than lose the page.
+            logger.warning(f"Parser pool unavailable ({e}); parsing {url} in this thread")
+            self._slots.release()
+            self._collect(*_parse_page_item((url, page_source), self.parser_options))
+            return
+        future.add_done_callback(functools.partial(self._done, url))
+
+    def _done(self, url, future):
+        snapshot = None
+        try:
+            url, data, snapshot = future.result()
+        except Exception as e:
+            logger.error(f"Parser process failed on {url}: {e}")
+            data = None
+        finally:
+            self._slots.release()
+        self._collect(url, data, snapshot)
+
+    def _collect(self, url, data, snapshot=None):
+        if snapshot:
+            self.stats.merge(snapshot)
+        if data is not None and self.journal is not None:
+            self.journal.write(url, data)
+        with self._lock:
+            if data is None:
+                self.failed.append(url)
+            else:
+                self.results.append(data)
+
+    def close(self):
+        """
+        Wait for every submitted page to be parsed; returns (results, failed_urls).
+        """
+        self._executor.shutdown(wait=True)
+        return self.results, self.failed
+
+
+def save_results(results, filename=None, keep_raw=False):
+    """
+    Write records to an Excel workbook with one sheet per fund type.
+
+    The records are assembled into one DataFrame and typed by
+    normalize_frame before being split into sheets; keep_raw also writes
+    the original strings of every converted column.
+    """
+    if not results:
+        print("No data collected.")
+        return None
+
+    df = records_frame(results)
+    fund_types = df["Fund Type"].fillna("Others") if "Fund Type" in df.columns else pd.Series("Others", index=df.index)
+    for col in COLUMNS:
+        if col not in df.columns:
+            df[col] = "NA"
+    df = normalize_frame(df[COLUMNS], keep_raw=keep_raw)
+
+    if filename is None:
+        timestamp = datetime.now().strftime("%d-%m-%Y_%H-%M-%S")
+        filename = f'mutual_funds_details_{timestamp}.xlsx'
+
+    print(f"Saving data to {filename}...")
+    with pd.ExcelWriter(filename) as writer:
+        for fund_type, sheet in df.groupby(fund_types, sort=False):
+            sheet_name = fund_type[:31].replace('/', '-')
+            sheet.to_excel(writer, sheet_name=sheet_name, index=False)
+    print("Done.")
+    return filename
+
+
+def worker(url_queue, results_list, failed_list, scraper_factory=None, retries=None):
     """
     Worker thread function that maintains a persistent browser session.
+
+    With a RetryScheduler, failed URLs are retried after a backoff instead
+    of going straight to failed_list; the worker keeps scraping other URLs
+    meanwhile and only waits for a retry once the queue is empty.
     """
-    with FundScraper() as scraper:
+    scraper_factory = scraper_factory or FundScraper
+    with scraper_factory() as scraper:
         while True:
-            try:
-                url = url_queue.get(block=False)
-            except queue.Empty:
+            url = next_url(url_queue, retries)
+            if url is None:
                 break
             
             try:
                 result = scraper.scrape_url(url)
-                if result:
+                if result is PARSE_DEFERRED:
+                    pass
+                elif result:
                     results_list.append(result)
                 else:
-                    failed_list.append(url)
+                    record_failure(url, scraper.last_error, failed_list, retries)
             except Exception as e:
                 logger.error(f"Worker failed on {url}: {e}")
-                failed_list.append(url)
+                record_failure(url, e, failed_list, retries)
             finally:
                 url_queue.task_done()
-                # Small delay to be nice
-                time.sleep(random.uniform(0.5, 1.5))
 
 
-def main():
+STATS_FILE = "scrape_stats.json"
+
+
+def report_stats(stats, path):
+    """
+    Log the run's ScrapeStats as tables and write them to path as JSON.
+    """
+    logger.info("Scrape stats:\n" + stats.summary())
+    if path:
+        stats.write_json(path)
+        logger.info(f"Wrote scrape stats to {path}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Scrape mutual fund details from Groww.")
+    parser.add_argument('--engine', choices=['selenium', 'http'], default='selenium',
+                        help="'http' fetches pages without a browser and only falls back "
+                             "to Chrome for incomplete pages (default: selenium)")
+    parser.add_argument('--parse-mode', choices=['dom', 'state'], default='dom',
+                        help="'state' reads the embedded page-state JSON and only falls "
+                             "back to the DOM extractors when it is incomplete (default: dom)")
+    parser.add_argument('--parser-backend', choices=PARSER_BACKENDS, default='html.parser',
+                        help="BeautifulSoup tree builder; 'lxml' is several times faster on "
+                             "large pages (default: html.parser)")
+    parser.add_argument('--partial-parse', action='store_true',
+                        help="Only build the page sections the extractors read "
+                             "(tables, scheme name, pills, headings, manager cards)")
+    parser.add_argument('--workers', type=int, default=7,
+                        help="Number of worker threads; with --adaptive, the pages in flight "
+                             "to start from (default: 7)")
+    parser.add_argument('--adaptive', action='store_true',
+                        help="Grow and shrink the pages in flight between --min-workers and "
+                             "--max-workers from page latency, errors and block signals")
+    parser.add_argument('--min-workers', type=int, default=1,
+                        help="Fewest pages in flight with --adaptive (default: 1)")
+    parser.add_argument('--max-workers', type=int, default=DEFAULT_MAX_LIMIT,
+                        help=f"Most pages in flight with --adaptive (default: {DEFAULT_MAX_LIMIT})")
+    parser.add_argument('--parse-workers', type=int, default=0,
+                        help="Parse pages in this many separate processes while the worker "
+                             "threads only fetch; 0 parses in the worker threads (default: 0)")
+    parser.add_argument('--parse-queue', type=int, default=None,
+                        help="Captured pages allowed to wait for a parser process before "
+                             "fetching pauses (default: 4 per parser process)")
+    parser.add_argument('--tabs', type=int, default=1,
+                        help="Pages each browser loads concurrently in separate tabs; "
+                             "Chrome engine only (default: 1)")
+    parser.add_argument('--no-driver-pool', action='store_true',
+                        help="Let each worker start its own browser instead of leasing one "
+                             "from a pre-warmed, health-checked pool")
+    parser.add_argument('--recycle-pages', type=int, default=200,
+                        help="Restart a browser after this many pages (default: 200)")
+    parser.add_argument('--recycle-minutes', type=float, default=None,
+                        help="Restart a browser after it has been running this long")
+    parser.add_argument('--recycle-rss-mb', type=float, default=1500,
+                        help="Restart a browser once its process tree uses this much memory; "
+                             "needs psutil (default: 1500)")
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE,
+                        help=f"Page fetches per second allowed per host across all workers; "
+                             f"0 disables the limit (default: {DEFAULT_RATE})")
+    parser.add_argument('--burst', type=int, default=DEFAULT_BURST,
+                        help=f"Fetches allowed back to back after an idle spell (default: {DEFAULT_BURST})")
+    parser.add_argument('--rate-state-dir',
+                        help="Share the per-host budget with every other process using this directory, "
+                             "e.g. a concurrent get_funds_urls.py run")
+    parser.add_argument('--max-attempts', type=int, default=DEFAULT_MAX_ATTEMPTS,
+                        help=f"Attempts per URL before a retryable failure is given up on; "
+                             f"1 disables retries (default: {DEFAULT_MAX_ATTEMPTS})")
+    parser.add_argument('--retry-base-delay', type=float, default=DEFAULT_BASE_DELAY,
+                        help=f"Backoff before the first retry, doubling for each further one "
+                             f"(default: {DEFAULT_BASE_DELAY}s)")
+    parser.add_argument('--retry-max-delay', type=float, default=DEFAULT_MAX_DELAY,
+                        help=f"Longest backoff between retries (default: {DEFAULT_MAX_DELAY}s)")
+    parser.add_argument('--failures-json', default=FAILURES_FILE,
+                        help=f"Write permanently failed URLs and their reasons to this JSON file "
+                             f"(default: {FAILURES_FILE})")
+    parser.add_argument('--journal', default=JOURNAL_FILE,
+                        help=f"Checkpoint every completed record to this JSON Lines file as it is "
+                             f"scraped, deleting it once the results are saved; '' disables it "
+                             f"(default: {JOURNAL_FILE})")
+    parser.add_argument('--resume', action='store_true',
+                        help="Skip URLs already completed in --journal, append to it, and include "
+                             "its records in the output")
+    parser.add_argument('--overwrite-journal', action='store_true',
+                        help="Start --journal afresh even if it holds records from an earlier run; "
+                             "without this (or --resume) such a journal is left alone and the run stops")
+    parser.add_argument('--state-db', default=FUND_STATE_FILE,
+                        help=f"SQLite file recording when each fund was last scraped and how its fields "
+                             f"changed; '' disables it (default: {FUND_STATE_FILE})")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Only scrape funds that are new, older than --refresh-ttl-hours, or whose "
+                             "benchmark, exit load, managers, expense ratio, name or type changed last "
+                             "time; the rest are output from --state-db")
+    parser.add_argument('--refresh-ttl-hours', type=float, default=DEFAULT_REFRESH_TTL_HOURS,
+                        help=f"Age at which --incremental scrapes a fund again "
+                             f"(default: {DEFAULT_REFRESH_TTL_HOURS})")
+    parser.add_argument('--cache-dir',
+                        help="Cache page sources in this directory and serve repeat runs from it")
+    parser.add_argument('--cache-ttl-hours', type=float, default=24,
+                        help="Treat cached pages older than this as stale (default: 24)")
+    parser.add_argument('--cache-max-mb', type=float, default=512,
+                        help="Evict least recently used pages above this size (default: 512)")
+    parser.add_argument('--offline', action='store_true',
+                        help="Only parse pages already in --cache-dir; never start a browser")
+    parser.add_argument('--block-resources', type=_resource_types, default=list(BLOCKED_RESOURCE_TYPES),
+                        help="Comma-separated resource types to block in Chrome, or 'none' "
+                             f"(default: {','.join(BLOCKED_RESOURCE_TYPES)})")
+    parser.add_argument('--allow-domain', action='append', default=None,
+                        help="Host Chrome may load from; repeatable. Every other host is blocked "
+                             f"(default: {' '.join(ALLOWED_DOMAINS)})")
+    parser.add_argument('--archive',
+                        help="Append every captured page source to this .jsonl.gz archive")
+    parser.add_argument('--keep-raw', action='store_true',
+                        help="Also write the scraped strings of every column converted to a number")
+    parser.add_argument('--stats-json', default=STATS_FILE,
+                        help=f"Write stage timings and field hit rates to this JSON file (default: {STATS_FILE})")
+    parser.add_argument('--replay',
+                        help="Parse the pages in this archive instead of scraping; no browser is started")
+    parser.add_argument('--replay-workers', type=int, default=None,
+                        help="Parser processes for --replay (default: one per CPU core)")
+    args = parser.parse_args(argv)
+    if args.offline and not args.cache_dir:
+        parser.error("--offline requires --cache-dir")
+    if args.allow_domain is None:
+        args.allow_domain = list(ALLOWED_DOMAINS)
+    if args.parser_backend not in available_parser_backends():
+        parser.error(f"parser backend {args.parser_backend!r} is not installed")
+    if args.tabs > 1 and args.engine != 'selenium':
+        parser.error("--tabs only applies to the selenium engine")
+    if not 1 <= args.min_workers <= args.max_workers:
+        parser.error("need 1 <= --min-workers <= --max-workers")
+    if args.resume and not args.journal:
+        parser.error("--resume requires --journal")
+    if args.resume and args.overwrite_journal:
+        parser.error("--resume and --overwrite-journal are mutually exclusive")
+    if args.incremental and not args.state_db:
+        parser.error("--incremental requires --state-db")
+    return args
+
+
+def _resource_types(value):
+    if value == 'none':
+        return []
+    types = [t.strip() for t in value.split(',') if t.strip()]
+    unknown = [t for t in types if t not in BLOCKED_RESOURCE_TYPES]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown resource type(s): {', '.join(unknown)}")
+    return types
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    stats = ScrapeStats()
+
+    if args.replay:
+        results, failed_list = replay_archive(args.replay, args.replay_workers, stats=stats,
+                                              parse_mode=args.parse_mode, parser_backend=args.parser_backend,
+                                              partial_parse=args.partial_parse)
+        if failed_list:
+            logger.warning(f"{len(failed_list)} archived pages failed to parse. Check log for details.")
+        report_stats(stats, args.stats_json)
+        save_results(results, keep_raw=args.keep_raw)
+        return
+
     try:
         with open('mutual_funds_links.txt', 'r') as f:
             urls = [line.strip() for line in f if line.strip()]
@@ -340,34 +2167,127 @@ def main():
         logger.error("mutual_funds_links.txt not found.")
         return
 
+    # Records completed by an earlier, interrupted run are taken from the
+    # journal; only the rest are scraped.
+    completed = {}
+    if args.resume:
+        completed = load_journal(args.journal)
+        logger.info(f"Resuming from {args.journal}: {sum(url in completed for url in urls)} of "
+                    f"{len(urls)} URLs already done")
+    journal = None
+    if args.journal:
+        try:
+            journal = Journal(args.journal, resume=args.resume, overwrite=args.overwrite_journal)
+        except FileExistsError as e:
+            logger.error(f"{e}; pass --resume to continue that run or --overwrite-journal to discard it")
+            return
+
+    # An incremental run reuses the stored records of funds scraped recently
+    # enough whose stable fields did not change last time.
+    state = FundState(args.state_db) if args.state_db else None
+    fresh = {}
+    if args.incremental:
+        pending = [url for url in urls if url not in completed]
+        due = set(state.due(pending, args.refresh_ttl_hours * 3600))
+        fresh = state.records(url for url in pending if url not in due)
+        logger.info(f"Incremental run: {len(due)} of {len(pending)} funds due for a refresh, "
+                    f"{len(fresh)} reused from {args.state_db}")
+
     # Thread-safe structures
     url_queue = queue.Queue()
     for url in urls:
-        url_queue.put(url)
+        if url not in completed and url not in fresh:
+            url_queue.put(url)
         
-    results_list = [] # Lists are thread-safe for append in CPython, but let's be careful. 
-    # Actually, append is atomic in CPython, but for strict correctness we could use a lock or a queue.
-    # Given the low contention, a list with append is fine, or we can use a results queue.
-    # Let's use a list for simplicity as we join threads before processing.
-    # To be perfectly safe, let's use a results queue or lock.
+    resumed_records = [completed[url] for url in urls if url in completed]
+    # Workers hand their records over through results_queue and
+    # worker_wrapper; results_list is only filled once they are joined.
+    results_list = []
     results_queue = queue.Queue()
     failed_list = []
     failed_lock = threading.Lock() # Lock for failed list if we care about order or race conditions (append is atomic though)
 
+    cache = None
+    if args.cache_dir:
+        cache = HtmlCache(args.cache_dir, ttl=args.cache_ttl_hours * 3600,
+                          max_bytes=int(args.cache_max_mb * 1024 * 1024))
+
+    archive = PageArchive(args.archive) if args.archive else None
+
+    blocker = None
+    if args.block_resources or args.allow_domain:
+        blocker = ResourceBlocker(block_types=args.block_resources, allowed_domains=args.allow_domain)
+
+    # With --adaptive the controller, not the thread count, decides how many
+    # pages are in flight: enough threads (or browsers of --tabs tabs) are
+    # started for --max-workers pages, and each waits for a slot per page.
+    concurrency = None
+    threads_count = args.workers
+    if args.adaptive:
+        concurrency = AimdController(args.workers * args.tabs, min_limit=args.min_workers,
+                                     max_limit=args.max_workers)
+        threads_count = -(-args.max_workers // args.tabs)
+
+    # Browsers are pre-warmed up front for the Chrome engine; the HTTP engine
+    # and offline runs only start one per worker if they actually need it.
+    pool = None
+    if args.engine == 'selenium' and not args.offline and not args.no_driver_pool:
+        pool = DriverPool(threads_count, blocker=blocker)
+        pool.start(args.workers)
+
+    recycle_policy = RecyclePolicy(
+        max_pages=args.recycle_pages,
+        max_age=args.recycle_minutes * 60 if args.recycle_minutes else None,
+        max_rss_mb=args.recycle_rss_mb,
+    )
+    memory_tracker = MemoryTracker()
+
+    parser_options = dict(parse_mode=args.parse_mode, parser_backend=args.parser_backend,
+                          partial_parse=args.partial_parse)
+    parse_pipeline = None
+    if args.parse_workers > 0:
+        parse_pipeline = ParsePipeline(args.parse_workers, args.parse_queue, stats=stats, journal=journal,
+                                       **parser_options)
+
+    rate_limiter = None
+    if args.rate > 0:
+        rate_limiter = RateLimiter(args.rate, args.burst, state_dir=args.rate_state_dir)
+
+    retries = RetryScheduler(args.max_attempts, args.retry_base_delay, args.retry_max_delay)
+
+    scraper_kwargs = dict(cache=cache, offline=args.offline, archive=archive, blocker=blocker, pool=pool,
+                          recycle_policy=recycle_policy, memory_tracker=memory_tracker,
+                          parse_pipeline=parse_pipeline, stats=stats, rate_limiter=rate_limiter,
+                          concurrency=concurrency, journal=journal, **parser_options)
+    scraper_factory = functools.partial(FundScraper, **scraper_kwargs)
+    worker_target = worker
+    if args.tabs > 1:
+        scraper_factory = functools.partial(MultiTabScraper, tabs=args.tabs, **scraper_kwargs)
+        worker_target = tab_worker
+    if args.engine == 'http':
+        session = create_http_session(pool_size=threads_count)
+        scraper_factory = functools.partial(HttpFundScraper, session=session, **scraper_kwargs)
+
     # Wrapper to handle results queue
     def worker_wrapper():
         local_results = []
         local_failed = []
-        worker(url_queue, local_results, local_failed)
-        
-        for r in local_results:
-            results_queue.put(r)
-        
-        with failed_lock:
-            failed_list.extend(local_failed)
+        try:
+            worker_target(url_queue, local_results, local_failed, scraper_factory, retries)
+        finally:
+            # Keep what this thread scraped even if it died part way.
+            for r in local_results:
+                results_queue.put(r)
+            
+            with failed_lock:
+                failed_list.extend(local_failed)
 
-    max_workers = 7
-    logger.info(f"Starting scraping with {max_workers} persistent workers for {len(urls)} URLs...")
+    max_workers = threads_count
+    logger.info(f"Starting scraping with {max_workers} persistent workers ({args.engine} engine) "
+                f"for {url_queue.qsize()} URLs...")
+    if concurrency is not None:
+        logger.info(f"Adaptive concurrency: starting at {concurrency.limit} pages in flight "
+                    f"(range {args.min_workers}-{args.max_workers})")
     
     threads = []
     for _ in range(max_workers):
@@ -379,46 +2299,63 @@ def main():
     for t in threads:
         t.join()
 
+    if parse_pipeline is not None:
+        parsed, parse_failed = parse_pipeline.close()
+        results_list.extend(parsed)
+        failed_list.extend(parse_failed)
+        for url in parse_failed:
+            retries.give_up(url, "parse failed in parser process")
+
+    if pool is not None:
+        pool.close()
+        logger.info(f"Replaced {pool.replaced} unhealthy browsers, recycled {pool.recycled}")
+
+    logger.info(memory_tracker.summary())
+
+    if concurrency is not None:
+        logger.info(concurrency.summary())
+
+    if archive is not None:
+        archive.close()
+        logger.info(f"Archived {archive.pages} page sources to {args.archive}")
+
+    if journal is not None:
+        journal.close()
+        logger.info(f"Journaled {journal.records} records to {args.journal}")
+
     # Process results
-    data_by_fund_type = {}
     while not results_queue.empty():
-        result = results_queue.get()
-        fund_type = result.get("Fund Type", "Others")
-        if fund_type not in data_by_fund_type:
-            data_by_fund_type[fund_type] = []
-        data_by_fund_type[fund_type].append(result)
+        results_list.append(results_queue.get())
+    results_list = resumed_records + results_list
 
+    logger.info(retries.summary())
     if failed_list:
         logger.warning(f"{len(failed_list)} tasks failed. Check log for details.")
+    if args.failures_json:
+        retries.write_failures(args.failures_json)
+        logger.info(f"Wrote {len(retries.permanent)} permanent failures to {args.failures_json}")
+
+    if cache is not None:
+        logger.info(f"HTML cache: {cache.hits} hits, {cache.misses} misses")
+
+    if blocker is not None:
+        logger.info(f"Browser requests: {blocker.allowed} allowed, {blocker.blocked} blocked")
+
+    if state is not None:
+        changes = state.record(results_list)
+        changed = sum(1 for fields in changes.values() if fields)
+        logger.info(f"Fund state: {len(results_list) - len(changes)} new funds, {changed} of "
+                    f"{len(changes)} known funds changed")
+        state.close()
+        results_list.extend(fresh.values())
+
+    report_stats(stats, args.stats_json)
 
     # Save to Excel
-    columns = [
-        'Fund Name', 'Fund Type', 'AUM',
-        '1Y Fund Return', '1Y Category Avg', '1Y Rank',
-        '3Y Fund Return', '3Y Category Avg', '3Y Rank',
-        '5Y Fund Return', '5Y Category Avg', '5Y Rank',
-        'All Fund Return', 'All Category Avg', 'All Rank',
-        'P/E Ratio', 'P/B Ratio', 'Alpha', 'Beta', 'Sharpe', 'Sortino',
-        'Expense Ratio', 'Exit Load', 'Benchmark', 'Fund Managers', 'URL'
-    ]
+    save_results(results_list, keep_raw=args.keep_raw)
 
-    timestamp = datetime.now().strftime("%d-%m-%Y_%H-%M-%S")
-    filename = f'mutual_funds_details_{timestamp}.xlsx'
-    
-    if data_by_fund_type:
-        print(f"Saving data to {filename}...")
-        with pd.ExcelWriter(filename) as writer:
-            for fund_type, data in data_by_fund_type.items():
-                df = pd.DataFrame(data)
-                for col in columns:
-                    if col not in df.columns:
-                        df[col] = "NA"
-                df = df[columns]
-                sheet_name = fund_type[:31].replace('/', '-')
-                df.to_excel(writer, sheet_name=sheet_name, index=False)
-        print("Done.")
-    else:
-        print("No data collected.")
+    if journal is not None:
+        journal.discard()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,164 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = ".html_cache"
+DEFAULT_TTL = 24 * 60 * 60
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def _sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+class HtmlCache:
+    """
+    On-disk cache of rendered fund pages.
+
+    Each URL has a small JSON entry under `urls/` pointing at a gzip-compressed
+    page stored under `objects/` by the SHA-256 of its content, so unchanged
+    pages are stored once no matter how often they are re-scraped. Entries
+    older than `ttl` seconds are treated as misses and dropped on eviction;
+    when the compressed objects exceed `max_bytes`, the least recently used
+    entries are evicted first.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        self._urls_dir = os.path.join(cache_dir, "urls")
+        self._objects_dir = os.path.join(cache_dir, "objects")
+        os.makedirs(self._urls_dir, exist_ok=True)
+        os.makedirs(self._objects_dir, exist_ok=True)
+        self._total_bytes = self._objects_size()
+
+    def _entry_path(self, url):
+        return os.path.join(self._urls_dir, _sha256(url.strip().encode('utf-8')) + ".json")
+
+    def _object_path(self, content_hash):
+        return os.path.join(self._objects_dir, content_hash[:2], content_hash + ".html.gz")
+
+    def _objects_size(self):
+        total = 0
+        for root, _, files in os.walk(self._objects_dir):
+            for name in files:
+                total += os.path.getsize(os.path.join(root, name))
+        return total
+
+    def _expired(self, entry, now):
+        return self.ttl is not None and now - entry["stored_at"] > self.ttl
+
+    def get(self, url):
+        """
+        Return the cached page source for url, or None on a miss or expired entry.
+        """
+        entry_path = self._entry_path(url)
+        try:
+            with open(entry_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            if self._expired(entry, time.time()):
+                raise LookupError("expired")
+            with gzip.open(self._object_path(entry["hash"]), 'rb') as f:
+                page_source = f.read().decode('utf-8')
+        except (OSError, ValueError, KeyError, LookupError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        # Entry mtime doubles as the last-access time for LRU eviction.
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return page_source
+
+    def put(self, url, page_source):
+        data = page_source.encode('utf-8')
+        content_hash = _sha256(data)
+        object_path = self._object_path(content_hash)
+
+        with self._lock:
+            if not os.path.exists(object_path):
+                os.makedirs(os.path.dirname(object_path), exist_ok=True)
+                tmp_path = f"{object_path}.{threading.get_ident()}.tmp"
+                with gzip.open(tmp_path, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, object_path)
+                self._total_bytes += os.path.getsize(object_path)
+
+            entry = {"url": url.strip(), "hash": content_hash, "stored_at": time.time()}
+            entry_path = self._entry_path(url)
+            tmp_path = f"{entry_path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, entry_path)
+
+            if self.max_bytes is not None and self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def evict(self):
+        """
+        Drop expired entries, orphaned objects and, if still over max_bytes,
+        the least recently used entries.
+        """
+        with self._lock:
+            self._evict()
+
+    def _evict(self):
+        now = time.time()
+        entries = []
+        for name in os.listdir(self._urls_dir):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self._urls_dir, name)
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+                last_access = os.path.getmtime(path)
+            except (OSError, ValueError):
+                continue
+            if self._expired(entry, now):
+                os.remove(path)
+                continue
+            entries.append((last_access, path, entry["hash"]))
+
+        refcounts = {}
+        for _, _, content_hash in entries:
+            refcounts[content_hash] = refcounts.get(content_hash, 0) + 1
+
+        sizes = {}
+        for root, _, files in os.walk(self._objects_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                content_hash = name.split('.')[0]
+                if content_hash in refcounts:
+                    sizes[content_hash] = os.path.getsize(path)
+                else:
+                    os.remove(path)
+        self._total_bytes = sum(sizes.values())
+
+        entries.sort()
+        for _, path, content_hash in entries:
+            if self.max_bytes is None or self._total_bytes <= self.max_bytes:
+                break
+            os.remove(path)
+            refcounts[content_hash] -= 1
+            if refcounts[content_hash] == 0 and content_hash in sizes:
+                os.remove(self._object_path(content_hash))
+                self._total_bytes -= sizes[content_hash]
+
+        pages = sum(1 for count in refcounts.values() if count)
+        logger.info(f"HTML cache holds {pages} pages in {self._total_bytes / 1024 / 1024:.1f} MB after eviction")
@@ -0,0 +1,101 @@
+import json
+import logging
+import os
+import threading
+import time
+
+from fund_record import FundRecord
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_FILE = "scrape_journal.jsonl"
+
+
+class Journal:
+    """
+    Append-only checkpoint of the records completed during a run.
+
+    Each record is written as one {"url", "completed_at", "record"} JSON
+    line and flushed straight away, so a crash, OOM kill or Ctrl-C loses
+    at most the record being written. With resume=True an existing journal
+    is appended to. Otherwise a journal that already holds records is only
+    started afresh with overwrite=True, and raises FileExistsError without
+    it, so a restart that forgets to resume can't wipe the checkpoint.
+    A run that saves its results discards the journal.
+    """
+
+    def __init__(self, path, resume=False, overwrite=False):
+        self.path = path
+        self.records = 0
+        self._lock = threading.Lock()
+        if resume and os.path.exists(path):
+            self._file = open(path, 'a+', encoding='utf-8')
+            # Finish a line torn by the crash so the next record starts clean.
+            self._file.seek(0, os.SEEK_END)
+            if self._file.tell() > 0:
+                self._file.seek(self._file.tell() - 1)
+                if self._file.read(1) != "\n":
+                    self._file.write("\n")
+        else:
+            if not overwrite and os.path.exists(path) and os.path.getsize(path) > 0:
+                raise FileExistsError(f"{path} already holds records from an earlier run")
+            self._file = open(path, 'w', encoding='utf-8')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def write(self, url, record):
+        entry = {"url": url.strip(), "completed_at": time.time(), "record": dict(record)}
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            self.records += 1
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def discard(self):
+        """
+        Close and delete the journal once the run's results are safely
+        saved, so only an interrupted run leaves one behind.
+        """
+        self.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def load_journal(path):
+    """
+    Return {url: record} for every record in a journal written by Journal,
+    the latest one winning for a URL journaled twice. A missing journal is
+    empty; a torn or unreadable line is skipped.
+    """
+    completed = {}
+    try:
+        f = open(path, 'r', encoding='utf-8')
+    except FileNotFoundError:
+        return completed
+    with f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+                url, values = entry["url"], entry["record"]
+            except (ValueError, KeyError, TypeError):
+                logger.warning(f"Skipping unreadable record in {path}")
+                continue
+            try:
+                completed[url] = FundRecord(values)
+            except KeyError:
+                # Written by a version with other fields; keep it as it was.
+                completed[url] = values
+    return completed
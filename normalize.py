@@ -0,0 +1,66 @@
+import pandas as pd
+
+NA = "NA"
+RAW_SUFFIX = " (raw)"
+PERIODS = ["1Y", "3Y", "5Y", "All"]
+
+# Columns converted to floats: AUM in ₹ crore, returns and the expense ratio
+# in percent, the rest as plain numbers.
+FLOAT_FIELDS = (
+    ["AUM", "Expense Ratio"]
+    + [f"{period} {kind}" for period in PERIODS for kind in ("Fund Return", "Category Avg")]
+    + ["P/E Ratio", "P/B Ratio", "Alpha", "Beta", "Sharpe", "Sortino"]
+)
+# "3/45" ranks, split into the position and the category size.
+RANK_FIELDS = [f"{period} Rank" for period in PERIODS]
+
+NUMBER_RE = r'([-+]?\d+(?:\.\d+)?)'
+RANK_RE = r'^\s*#?(\d+)(?:\s*/\s*(\d+))?'
+
+
+def rank_size_column(rank_column):
+    return rank_column.replace("Rank", "Category Size")
+
+
+def to_float(series):
+    """
+    '₹1,234.5 Cr', '15.2%', '−0.4' -> float; values without a number,
+    such as "NA" or "--", become null.
+    """
+    text = series.astype('string').str.replace(',', '', regex=False).str.replace('−', '-', regex=False)
+    return pd.to_numeric(text.str.extract(NUMBER_RE, expand=False), errors='coerce').astype('Float64')
+
+
+def split_rank(series):
+    """
+    '3/45' -> (3, 45) as two nullable integer columns; a bare '3' has no
+    category size.
+    """
+    parts = series.astype('string').str.extract(RANK_RE)
+    position = pd.to_numeric(parts[0], errors='coerce').astype('Int64')
+    size = pd.to_numeric(parts[1], errors='coerce').astype('Int64')
+    return position, size
+
+
+def normalize_frame(df, keep_raw=False):
+    """
+    Return df with the numeric columns typed, every rank followed by its
+    category size, and the "NA" sentinel replaced by nulls everywhere.
+
+    Each column is converted in one vectorized step. With keep_raw, every
+    converted column is followed by its original strings under
+    "<column> (raw)".
+    """
+    columns = {}
+    for column in df.columns:
+        raw = df[column]
+        if column in FLOAT_FIELDS:
+            columns[column] = to_float(raw)
+        elif column in RANK_FIELDS:
+            columns[column], columns[rank_size_column(column)] = split_rank(raw)
+        else:
+            columns[column] = raw.replace(NA, pd.NA)
+            continue
+        if keep_raw:
+            columns[column + RAW_SUFFIX] = raw
+    return pd.DataFrame(columns, index=df.index)
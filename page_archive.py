@@ -0,0 +1,64 @@
+import gzip
+import json
+import logging
+import threading
+import time
+import zlib
+
+logger = logging.getLogger(__name__)
+
+
+class PageArchive:
+    """
+    Append-only archive of the page sources captured during a live run.
+
+    The archive is a gzip-compressed JSON Lines file with one
+    {"url", "captured_at", "html"} object per page. Every record is
+    sync-flushed, so an interrupted run still leaves a readable archive of
+    all pages written before the interruption.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.pages = 0
+        self._lock = threading.Lock()
+        self._file = gzip.open(path, 'ab')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def write(self, url, page_source):
+        record = {"url": url.strip(), "captured_at": time.time(), "html": page_source}
+        line = json.dumps(record, ensure_ascii=False).encode('utf-8') + b"\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush(zlib.Z_SYNC_FLUSH)
+            self.pages += 1
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+
+def iter_archive(path):
+    """
+    Yield (url, page_source) pairs from an archive written by PageArchive.
+
+    A truncated tail, as left by a crashed run, ends iteration instead of
+    raising.
+    """
+    with gzip.open(path, 'rb') as f:
+        try:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    logger.warning(f"Skipping unreadable record in {path}")
+                    continue
+                yield record["url"], record["html"]
+        except EOFError:
+            logger.warning(f"Archive {path} ends with a truncated record; stopping there")
@@ -0,0 +1,96 @@
+import logging
+import os
+import threading
+import time
+from urllib.parse import urlparse
+
+try:
+    import fcntl
+except ImportError:  # No shared state files on Windows; limits are per process there.
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Page fetches per second allowed per host, and how many may go out back to
+# back after an idle spell.
+DEFAULT_RATE = 2.0
+DEFAULT_BURST = 2
+
+
+def host_of(url):
+    return urlparse(url.strip()).hostname or url.strip()
+
+
+class RateLimiter:
+    """
+    Token bucket per host: each fetch takes a token, tokens refill at
+    `rate` per second up to `burst`, and acquire() sleeps until the
+    caller's token is due.
+
+    Tokens are reserved under a lock and slept for outside it, so
+    concurrent callers are spaced exactly 1/rate apart no matter how many
+    worker threads there are. With `state_dir`, each host's bucket lives in
+    a file there, locked with flock for every reservation, so every process
+    pointed at the same directory draws from the same budget.
+    """
+
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST, state_dir=None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.state_dir = state_dir
+        if state_dir is not None:
+            if fcntl is None:
+                logger.warning("File locking is unavailable; rate limits are only shared within this process")
+                self.state_dir = None
+            else:
+                os.makedirs(state_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._buckets = {}  # host -> [tokens, updated]
+
+    def acquire(self, url):
+        """
+        Block until a fetch of url may start; returns the seconds waited.
+        """
+        host = host_of(url)
+        if self.state_dir is not None:
+            wait = self._reserve_shared(host)
+        else:
+            wait = self._reserve_local(host)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def _take(self, tokens, updated, now):
+        tokens = min(self.burst, tokens + (now - updated) * self.rate) - 1
+        return tokens, max(0.0, -tokens / self.rate)
+
+    def _reserve_local(self, host):
+        with self._lock:
+            now = time.monotonic()
+            tokens, updated = self._buckets.get(host, (self.burst, now))
+            tokens, wait = self._take(tokens, updated, now)
+            self._buckets[host] = (tokens, now)
+        return wait
+
+    def _reserve_shared(self, host):
+        path = os.path.join(self.state_dir, f"{host}.bucket")
+        with open(path, 'a+', encoding='utf-8') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                # Wall-clock time, since the state is shared between processes.
+                now = time.time()
+                f.seek(0)
+                try:
+                    tokens, updated = (float(v) for v in f.read().split())
+                except ValueError:
+                    tokens, updated = self.burst, now
+                tokens, wait = self._take(tokens, updated, now)
+                f.seek(0)
+                f.truncate()
+                f.write(f"{tokens!r} {now!r}")
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+        return wait
@@ -0,0 +1,158 @@
+import heapq
+import itertools
+import json
+import logging
+import queue
+import random
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ATTEMPTS = 4
+DEFAULT_BASE_DELAY = 2.0
+DEFAULT_MAX_DELAY = 60.0
+FAILURES_FILE = "failed_urls.json"
+
+# HTTP statuses that won't change on a retry: the fund page is gone or the
+# URL is malformed. Everything else (429, 5xx, timeouts) is worth retrying.
+PERMANENT_STATUS_CODES = (400, 401, 404, 410)
+
+
+class RetryableError(Exception):
+    """A failure worth retrying, e.g. a throttled or half-rendered page."""
+
+
+class PermanentError(Exception):
+    """A failure that will not go away on a retry."""
+
+
+def _describe(error):
+    lines = str(error).strip().splitlines()
+    return f"{type(error).__name__}: {lines[0]}" if lines else type(error).__name__
+
+
+def classify_failure(error):
+    """
+    Return (retryable, reason) for the exception a scrape failed with.
+
+    Parsing errors and PERMANENT_STATUS_CODES responses are permanent;
+    network, browser and unknown errors are retryable. None (a failure
+    without an exception) is retryable too.
+    """
+    if error is None:
+        return True, "no record"
+    if isinstance(error, PermanentError):
+        return False, str(error)
+    if isinstance(error, RetryableError):
+        return True, str(error)
+    status = getattr(getattr(error, 'response', None), 'status_code', None)
+    if status is not None:
+        return status not in PERMANENT_STATUS_CODES, f"HTTP {status}"
+    if isinstance(error, (ValueError, LookupError, AttributeError, TypeError)):
+        return False, f"parse error: {_describe(error)}"
+    return True, _describe(error)
+
+
+class RetryScheduler:
+    """
+    Per-URL attempt counts and a delayed-retry queue shared by the workers.
+
+    failed() either schedules another attempt after a jittered exponential
+    backoff or, for permanent failures and URLs out of attempts, records
+    the URL with its reason in `permanent`. Workers draw URLs through
+    next_url(), which hands out a retry once its backoff has passed and
+    fresh URLs otherwise, so a URL backing off never holds up a worker
+    that has other work.
+    """
+
+    def __init__(self, max_attempts=DEFAULT_MAX_ATTEMPTS, base_delay=DEFAULT_BASE_DELAY,
+                 max_delay=DEFAULT_MAX_DELAY):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.attempts = {}  # url -> failed attempts so far
+        self.permanent = {}  # url -> {"reason", "attempts", "retryable"}
+        self.retried = 0
+        self._cond = threading.Condition()
+        self._delayed = []  # heap of (due, seq, url)
+        self._seq = itertools.count()
+
+    @property
+    def pending(self):
+        with self._cond:
+            return len(self._delayed)
+
+    def backoff(self, attempt):
+        """
+        Delay before retry number `attempt`: half of the capped exponential
+        step plus a random share of the other half, so workers that failed
+        together don't retry together.
+        """
+        step = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return step / 2 + random.uniform(0, step / 2)
+
+    def failed(self, url, error=None):
+        """
+        Record a failed attempt at url; returns True if it will be retried,
+        False if it has failed for good.
+        """
+        retryable, reason = classify_failure(error)
+        with self._cond:
+            attempt = self.attempts[url] = self.attempts.get(url, 0) + 1
+            if retryable and attempt < self.max_attempts:
+                delay = self.backoff(attempt)
+                heapq.heappush(self._delayed, (time.monotonic() + delay, next(self._seq), url))
+                self.retried += 1
+                self._cond.notify_all()
+            else:
+                self.permanent[url] = {"reason": reason, "attempts": attempt, "retryable": retryable}
+                delay = None
+
+        if delay is not None:
+            logger.info(f"Retrying {url} in {delay:.1f}s (attempt {attempt + 1}/{self.max_attempts}): {reason}")
+            return True
+        logger.warning(f"Giving up on {url} after {attempt} attempt(s): {reason}")
+        return False
+
+    def give_up(self, url, reason):
+        """
+        Record url as permanently failed without retrying it.
+        """
+        with self._cond:
+            attempt = self.attempts[url] = self.attempts.get(url, 0) + 1
+            self.permanent[url] = {"reason": reason, "attempts": attempt, "retryable": False}
+
+    def next_url(self, url_queue, wait=True):
+        """
+        Move retries whose backoff has passed into url_queue and take the
+        next URL from it. If only retries still backing off are left, wait
+        for the first one to come due (or return None with wait=False);
+        returns None once url_queue is empty and no retries are pending.
+        """
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                while self._delayed and self._delayed[0][0] <= now:
+                    url_queue.put(heapq.heappop(self._delayed)[2])
+                try:
+                    return url_queue.get(block=False)
+                except queue.Empty:
+                    pass
+                if not self._delayed or not wait:
+                    return None
+                # failed() notifies, in case it schedules an earlier retry.
+                self._cond.wait(self._delayed[0][0] - now)
+
+    def write_failures(self, path):
+        """
+        Write the permanently failed URLs and their reasons to path as JSON.
+        """
+        with self._cond:
+            failures = [{"url": url, **info} for url, info in self.permanent.items()]
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(failures, f, indent=2)
+
+    def summary(self):
+        return (f"Retries: {self.retried} scheduled, {len(self.permanent)} URLs failed permanently, "
+                f"{self.pending} still pending")
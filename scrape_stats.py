@@ -0,0 +1,106 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+FIELD_SOURCES = ("primary", "fallback", "na")
+
+
+class ScrapeStats:
+    """
+    Wall time per scrape stage, how each record field was found, and
+    counts of notable events (wait timeouts, fallbacks), shared by all the
+    workers of a run.
+
+    Parser processes keep their own instance and send back to_dict(),
+    which the parent folds in with merge().
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stages = {}  # stage -> [count, total seconds, max seconds]
+        self.fields = {}  # field -> {source: count}
+        self.events = {}  # event -> count
+
+    @contextmanager
+    def timer(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(stage, time.perf_counter() - start)
+
+    def add_time(self, stage, seconds):
+        with self._lock:
+            entry = self.stages.setdefault(stage, [0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] = max(entry[2], seconds)
+
+    def record_fields(self, sources):
+        """
+        Count one record's fields; sources maps field -> one of FIELD_SOURCES.
+        """
+        with self._lock:
+            for field, source in sources.items():
+                counts = self.fields.setdefault(field, dict.fromkeys(FIELD_SOURCES, 0))
+                counts[source] += 1
+
+    def count(self, event, n=1):
+        with self._lock:
+            self.events[event] = self.events.get(event, 0) + n
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "stages": {
+                    stage: {"count": count, "total_s": round(total, 6), "max_s": round(longest, 6),
+                            "mean_ms": round(total / count * 1000, 3) if count else 0.0}
+                    for stage, (count, total, longest) in self.stages.items()
+                },
+                "fields": {field: dict(counts) for field, counts in self.fields.items()},
+                "events": dict(self.events),
+            }
+
+    def merge(self, snapshot):
+        """
+        Fold in a to_dict() snapshot from another ScrapeStats.
+        """
+        with self._lock:
+            for stage, s in snapshot.get("stages", {}).items():
+                entry = self.stages.setdefault(stage, [0, 0.0, 0.0])
+                entry[0] += s["count"]
+                entry[1] += s["total_s"]
+                entry[2] = max(entry[2], s["max_s"])
+            for field, counts in snapshot.get("fields", {}).items():
+                mine = self.fields.setdefault(field, dict.fromkeys(FIELD_SOURCES, 0))
+                for source, n in counts.items():
+                    mine[source] = mine.get(source, 0) + n
+            for event, n in snapshot.get("events", {}).items():
+                self.events[event] = self.events.get(event, 0) + n
+
+    def write_json(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def summary(self):
+        """
+        The stats as fixed-width text tables, slowest stages first.
+        """
+        data = self.to_dict()
+        lines = [f"{'Stage':<20} {'Count':>7} {'Total s':>9} {'Mean ms':>9} {'Max ms':>9}"]
+        for stage, s in sorted(data["stages"].items(), key=lambda item: -item[1]["total_s"]):
+            lines.append(f"{stage:<20} {s['count']:>7} {s['total_s']:>9.2f} {s['mean_ms']:>9.1f} "
+                         f"{s['max_s'] * 1000:>9.1f}")
+
+        lines.append("")
+        lines.append(f"{'Field':<20} " + " ".join(f"{source:>9}" for source in FIELD_SOURCES))
+        for field, counts in data["fields"].items():
+            lines.append(f"{field:<20} " + " ".join(f"{counts.get(source, 0):>9}" for source in FIELD_SOURCES))
+
+        if data["events"]:
+            lines.append("")
+            lines.append(f"{'Event':<30} {'Count':>7}")
+            for event, n in sorted(data["events"].items()):
+                lines.append(f"{event:<30} {n:>7}")
+        return "\n".join(lines)
@@ -0,0 +1,100 @@
+"""
+Unit tests for the AIMD concurrency controller.
+"""
+
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from concurrency import AimdController
+
+
+def run_pages(controller, outcomes, latency=1.0):
+    """Start and finish one page per outcome, one at a time."""
+    for outcome in outcomes:
+        controller.release(controller.acquire(), latency, outcome)
+
+
+class TestAimdController:
+    """Test growing and shrinking the pages in flight."""
+
+    @pytest.mark.unit
+    def test_healthy_window_adds_one(self):
+        """Test that a full window of fast, successful pages raises the limit by one."""
+        controller = AimdController(4, max_limit=8)
+        run_pages(controller, ["ok"] * 3)
+        assert controller.limit == 4
+
+        run_pages(controller, ["ok"])
+        assert controller.limit == 5
+
+        run_pages(controller, ["ok"] * 5)
+        assert controller.limit == 6
+
+    @pytest.mark.unit
+    def test_blocked_page_halves_at_once(self):
+        """Test that a block signal cuts the limit without waiting for the window."""
+        controller = AimdController(8)
+        run_pages(controller, ["blocked"])
+        assert controller.limit == 4
+        assert controller.decreases == 1
+
+    @pytest.mark.unit
+    def test_pages_started_before_a_cut_are_ignored(self):
+        """Test that pages already in flight when the limit is cut don't cut it again."""
+        controller = AimdController(8)
+        tickets = [controller.acquire() for _ in range(4)]
+
+        controller.release(tickets[0], 1.0, "blocked")
+        for ticket in tickets[1:]:
+            controller.release(ticket, 1.0, "blocked")
+
+        assert controller.limit == 4
+        assert controller.active == 0
+
+    @pytest.mark.unit
+    def test_error_rate_and_latency_cut(self):
+        """Test that a window with too many errors, or much slower pages, is cut."""
+        controller = AimdController(5, max_limit=8)
+        run_pages(controller, ["ok", "error", "ok", "ok", "ok"])
+        assert controller.limit == 6
+        run_pages(controller, ["error", "error", "ok", "ok", "ok", "ok"])
+        assert controller.limit == 3
+
+        run_pages(controller, ["ok"] * 3, latency=1.0)
+        assert controller.limit == 4
+        run_pages(controller, ["ok"] * 4, latency=5.0)
+        assert controller.limit == 2
+
+    @pytest.mark.unit
+    def test_limit_stays_in_bounds(self):
+        """Test that the limit never leaves [min_limit, max_limit]."""
+        controller = AimdController(10, min_limit=2, max_limit=3)
+        assert controller.limit == 3
+        run_pages(controller, ["ok"] * 20)
+        assert controller.limit == 3
+        run_pages(controller, ["blocked"] * 5)
+        assert controller.limit == 2
+        assert controller.lowest == 2 and controller.highest == 3
+
+    @pytest.mark.unit
+    def test_acquire_waits_for_a_free_slot(self):
+        """Test that no more than `limit` pages are in flight."""
+        controller = AimdController(2)
+        first, second = controller.acquire(), controller.acquire()
+        assert controller.try_acquire() is None
+
+        acquired = threading.Event()
+        thread = threading.Thread(target=lambda: (controller.acquire(), acquired.set()))
+        thread.start()
+        assert not acquired.wait(0.1)
+
+        controller.release(first)
+        assert acquired.wait(1)
+        thread.join()
+        controller.release(second)
+        assert controller.active == 1
@@ -0,0 +1,71 @@
+"""
+Unit tests for the slotted FundRecord.
+"""
+
+import os
+import pickle
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fund_record import FIELDS, FundRecord, records_frame
+
+
+class TestFundRecord:
+    """Test the dict-like fixed-schema record."""
+
+    @pytest.mark.unit
+    def test_reads_like_a_dict(self):
+        """Test item access, get, iteration order and equality with the equivalent dict."""
+        record = FundRecord({"Fund Name": "Fund A", "AUM": "₹1,000 Cr"})
+        record["URL"] = "https://groww.in/mutual-funds/a"
+
+        assert record["Fund Name"] == "Fund A"
+        assert record["Benchmark"] == "NA"
+        assert record.get("AUM") == "₹1,000 Cr"
+        assert list(record) == list(FIELDS)
+        assert record == record.to_dict()
+
+    @pytest.mark.unit
+    def test_rejects_unknown_fields(self):
+        """Test that the schema is fixed."""
+        record = FundRecord()
+
+        with pytest.raises(KeyError):
+            record["Std Dev"] = "1.2"
+        assert not hasattr(record, '__dict__')
+
+    @pytest.mark.unit
+    def test_repeated_values_interned(self):
+        """Test that records share one string per distinct fund type, even after pickling."""
+        a = FundRecord({"Fund Type": "".join(["Large ", "Cap"])})
+        b = FundRecord({"Fund Type": "".join(["Large", " Cap"])})
+        c = pickle.loads(pickle.dumps(b))
+
+        assert a["Fund Type"] is b["Fund Type"] is c["Fund Type"]
+        assert c == b
+
+    @pytest.mark.unit
+    def test_pickles_smaller_than_dict(self):
+        """Test that records cross process boundaries as values only."""
+        record = FundRecord({field: "1.5%" for field in FIELDS})
+
+        assert len(pickle.dumps(record)) < len(pickle.dumps(record.to_dict()))
+
+
+class TestRecordsFrame:
+    """Test the bulk DataFrame conversion."""
+
+    @pytest.mark.unit
+    def test_records_to_frame(self):
+        """Test that records become rows in FIELDS order, and plain dicts are still accepted."""
+        records = [FundRecord({"Fund Name": "Fund A"}), FundRecord({"Fund Name": "Fund B", "AUM": "500"})]
+
+        df = records_frame(records)
+        mixed = records_frame(records[:1] + [{"Fund Name": "Fund C"}])
+
+        assert list(df.columns) == list(FIELDS)
+        assert df["AUM"].tolist() == ["NA", "500"]
+        assert mixed["Fund Name"].tolist() == ["Fund A", "Fund C"]
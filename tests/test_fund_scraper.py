@@ -8,13 +8,24 @@ without requiring actual web scraping or browser automation.
 import pytest
 from bs4 import BeautifulSoup
 from unittest.mock import Mock, MagicMock, patch
+import json
 import os
+import queue
+import re
 import sys
+import time
 
 # Add parent directory to path to import the module
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from get_mutual_fund_details import FundScraper
+from get_mutual_fund_details import (
+    DriverPool, EXTRACTION_PLAN, ExtractionPlan, FIELD_SCHEMA, FieldSpec, FundScraper, HttpFundScraper,
+    MemoryTracker, MultiTabScraper, RecyclePolicy, ResourceBlocker, REQUIRED_SELECTORS, TAB_NAVIGATE_JS,
+    TAB_STATUS_JS, TableIndex, block_signal, build_chrome_options, extract_page_state, find_all_targets
+)
+from concurrency import AimdController
+from html_cache import HtmlCache
+from retry import PermanentError, RetryableError
 
 
 @pytest.fixture
@@ -25,6 +36,14 @@ def sample_html():
         return f.read()
 
 
+@pytest.fixture
+def sample_state_html():
+    """Load sample HTML fixture that carries the embedded page-state JSON."""
+    fixture_path = os.path.join(os.path.dirname(__file__), 'fixtures', 'sample_fund_page_state.html')
+    with open(fixture_path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
 @pytest.fixture
 def sample_soup(sample_html):
     """Create BeautifulSoup object from sample HTML."""
@@ -87,21 +106,43 @@ class TestFundScraperAUM:
         </html>
         """
         soup = BeautifulSoup(html, 'html.parser')
-        
-        # Mock driver to simulate finding elements
-        mock_elem = MagicMock()
-        mock_elem.text = "Fund size ₹1,234Cr"
-        mock_elem.get_attribute.return_value = "Fund size ₹1,234Cr"
-        mock_driver.find_elements.return_value = [mock_elem]
-        
         scraper_instance.driver = mock_driver
         tables = soup.find_all('table')
         
-        result = scraper_instance._extract_aum(tables, "Some Fund Name")
+        result = scraper_instance._extract_aum(tables, "Some Fund Name", soup=soup)
         
         # Should extract using regex fallback
-        assert "1,234" in result or "1234" in result
+        assert result == "1,234"
     
+    @pytest.mark.unit
+    def test_extract_aum_fallback_from_soup(self, scraper_instance):
+        """Test that the text fallback reads the value from the parent when the label is on its own."""
+        html = """
+        <html>
+        <body>
+            <div><span>Fund size</span><span>₹1,234.5Cr</span></div>
+        </body>
+        </html>
+        """
+        soup = BeautifulSoup(html, 'html.parser')
+
+        result = scraper_instance._extract_aum(soup.find_all('table'), "Some Fund Name", soup=soup)
+
+        assert result == "1,234.5"
+
+    @pytest.mark.unit
+    def test_extract_aum_fallback_never_touches_driver(self, scraper_instance, mock_driver):
+        """Test that the fallback runs on the page source even while a live driver is attached."""
+        html = "<html><body><p>FUND SIZE</p><p>₹ 987.6 Cr</p></body></html>"
+        soup = BeautifulSoup(html, 'html.parser')
+        scraper_instance.driver = mock_driver
+
+        result = scraper_instance._extract_aum([], "Some Fund Name", soup=soup)
+
+        assert result == "987.6"
+        mock_driver.find_elements.assert_not_called()
+        mock_driver.find_element.assert_not_called()
+
     @pytest.mark.unit
     def test_extract_aum_not_found(self, scraper_instance, mock_driver):
         """Test AUM extraction when data is not available."""
@@ -273,21 +314,151 @@ class TestFundScraperManagers:
         assert data["Fund Managers"] == ""
 
 
+class TestFundScraperPageLoad:
+    """Test waiting for the page sections before capturing the page source."""
+
+    @pytest.mark.unit
+    def test_fetch_waits_for_sections_without_sleeping(self, scraper_instance, sample_html):
+        """Test that the fetch uses the in-browser section wait instead of fixed sleeps."""
+        scraper_instance.driver.page_source = sample_html
+        scraper_instance.driver.execute_async_script.return_value = {
+            "reason": "ready", "sections": {"returns": True}, "elapsed_ms": 120
+        }
+
+        with patch('get_mutual_fund_details.time.sleep') as mock_sleep:
+            page_source = scraper_instance._fetch_with_driver("https://groww.in/mutual-funds/x ")
+
+        mock_sleep.assert_not_called()
+        scraper_instance.driver.get.assert_called_once_with("https://groww.in/mutual-funds/x")
+        script, timeout_ms, quiet_ms, required = scraper_instance.driver.execute_async_script.call_args[0]
+        assert "MutationObserver" in script
+        assert timeout_ms == 10000
+        assert page_source == sample_html
+
+    @pytest.mark.unit
+    def test_fetch_takes_rate_limit_token_first(self, scraper_instance, sample_html):
+        """Test that navigation only starts once the shared limiter allows it."""
+        calls = []
+        scraper_instance.rate_limiter = MagicMock()
+        scraper_instance.rate_limiter.acquire.side_effect = lambda url: calls.append(('acquire', url))
+        scraper_instance.driver.get.side_effect = lambda url: calls.append(('get', url))
+        scraper_instance.driver.page_source = sample_html
+
+        scraper_instance._fetch_with_driver("https://groww.in/mutual-funds/x")
+
+        assert calls == [('acquire', "https://groww.in/mutual-funds/x"), ('get', "https://groww.in/mutual-funds/x")]
+
+    @pytest.mark.unit
+    def test_wait_reports_missing_sections(self, scraper_instance):
+        """Test that a page settling without every section is still returned."""
+        scraper_instance.driver.execute_async_script.return_value = {
+            "reason": "quiet", "sections": {"returns": True, "ratios": False}, "elapsed_ms": 900
+        }
+
+        status = scraper_instance._wait_for_sections(timeout=2)
+
+        scraper_instance.driver.set_script_timeout.assert_called_once_with(7)
+        assert status["reason"] == "quiet"
+
+    @pytest.mark.unit
+    def test_wait_gates_on_required_elements(self, scraper_instance):
+        """Test that the wait is told which elements must exist and warns when they never appear."""
+        scraper_instance.driver.execute_async_script.return_value = {
+            "reason": "timeout", "required": False, "sections": {}, "elapsed_ms": 2000
+        }
+
+        with patch('get_mutual_fund_details.logger') as mock_logger:
+            scraper_instance._wait_for_sections(timeout=2)
+
+        script, timeout_ms, quiet_ms, required = scraper_instance.driver.execute_async_script.call_args[0]
+        assert required == REQUIRED_SELECTORS
+        assert "required()" in script
+        mock_logger.warning.assert_called_once()
+
+
+class TestTableIndex:
+    """Test the per-page table index shared by the extractors."""
+
+    @pytest.mark.unit
+    def test_classifies_tables_by_role(self, sample_soup):
+        """Test that each fixture table gets the expected role."""
+        index = TableIndex(sample_soup.find_all('table'))
+
+        assert len(index.tables) == 5
+        assert [len(index.by_role(r)) for r in ('fund_size', 'benchmark', 'returns', 'ratios', 'stats')] == [1, 1, 1, 1, 1]
+        returns = index.by_role('returns')[0]
+        assert returns.headers[:5] == ["Period", "1Y", "3Y", "5Y", "All"]
+        assert returns.rows[1].cells == ["Fund returns", "15.2%", "18.5%", "14.3%", "12.8%"]
+        assert index.by_role('benchmark')[0].rows[0].th == "Fund benchmark"
+
+    @pytest.mark.unit
+    def test_extractors_share_one_index(self, scraper_instance, sample_soup):
+        """Test that extractors given an index produce the same values without re-reading the tables."""
+        index = TableIndex(sample_soup.find_all('table'))
+        data = {"Fund Name": "HDFC Equity Growth Fund"}
+
+        with patch('bs4.element.Tag.find_all', side_effect=AssertionError("table re-scanned")):
+            scraper_instance._extract_returns_and_rank(index, data)
+            scraper_instance._extract_ratios(index, data)
+            data["Benchmark"] = scraper_instance._extract_benchmark(index)
+            data["AUM"] = scraper_instance._extract_aum(index, "HDFC Equity Growth Fund - Direct Plan - Growth")
+
+        assert data["3Y Rank"] == "32"
+        assert data["Sharpe"] == "1.45"
+        assert data["Benchmark"] == "Nifty 50 TRI"
+        assert data["AUM"] == "₹5,234.56 Cr"
+
+
+class TestExtractionPlan:
+    """Test the compiled field schema."""
+
+    @pytest.mark.unit
+    def test_plan_reads_each_target_once(self, sample_soup):
+        """Test that a page costs one lookup per element target, however many fields read it."""
+        tables = TableIndex(sample_soup.find_all('table'))
+
+        with patch('get_mutual_fund_details.find_all_targets', wraps=find_all_targets) as lookups:
+            data = EXTRACTION_PLAN.run(sample_soup, tables)
+
+        targets = [c.args[1] for c in lookups.call_args_list]
+        assert sorted(targets) == sorted(set(targets))
+        assert list(data) == [spec.field for spec in FIELD_SCHEMA]
+        assert data["Expense Ratio"] == "0.75%"
+        assert data["All Rank"] != "NA"
+        assert data["AUM"] == "NA"  # left to FundScraper._extract_aum
+
+    @pytest.mark.unit
+    def test_new_field_adds_no_pass(self, sample_soup):
+        """Test that a field declared on an existing role is read in the same walk over the tables."""
+        schema = FIELD_SCHEMA + [FieldSpec("Std Dev", role='stats', row_label="Sharpe", layout='th',
+                                           normalize=lambda v: v + "!")]
+        plan = ExtractionPlan(schema)
+        tables = TableIndex(sample_soup.find_all('table'))
+
+        with patch('get_mutual_fund_details.find_all_targets', wraps=find_all_targets) as lookups:
+            data = plan.run(sample_soup, tables)
+
+        assert lookups.call_count == len({spec.target for spec in FIELD_SCHEMA if spec.target})
+        assert data["Std Dev"] == data["Sharpe"] + "!"
+
+    @pytest.mark.unit
+    def test_inconsistent_role_rejected(self):
+        """Test that fields of one role must agree on how its rows are laid out."""
+        with pytest.raises(ValueError):
+            ExtractionPlan([FieldSpec("A", role='stats', row_label="Alpha", layout='th'),
+                            FieldSpec("B", role='stats', row_label="Beta")])
+
+
 class TestFundScraperIntegration:
     """Integration tests for complete data parsing."""
     
     @pytest.mark.unit
     def test_parse_data_complete(self, scraper_instance, sample_soup, mock_driver):
-        """Test complete data parsing with all fields."""
-        # Mock WebDriverWait to return fund name
-        with patch('get_mutual_fund_details.WebDriverWait') as mock_wait:
-            mock_elem = MagicMock()
-            mock_elem.text = "HDFC Equity Growth Fund - Direct Plan - Growth"
-            mock_wait.return_value.until.return_value = mock_elem
-            
-            scraper_instance.driver = mock_driver
-            result = scraper_instance._parse_data(sample_soup, mock_driver)
-        
+        """Test complete data parsing with all fields, without touching the driver."""
+        scraper_instance.driver = mock_driver
+        result = scraper_instance._parse_data(sample_soup)
+
+        assert mock_driver.mock_calls == []
         # Verify all key fields are extracted
         assert result["Fund Name"] == "HDFC Equity Growth Fund - Direct Plan - Growth"
         assert result["Fund Type"] == "Large Cap"
@@ -300,6 +471,37 @@ class TestFundScraperIntegration:
         assert "Rahul Goswami" in result["Fund Managers"]
 
 
+class TestFundScraperStats:
+    """Test the instrumentation recorded while scraping."""
+
+    @pytest.mark.unit
+    def test_parse_records_stages_and_field_sources(self, sample_html):
+        """Test that a parse times its stages and counts how every field was found."""
+        scraper = FundScraper()
+        scraper._parse_html(sample_html)
+        scraper._parse_html(sample_html.replace("Fund Size", "Size"))
+
+        stages = scraper.stats.to_dict()["stages"]
+        for stage in ('parse', 'soup', 'tables', 'extract', 'extract.aum'):
+            assert stages[stage]["count"] == 2
+        assert scraper.stats.fields["Fund Name"] == {"primary": 2, "fallback": 0, "na": 0}
+        assert scraper.stats.fields["AUM"]["primary"] == 1
+        assert scraper.stats.fields["AUM"]["fallback"] + scraper.stats.fields["AUM"]["na"] == 1
+
+    @pytest.mark.unit
+    def test_fetch_records_wait_outcome(self, scraper_instance, sample_html):
+        """Test that the browser stages are timed and wait timeouts counted."""
+        scraper_instance.driver.page_source = sample_html
+        scraper_instance.driver.execute_async_script.return_value = {
+            "reason": "timeout", "required": True, "sections": {"ratios": False}, "elapsed_ms": 10000
+        }
+
+        scraper_instance._fetch_with_driver("https://groww.in/mutual-funds/x")
+
+        assert set(scraper_instance.stats.stages) >= {'driver.get', 'wait_for_sections', 'page_source'}
+        assert scraper_instance.stats.events == {"wait.timeout": 1}
+
+
 class TestFundScraperDriverSetup:
     """Test driver setup and context manager."""
     
@@ -324,3 +526,666 @@ class TestFundScraperDriverSetup:
         """Test FundScraper initialization."""
         scraper = FundScraper()
         assert scraper.driver is None
+
+
+class TestFundScraperPageState:
+    """Test the embedded page-state JSON parse path."""
+
+    @pytest.mark.unit
+    def test_state_mode_skips_dom(self, sample_state_html):
+        """Test that a complete page state is mapped without building a soup."""
+        scraper = FundScraper(parse_mode='state')
+        with patch('get_mutual_fund_details.BeautifulSoup') as mock_soup:
+            result = scraper._parse_html(sample_state_html)
+
+        mock_soup.assert_not_called()
+        assert result["Fund Name"] == "HDFC Equity Growth Fund - Direct Plan - Growth"
+        assert result["Fund Type"] == "Large Cap"
+        assert result["AUM"] == "₹5,234.56 Cr"
+        assert result["1Y Fund Return"] == "15.2%"
+        assert result["3Y Category Avg"] == "16.2%"
+        assert result["All Fund Return"] == "12.8%"
+        assert result["Alpha"] == "2.5"
+        assert result["Sortino"] == "1.85"
+        assert result["Expense Ratio"] == "0.75%"
+        assert result["Benchmark"] == "Nifty 50 TRI"
+        assert result["Fund Managers"] == "Rahul Goswami (Since Jun 2018), Priya Sharma (Since Jan 2020)"
+        assert result["1Y Rank"] == "NA"
+
+    @pytest.mark.unit
+    def test_state_mode_reads_table_fields_state_lacks(self, sample_html, sample_state_html):
+        """Test that ranks and P/E, P/B come from the tables when the state blob is complete."""
+        blob = re.search(r'<script[^>]*__NEXT_DATA__.*?</script>', sample_state_html, re.DOTALL).group(0)
+        html = sample_html.replace('</body>', blob + '</body>')
+
+        dom = FundScraper()._parse_html(html)
+        state = FundScraper(parse_mode='state')._parse_html(html)
+
+        assert state["1Y Rank"] == "45"
+        assert state["P/E Ratio"] != "NA"
+        assert state == dom
+
+    @pytest.mark.unit
+    def test_state_mode_falls_back_to_dom(self, sample_html):
+        """Test that pages without a state blob are parsed from the DOM."""
+        scraper = FundScraper(parse_mode='state')
+        result = scraper._parse_html(sample_html)
+
+        assert result["AUM"] == "₹5,234.56 Cr"
+        assert result["1Y Rank"] == "45"
+
+    @pytest.mark.unit
+    def test_state_mode_merges_dom_for_missing_required(self, sample_state_html):
+        """Test that the DOM fills required fields the state blob lacks."""
+        html = sample_state_html.replace('"sub_category": "Large Cap",', '')
+        html = html.replace('<div id="__next">', '<div id="__next"><div class="mfh239PillsContainer">Equity</div>'
+                                                 '<div class="mfh239PillsContainer">Large Cap</div>')
+        scraper = FundScraper(parse_mode='state')
+        result = scraper._parse_html(html)
+
+        assert result["Fund Type"] == "Large Cap"
+        assert result["1Y Fund Return"] == "15.2%"
+
+    @pytest.mark.unit
+    def test_extract_page_state_invalid_json(self):
+        """Test that a malformed state blob is ignored."""
+        html = '<script id="__NEXT_DATA__" type="application/json">{not json</script>'
+        assert extract_page_state(html) is None
+
+
+class TestHttpFundScraper:
+    """Test the HTTP-only engine and its Chrome fallback."""
+
+    @pytest.mark.unit
+    def test_scrape_url_without_browser(self, sample_html):
+        """Test that a complete static page is parsed without starting Chrome."""
+        session = MagicMock()
+        session.get.return_value.text = sample_html
+
+        scraper = HttpFundScraper(session=session)
+        with patch.object(FundScraper, 'setup_driver') as mock_setup:
+            result = scraper.scrape_url("https://groww.in/mutual-funds/test-fund")
+
+        mock_setup.assert_not_called()
+        assert scraper.driver is None
+        assert result["Fund Name"] == "HDFC Equity Growth Fund - Direct Plan - Growth"
+        assert result["AUM"] == "₹5,234.56 Cr"
+        assert result["Benchmark"] == "Nifty 50 TRI"
+        assert result["URL"] == "https://groww.in/mutual-funds/test-fund"
+
+    @pytest.mark.unit
+    def test_falls_back_to_chrome_when_fields_missing(self):
+        """Test that an incomplete static page is re-scraped through Chrome."""
+        session = MagicMock()
+        session.get.return_value.text = "<html><body><h1 class='mfh239SchemeName'>X</h1></body></html>"
+
+        scraper = HttpFundScraper(session=session)
+        with patch.object(FundScraper, '_scrape_live', return_value={"Fund Name": "X"}) as mock_chrome:
+            result = scraper.scrape_url("https://groww.in/mutual-funds/x")
+
+        mock_chrome.assert_called_once_with("https://groww.in/mutual-funds/x")
+        assert result == {"Fund Name": "X"}
+
+    @pytest.mark.unit
+    def test_fallback_page_counted_once(self, sample_html):
+        """Test that only the Chrome parse of a fallback page counts towards field and stage stats."""
+        session = MagicMock()
+        session.get.return_value.text = "<html><body><h1 class='mfh239SchemeName'>X</h1></body></html>"
+
+        scraper = HttpFundScraper(session=session)
+
+        def chrome(url):
+            return scraper._parse_html(sample_html)
+
+        with patch.object(FundScraper, '_scrape_live', side_effect=chrome):
+            assert scraper.scrape_url("https://groww.in/mutual-funds/x") is not None
+
+        assert scraper.stats.stages['parse'][0] == 1
+        assert scraper.stats.stages['http.parse'][0] == 1
+        assert sum(scraper.stats.fields["Fund Name"].values()) == 1
+        assert scraper.stats.fields["Fund Name"]["primary"] == 1
+
+    @pytest.mark.unit
+    def test_http_page_stats_kept(self, sample_html):
+        """Test that a complete HTTP page's parse is counted like any other."""
+        session = MagicMock()
+        session.get.return_value.text = sample_html
+
+        scraper = HttpFundScraper(session=session)
+        assert scraper.scrape_url("https://groww.in/mutual-funds/test-fund") is not None
+
+        assert scraper.stats.stages['parse'][0] == 1
+        assert 'http.parse' not in scraper.stats.stages
+        assert scraper.stats.fields["Fund Name"]["primary"] == 1
+
+    @pytest.mark.unit
+    def test_context_manager_starts_no_browser(self):
+        """Test that entering the HTTP scraper does not launch Chrome."""
+        with patch.object(FundScraper, 'setup_driver') as mock_setup:
+            with HttpFundScraper(session=MagicMock()) as scraper:
+                assert scraper.driver is None
+            mock_setup.assert_not_called()
+
+
+class TestBlockSignals:
+    """Test spotting throttled pages and reporting them to the concurrency controller."""
+
+    @pytest.mark.unit
+    def test_block_signal(self, sample_html):
+        """Test that empty pages and pages without the scheme name are flagged."""
+        assert block_signal(sample_html) is None
+        assert block_signal("") == "empty_page"
+        assert block_signal("<html><head></head><body></body></html>") == "empty_page"
+        assert block_signal("<html><body><h1>Too many requests</h1></body></html>") == "missing_mfh239SchemeName"
+
+    @pytest.mark.unit
+    def test_http_429_reported_as_blocked(self):
+        """Test that a throttled HTTP fetch cuts the shared limit and is left for a retry, not Chrome."""
+        session = MagicMock()
+        session.get.return_value.status_code = 429
+        session.get.return_value.ok = False
+        controller = AimdController(4)
+
+        scraper = HttpFundScraper(session=session, concurrency=controller)
+        with patch.object(FundScraper, '_scrape_live') as mock_chrome:
+            result = scraper.scrape_url("https://groww.in/mutual-funds/x")
+
+        mock_chrome.assert_not_called()
+        assert result is None
+        assert isinstance(scraper.last_error, RetryableError)
+        assert controller.limit == 2
+        assert controller.active == 0
+        assert scraper.stats.events["block.http_429"] == 1
+
+    @pytest.mark.unit
+    def test_http_errors_left_for_retry(self):
+        """Test that server errors and timeouts are retried later instead of re-fetched in Chrome."""
+        server_error = MagicMock(status_code=503, ok=False)
+        for outcome in (server_error, TimeoutError("read timed out")):
+            session = MagicMock()
+            session.get.side_effect = [outcome]
+
+            scraper = HttpFundScraper(session=session)
+            with patch.object(FundScraper, '_scrape_live') as mock_chrome:
+                assert scraper.scrape_url("https://groww.in/mutual-funds/x") is None
+
+            mock_chrome.assert_not_called()
+            assert isinstance(scraper.last_error, RetryableError)
+
+    @pytest.mark.unit
+    def test_blocked_page_fails_retryably(self, mock_driver, tmp_path):
+        """Test that a bot page is neither cached nor recorded, and is left for a retry."""
+        mock_driver.page_source = "<html><head></head><body></body></html>"
+        scraper = FundScraper(cache=HtmlCache(str(tmp_path)))
+        scraper.driver = mock_driver
+
+        assert scraper.scrape_url("https://groww.in/mutual-funds/x") is None
+        assert isinstance(scraper.last_error, RetryableError)
+        assert scraper.cache.get("https://groww.in/mutual-funds/x") is None
+
+    @pytest.mark.unit
+    def test_http_404_is_permanent(self):
+        """Test that a missing fund page is not re-fetched through Chrome."""
+        session = MagicMock()
+        session.get.return_value.status_code = 404
+
+        scraper = HttpFundScraper(session=session)
+        with patch.object(FundScraper, '_scrape_live') as mock_chrome:
+            assert scraper.scrape_url("https://groww.in/mutual-funds/gone") is None
+
+        mock_chrome.assert_not_called()
+        assert isinstance(scraper.last_error, PermanentError)
+
+    @pytest.mark.unit
+    def test_live_pages_hold_a_slot(self, mock_driver):
+        """Test that the browser is only started once a slot is free and pages report their outcome."""
+        controller = AimdController(1)
+        scraper = FundScraper(concurrency=controller)
+        with patch.object(FundScraper, 'setup_driver') as mock_setup:
+            with scraper:
+                mock_setup.assert_not_called()
+                scraper.driver = mock_driver
+                with patch.object(FundScraper, '_scrape_with_driver', side_effect=Exception("timeout")):
+                    assert scraper.scrape_url("https://groww.in/mutual-funds/x") is None
+
+        assert controller.active == 0
+        assert controller.limit == 1
+        assert controller.decreases == 0
+
+    @pytest.mark.unit
+    def test_rate_limit_wait_is_not_page_latency(self, sample_html):
+        """Test that queueing at the rate limiter doesn't make the controller cut its limit."""
+        def slow_get(url, timeout=None):
+            time.sleep(0.02)
+            return MagicMock(text=sample_html, status_code=200, ok=True)
+
+        session = MagicMock()
+        session.get.side_effect = slow_get
+        limiter = MagicMock()
+        # The first window sets the latency baseline; after that every
+        # token takes ten times as long as the page itself.
+        limiter.acquire.side_effect = lambda url, waits=iter([0, 0, 0.2, 0.2, 0.2]): time.sleep(next(waits))
+        controller = AimdController(2)
+
+        scraper = HttpFundScraper(session=session, rate_limiter=limiter, concurrency=controller)
+        for i in range(5):
+            assert scraper.scrape_url(f"https://groww.in/mutual-funds/f{i}") is not None
+
+        assert controller.decreases == 0
+        assert controller.limit == 4
+
+
+class TestFundScraperCache:
+    """Test serving pages from the HTML cache."""
+
+    @pytest.mark.unit
+    def test_cache_hit_skips_browser(self, sample_html, tmp_path):
+        """Test that a cached page is parsed without starting Chrome."""
+        cache = HtmlCache(str(tmp_path))
+        cache.put("https://groww.in/mutual-funds/test-fund", sample_html)
+
+        with patch.object(FundScraper, 'setup_driver') as mock_setup:
+            with FundScraper(cache=cache) as scraper:
+                result = scraper.scrape_url("https://groww.in/mutual-funds/test-fund")
+
+        mock_setup.assert_not_called()
+        assert result["Fund Name"] == "HDFC Equity Growth Fund - Direct Plan - Growth"
+        assert result["URL"] == "https://groww.in/mutual-funds/test-fund"
+
+    @pytest.mark.unit
+    def test_cache_miss_stores_page_source(self, sample_html, tmp_path):
+        """Test that a live scrape populates the cache."""
+        cache = HtmlCache(str(tmp_path))
+        scraper = FundScraper(cache=cache)
+        scraper.driver = MagicMock()
+        scraper.driver.page_source = sample_html
+        scraper.driver.execute_script.return_value = 1000
+        scraper.driver.find_elements.return_value = []
+        scraper.driver.find_element.return_value.text = "HDFC Equity Growth Fund - Direct Plan - Growth"
+
+        result = scraper.scrape_url("https://groww.in/mutual-funds/test-fund")
+
+        assert result["AUM"] == "₹5,234.56 Cr"
+        assert cache.get("https://groww.in/mutual-funds/test-fund") == sample_html
+
+    @pytest.mark.unit
+    def test_offline_miss_fails_without_browser(self, tmp_path):
+        """Test that offline mode never falls through to Chrome."""
+        scraper = FundScraper(cache=HtmlCache(str(tmp_path)), offline=True)
+        with patch.object(FundScraper, 'setup_driver') as mock_setup:
+            assert scraper.scrape_url("https://groww.in/mutual-funds/missing") is None
+        mock_setup.assert_not_called()
+
+
+def _perf_entry(method, **params):
+    return {"message": json.dumps({"message": {"method": method, "params": params}})}
+
+
+class TestResourceBlocker:
+    """Test blocking of resources the extractors never read."""
+
+    @pytest.mark.unit
+    def test_chrome_options(self):
+        """Test that blocking adds the image pref, host allow-list and performance logging."""
+        blocker = ResourceBlocker(block_types=['image', 'font'], allowed_domains=['groww.in', '*.groww.in'])
+        options = build_chrome_options(blocker)
+
+        assert '--headless' in options.arguments
+        assert '--host-resolver-rules=MAP * ~NOTFOUND, EXCLUDE groww.in, EXCLUDE *.groww.in' in options.arguments
+        assert options.experimental_options['prefs'] == {'profile.managed_default_content_settings.images': 2}
+        assert options.to_capabilities()['goog:loggingPrefs'] == {'performance': 'ALL'}
+        assert '*.woff2' in blocker.url_patterns
+        assert '*.mp4' not in blocker.url_patterns
+
+    @pytest.mark.unit
+    def test_install_sets_blocked_urls(self):
+        """Test that URL patterns are pushed to DevTools."""
+        driver = MagicMock()
+        ResourceBlocker(block_types=['font']).install(driver)
+
+        driver.execute_cdp_cmd.assert_any_call('Network.enable', {})
+        driver.execute_cdp_cmd.assert_any_call('Network.setBlockedURLs', {'urls': ['*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot']})
+
+    @pytest.mark.unit
+    def test_count_requests(self):
+        """Test that allowed/blocked counts are read from the performance log and totalled."""
+        driver = MagicMock()
+        driver.get_log.return_value = [
+            _perf_entry("Network.requestWillBeSent", requestId="1"),
+            _perf_entry("Network.requestWillBeSent", requestId="2"),
+            _perf_entry("Network.requestWillBeSent", requestId="3"),
+            _perf_entry("Network.loadingFailed", requestId="2", blockedReason="inspector"),
+            _perf_entry("Network.loadingFailed", requestId="3", errorText="net::ERR_NAME_NOT_RESOLVED"),
+            _perf_entry("Network.responseReceived", requestId="1"),
+        ]
+        blocker = ResourceBlocker()
+
+        assert blocker.count_requests(driver) == (1, 2)
+        assert blocker.count_requests(driver) == (1, 2)
+        assert (blocker.allowed, blocker.blocked) == (2, 4)
+
+
+def _healthy_driver():
+    driver = MagicMock()
+    driver.execute_script.return_value = 1
+    return driver
+
+
+def _dead_driver():
+    driver = MagicMock()
+    driver.execute_script.side_effect = Exception("invalid session id")
+    return driver
+
+
+class TestDriverPool:
+    """Test the shared, health-checked browser pool."""
+
+    @pytest.mark.unit
+    def test_start_resolves_chromedriver_once(self):
+        """Test that the pool pre-warms N browsers with a single driver resolution."""
+        with patch('get_mutual_fund_details._chromedriver_path', None), \
+                patch('get_mutual_fund_details.ChromeDriverManager') as mock_manager, \
+                patch('get_mutual_fund_details.webdriver.Chrome') as mock_chrome, \
+                patch('get_mutual_fund_details.ChromeService'):
+            mock_chrome.side_effect = lambda **kwargs: _healthy_driver()
+            pool = DriverPool(3)
+            pool.start()
+
+        assert mock_manager.return_value.install.call_count == 1
+        assert mock_chrome.call_count == 3
+        drivers = [pool.acquire() for _ in range(3)]
+        assert len(set(map(id, drivers))) == 3
+
+    @pytest.mark.unit
+    def test_check_replaces_dead_browser(self):
+        """Test that a driver failing its health check is swapped for a new one."""
+        pool = DriverPool(1)
+        fresh = _healthy_driver()
+        dead = _dead_driver()
+        with patch.object(pool, '_create', return_value=fresh):
+            healthy = _healthy_driver()
+            assert pool.check(healthy) is healthy
+            assert pool.check(dead) is fresh
+
+        assert pool.replaced == 1
+
+    @pytest.mark.unit
+    def test_scraper_retries_url_on_replacement(self, sample_html):
+        """Test that a URL whose browser dies mid-page is retried on a fresh browser."""
+        dead = _dead_driver()
+        dead.get.side_effect = Exception("chrome not reachable")
+        fresh = _healthy_driver()
+        fresh.page_source = sample_html
+        fresh.find_elements.return_value = []
+        fresh.find_element.return_value.text = "HDFC Equity Growth Fund - Direct Plan - Growth"
+
+        pool = DriverPool(1)
+        pool.release(dead)
+        with patch.object(pool, 'check', side_effect=lambda d: d), \
+                patch.object(pool, '_create', return_value=fresh):
+            with FundScraper(pool=pool) as scraper:
+                result = scraper.scrape_url("https://groww.in/mutual-funds/test-fund")
+
+        assert result["Fund Name"] == "HDFC Equity Growth Fund - Direct Plan - Growth"
+        assert pool.replaced == 1
+        # The replacement goes back to the pool instead of being quit.
+        assert pool.acquire() is fresh
+        fresh.quit.assert_not_called()
+
+    @pytest.mark.unit
+    def test_failed_replacement_frees_its_slot_once(self, sample_html):
+        """Test that a replacement Chrome failing to start doesn't leave the dead browser in use."""
+        # Passes the check before the page, then dies loading it.
+        dying = MagicMock()
+        dying.execute_script.side_effect = [1, Exception("invalid session id")]
+        dying.get.side_effect = Exception("chrome not reachable")
+        fresh = _healthy_driver()
+        fresh.page_source = sample_html
+        fresh.find_elements.return_value = []
+        fresh.find_element.return_value.text = "HDFC Equity Growth Fund - Direct Plan - Growth"
+
+        pool = DriverPool(1)
+        with patch('get_mutual_fund_details.create_driver',
+                   side_effect=[dying, Exception("Chrome failed to start"), fresh]):
+            with FundScraper(pool=pool) as scraper:
+                assert scraper.scrape_url("https://groww.in/mutual-funds/f0") is None
+                assert scraper.driver is None
+                assert pool._live == 0
+                assert scraper.scrape_url("https://groww.in/mutual-funds/f1") is not None
+
+        assert pool._live == 1
+        assert pool.acquire() is fresh
+
+
+class TestBrowserRecycling:
+    """Test page-, age- and memory-based browser recycling."""
+
+    @pytest.mark.unit
+    def test_policy_reasons(self):
+        """Test that each limit triggers independently and None disables it."""
+        policy = RecyclePolicy(max_pages=100, max_age=600, max_rss_mb=1000)
+
+        assert policy.reason(10, 60, 200) is None
+        assert policy.reason(100, 60, 200) == "100 pages"
+        assert policy.reason(10, 600, 200) == "10 minutes old"
+        assert policy.reason(10, 60, 1200) == "1200 MB RSS"
+        assert policy.reason(10, 60, None) is None
+        assert RecyclePolicy().reason(10_000, 1e9, 1e9) is None
+
+    @pytest.mark.unit
+    def test_scraper_recycles_after_max_pages(self, sample_html):
+        """Test that the browser is replaced once it has served max_pages pages."""
+        drivers = []
+
+        def new_driver(blocker=None):
+            driver = _healthy_driver()
+            driver.page_source = sample_html
+            driver.find_elements.return_value = []
+            driver.find_element.return_value.text = "HDFC Equity Growth Fund - Direct Plan - Growth"
+            drivers.append(driver)
+            return driver
+
+        tracker = MemoryTracker()
+        with patch('get_mutual_fund_details.create_driver', side_effect=new_driver), \
+                patch('get_mutual_fund_details.browser_rss_mb', return_value=300.0):
+            with FundScraper(recycle_policy=RecyclePolicy(max_pages=2), memory_tracker=tracker) as scraper:
+                for i in range(5):
+                    assert scraper.scrape_url(f"https://groww.in/mutual-funds/f{i}") is not None
+
+        assert len(drivers) == 3
+        drivers[0].quit.assert_called_once()
+        assert tracker.recycled == 2
+        assert tracker.samples == 5
+        assert "peak 300 MB, average 300 MB" in tracker.summary()
+
+    @pytest.mark.unit
+    def test_pool_counts_recycles_apart_from_replacements(self, sample_html):
+        """Test that policy recycles of pooled browsers aren't reported as unhealthy replacements."""
+        def new_driver():
+            driver = _healthy_driver()
+            driver.page_source = sample_html
+            driver.find_elements.return_value = []
+            driver.find_element.return_value.text = "HDFC Equity Growth Fund - Direct Plan - Growth"
+            return driver
+
+        pool = DriverPool(1)
+        with patch.object(pool, '_create', side_effect=new_driver), \
+                patch.object(pool, 'check', side_effect=lambda d: d):
+            with FundScraper(pool=pool, recycle_policy=RecyclePolicy(max_pages=2)) as scraper:
+                for i in range(4):
+                    assert scraper.scrape_url(f"https://groww.in/mutual-funds/f{i}") is not None
+
+        assert pool.recycled == 2
+        assert pool.replaced == 0
+
+
+class FakeTabDriver:
+    """Minimal multi-tab browser: each navigation becomes ready after `polls_to_load` status polls."""
+
+    def __init__(self, sample_html, polls_to_load=2):
+        self.sample_html = sample_html
+        self.polls_to_load = polls_to_load
+        self.tabs = {"tab-0": None}
+        self.current_window_handle = "tab-0"
+        self.polls = {}
+        self.max_loading = 0
+        self.switch_to = MagicMock()
+        self.switch_to.new_window.side_effect = self._new_window
+        self.switch_to.window.side_effect = self._switch
+
+    def _new_window(self, kind):
+        handle = f"tab-{len(self.tabs)}"
+        self.tabs[handle] = None
+        self.current_window_handle = handle
+
+    def _switch(self, handle):
+        self.current_window_handle = handle
+
+    def execute_script(self, script, *args):
+        handle = self.current_window_handle
+        if script == TAB_NAVIGATE_JS:
+            self.tabs[handle] = args[0]
+            self.polls[handle] = 0
+            loading = sum(1 for h, n in self.polls.items() if n < self.polls_to_load)
+            self.max_loading = max(self.max_loading, loading)
+            return None
+        if script == TAB_STATUS_JS:
+            self.polls[handle] += 1
+            return {"ready": self.polls[handle] >= self.polls_to_load}
+        return 1
+
+    @property
+    def page_source(self):
+        slug = self.tabs[self.current_window_handle].rsplit('/', 1)[-1]
+        return self.sample_html.replace("HDFC Equity Growth Fund - Direct Plan - Growth", f"Fund {slug}")
+
+    def quit(self):
+        pass
+
+
+class TestMultiTabScraper:
+    """Test driving several tabs of one browser concurrently."""
+
+    @pytest.mark.unit
+    def test_scrape_queue_multiplexes_tabs(self, sample_html):
+        """Test that every URL is scraped once, from its own tab, with pages loading concurrently."""
+        driver = FakeTabDriver(sample_html)
+        url_queue = queue.Queue()
+        urls = [f"https://groww.in/mutual-funds/f{i}" for i in range(7)]
+        for url in urls:
+            url_queue.put(url)
+        results, failed = [], []
+
+        scraper = MultiTabScraper(tabs=3)
+        scraper.driver = driver
+        with patch('get_mutual_fund_details.TAB_POLL_INTERVAL', 0):
+            scraper.scrape_queue(url_queue, results, failed)
+
+        assert failed == []
+        assert sorted(r["URL"] for r in results) == sorted(urls)
+        for r in results:
+            assert r["Fund Name"] == f"Fund {r['URL'].rsplit('/', 1)[-1]}"
+        assert len(driver.tabs) == 3
+        assert driver.max_loading == 3
+        assert url_queue.unfinished_tasks == 0
+
+    @pytest.mark.unit
+    def test_tab_recycles_reach_memory_tracker(self, sample_html):
+        """Test that browsers recycled between tab batches are counted like single-page recycles."""
+        drivers = []
+
+        def new_driver(blocker=None):
+            drivers.append(FakeTabDriver(sample_html))
+            return drivers[-1]
+
+        url_queue = queue.Queue()
+        urls = [f"https://groww.in/mutual-funds/f{i}" for i in range(7)]
+        for url in urls:
+            url_queue.put(url)
+        results, failed = [], []
+        tracker = MemoryTracker()
+
+        scraper = MultiTabScraper(tabs=2, recycle_policy=RecyclePolicy(max_pages=3), memory_tracker=tracker)
+        scraper.driver = new_driver()
+        with patch('get_mutual_fund_details.TAB_POLL_INTERVAL', 0), \
+                patch('get_mutual_fund_details.create_driver', side_effect=new_driver), \
+                patch('get_mutual_fund_details.browser_rss_mb', return_value=300.0):
+            scraper.scrape_queue(url_queue, results, failed)
+
+        assert sorted(r["URL"] for r in results) == sorted(urls)
+        assert len(drivers) > 1
+        assert tracker.recycled == len(drivers) - 1
+
+    @pytest.mark.unit
+    def test_tab_error_fails_only_that_page(self, sample_html):
+        """Test that a tab whose status probe raises on a healthy browser fails just its URL."""
+        driver = FakeTabDriver(sample_html)
+        execute_script = driver.execute_script
+
+        def flaky_probe(script, *args):
+            if script == TAB_STATUS_JS and driver.tabs[driver.current_window_handle].endswith("/f4"):
+                raise RuntimeError("tab crashed")
+            return execute_script(script, *args)
+
+        driver.execute_script = flaky_probe
+        url_queue = queue.Queue()
+        urls = [f"https://groww.in/mutual-funds/f{i}" for i in range(9)]
+        for url in urls:
+            url_queue.put(url)
+        results, failed = [], []
+
+        scraper = MultiTabScraper(tabs=3)
+        scraper.driver = driver
+        with patch('get_mutual_fund_details.TAB_POLL_INTERVAL', 0):
+            scraper.scrape_queue(url_queue, results, failed)
+
+        assert failed == ["https://groww.in/mutual-funds/f4"]
+        assert sorted(r["URL"] for r in results) == sorted(u for u in urls if u not in failed)
+        assert url_queue.unfinished_tasks == 0
+
+    @pytest.mark.unit
+    def test_navigation_error_fails_only_that_page(self, sample_html):
+        """Test that a navigation raising on a healthy browser fails that URL and the rest still load."""
+        driver = FakeTabDriver(sample_html)
+        execute_script = driver.execute_script
+
+        def flaky_navigate(script, *args):
+            if script == TAB_NAVIGATE_JS and args[0].endswith("/f1"):
+                raise RuntimeError("navigation refused")
+            return execute_script(script, *args)
+
+        driver.execute_script = flaky_navigate
+        url_queue = queue.Queue()
+        urls = [f"https://groww.in/mutual-funds/f{i}" for i in range(5)]
+        for url in urls:
+            url_queue.put(url)
+        results, failed = [], []
+
+        scraper = MultiTabScraper(tabs=2)
+        scraper.driver = driver
+        with patch('get_mutual_fund_details.TAB_POLL_INTERVAL', 0):
+            scraper.scrape_queue(url_queue, results, failed)
+
+        assert failed == ["https://groww.in/mutual-funds/f1"]
+        assert len(results) == 4
+        assert url_queue.unfinished_tasks == 0
+
+    @pytest.mark.unit
+    def test_concurrency_caps_tabs_in_flight(self, sample_html):
+        """Test that tabs only load pages the concurrency controller has slots for."""
+        driver = FakeTabDriver(sample_html)
+        url_queue = queue.Queue()
+        urls = [f"https://groww.in/mutual-funds/f{i}" for i in range(7)]
+        for url in urls:
+            url_queue.put(url)
+        results, failed = [], []
+        controller = AimdController(2, max_limit=2)
+
+        scraper = MultiTabScraper(tabs=3, concurrency=controller)
+        scraper.driver = driver
+        with patch('get_mutual_fund_details.TAB_POLL_INTERVAL', 0):
+            scraper.scrape_queue(url_queue, results, failed)
+
+        assert sorted(r["URL"] for r in results) == sorted(urls)
+        assert driver.max_loading == 2
+        assert controller.active == 0
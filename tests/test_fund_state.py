@@ -0,0 +1,62 @@
+"""
+Unit tests for the per-fund scrape state (fund_state.py).
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fund_record import FundRecord
+from fund_state import FundState
+
+DAY = 24 * 3600
+
+
+def fund(url, changes=None):
+    record = FundRecord({"Fund Name": "Fund", "Benchmark": "Nifty 50 TRI", "1Y Fund Return": "10.0%", "URL": url})
+    record.update(changes or {})
+    return record
+
+
+class TestFundState:
+    """Test recording scrapes and choosing which funds are due."""
+
+    @pytest.mark.unit
+    def test_field_changes_are_recorded(self, tmp_path):
+        """Test that each changed field is logged with its old and new value."""
+        with FundState(str(tmp_path / "state.db")) as state:
+            assert state.record([fund("a")], now=0) == {}
+            assert state.record([fund("a", {"1Y Fund Return": "11.0%"})], now=DAY) == {"a": ["1Y Fund Return"]}
+            assert state.record([fund("a", {"1Y Fund Return": "11.0%"})], now=2 * DAY) == {"a": []}
+
+            assert state.history("a") == [("1Y Fund Return", "10.0%", "11.0%", DAY)]
+            assert state.records(["a", "b"])["a"]["1Y Fund Return"] == "11.0%"
+            assert list(state.records(["a", "b"])) == ["a"]
+
+    @pytest.mark.unit
+    def test_due_by_age_and_stable_changes(self, tmp_path):
+        """Test that new, expired and stable-field-changed funds are due, and nothing else."""
+        with FundState(str(tmp_path / "state.db")) as state:
+            state.record([fund("old"), fund("fresh"), fund("moved"), fund("daily")], now=0)
+            state.record([fund("fresh"), fund("moved", {"Benchmark": "Nifty 100 TRI"}),
+                          fund("daily", {"1Y Fund Return": "12.0%"})], now=2 * DAY)
+
+            due = state.due(["new", "old", "fresh", "moved", "daily"], ttl=1.5 * DAY, now=2.5 * DAY)
+            assert due == ["new", "old", "moved"]
+
+            # Once it is re-scraped unchanged, the benchmark move is old news.
+            state.record([fund("moved", {"Benchmark": "Nifty 100 TRI"})], now=2.5 * DAY)
+            assert state.due(["moved"], ttl=1.5 * DAY, now=2.5 * DAY) == []
+
+    @pytest.mark.unit
+    def test_state_persists_across_runs(self, tmp_path):
+        """Test that a later run sees the state an earlier one stored."""
+        path = str(tmp_path / "state.db")
+        with FundState(path) as state:
+            state.record([fund("a")], now=0)
+        with FundState(path) as state:
+            assert state.due(["a"], ttl=DAY, now=DAY / 2) == []
+            assert state.records(["a"])["a"]["Benchmark"] == "Nifty 50 TRI"
@@ -90,3 +90,106 @@ class TestURLScraper:
         assert "pageNo=5" in paginated_url
         assert "sortBy=3" in paginated_url
         assert paginated_url.startswith("https://groww.in/mutual-funds/filter")
+
+
+def _listing_page(*slugs):
+    anchors = ''.join(f'<a class="pos-rel f22Link" href="/mutual-funds/{s}">{s}</a>' for s in slugs)
+    return f"<html><body>{anchors}</body></html>"
+
+
+class FakeSession:
+    """Serves listing pages 0..len(pages)-1; later pages repeat the last one."""
+
+    def __init__(self, filter_page, pages):
+        self.filter_page = filter_page
+        self.pages = pages
+        self.requested = []
+
+    def get(self, url, timeout=None):
+        self.requested.append(url)
+        response = MagicMock()
+        if "pageNo=" in url:
+            page_number = int(url.split("pageNo=")[1].split("&")[0])
+            response.text = self.pages[min(page_number, len(self.pages) - 1)]
+        else:
+            response.text = self.filter_page
+        return response
+
+
+class TestDiscovery:
+    """Test listing-page discovery in get_funds_urls.py."""
+
+    @pytest.fixture
+    def session(self):
+        return FakeSession(
+            _listing_page("fund1", "fund2"),
+            [_listing_page("fund1", "fund3"), _listing_page("fund4"), _listing_page("fund5", "fund6")],
+        )
+
+    @pytest.mark.unit
+    def test_extract_links(self):
+        """Test that only f22Link anchors are turned into absolute URLs."""
+        from get_funds_urls import extract_links
+
+        html = _listing_page("fund1") + '<a class="other-class" href="/mutual-funds/x">x</a>'
+        assert extract_links(html) == ["https://groww.in/mutual-funds/fund1"]
+
+    @pytest.mark.unit
+    def test_async_discovery_stops_on_exhausted_listing(self, session):
+        """Test that async discovery keeps page order and stops at the first page with no new links."""
+        import asyncio
+        import io
+        from get_funds_urls import discover_async
+
+        out = io.StringIO()
+        links = asyncio.run(discover_async(session, out, concurrency=2))
+
+        written = out.getvalue().split()
+        assert written == [f"https://groww.in/mutual-funds/fund{i}" for i in range(1, 7)]
+        assert links == set(written)
+        # Pages 0-2 have links, page 3 repeats page 2; nothing past that window is requested.
+        assert len(session.requested) == 5
+
+    @pytest.mark.unit
+    def test_filter_page_same_as_first_page(self):
+        """Test that a filter page listing page 0's funds doesn't end discovery after page 0."""
+        import asyncio
+        import io
+        from get_funds_urls import discover_async, discover_sequential
+
+        pages = [_listing_page("fund1", "fund2"), _listing_page("fund3"), _listing_page("fund4")]
+        expected = [f"https://groww.in/mutual-funds/fund{i}" for i in range(1, 5)]
+
+        sequential_out = io.StringIO()
+        discover_sequential(FakeSession(pages[0], pages), sequential_out)
+        async_out = io.StringIO()
+        asyncio.run(discover_async(FakeSession(pages[0], pages), async_out, concurrency=2))
+
+        assert sequential_out.getvalue().split() == expected
+        assert async_out.getvalue().split() == expected
+
+    @pytest.mark.unit
+    def test_sequential_matches_async(self, session):
+        """Test that both discovery modes write the same file."""
+        import asyncio
+        import io
+        from get_funds_urls import discover_async, discover_sequential
+
+        sequential_out = io.StringIO()
+        discover_sequential(session, sequential_out)
+        async_out = io.StringIO()
+        asyncio.run(discover_async(session, async_out, concurrency=3))
+
+        assert sequential_out.getvalue() == async_out.getvalue()
+
+    @pytest.mark.unit
+    def test_async_discovery_takes_rate_limit_tokens(self, session):
+        """Test that every listing request waits for a token, whatever the concurrency."""
+        import asyncio
+        import io
+        from get_funds_urls import discover_async
+
+        limiter = MagicMock()
+        asyncio.run(discover_async(session, io.StringIO(), concurrency=4, rate_limiter=limiter))
+
+        assert [c.args[0] for c in limiter.acquire.call_args_list] == session.requested
@@ -0,0 +1,69 @@
+"""
+Unit tests for the on-disk HTML cache (html_cache.py).
+"""
+
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from html_cache import HtmlCache
+
+
+class TestHtmlCache:
+    """Test cache storage, expiry and eviction."""
+
+    @pytest.mark.unit
+    def test_round_trip(self, tmp_path):
+        """Test that a stored page is returned unchanged."""
+        cache = HtmlCache(str(tmp_path))
+        cache.put("https://groww.in/mutual-funds/a", "<html>₹5,234 Cr</html>")
+
+        assert cache.get("https://groww.in/mutual-funds/a") == "<html>₹5,234 Cr</html>"
+        assert cache.get("https://groww.in/mutual-funds/b") is None
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    @pytest.mark.unit
+    def test_identical_pages_share_one_object(self, tmp_path):
+        """Test that pages are stored once per content hash."""
+        cache = HtmlCache(str(tmp_path))
+        cache.put("https://groww.in/mutual-funds/a", "<html>same</html>")
+        cache.put("https://groww.in/mutual-funds/b", "<html>same</html>")
+
+        objects = [f for _, _, files in os.walk(tmp_path / "objects") for f in files]
+        assert len(objects) == 1
+        assert cache.get("https://groww.in/mutual-funds/b") == "<html>same</html>"
+
+    @pytest.mark.unit
+    def test_expired_entries_miss(self, tmp_path):
+        """Test that entries older than the TTL are treated as misses and evicted."""
+        cache = HtmlCache(str(tmp_path), ttl=60)
+        cache.put("https://groww.in/mutual-funds/a", "<html>old</html>")
+
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(time, "time", lambda: 1e12)
+            assert cache.get("https://groww.in/mutual-funds/a") is None
+            cache.evict()
+
+        assert os.listdir(tmp_path / "urls") == []
+
+    @pytest.mark.unit
+    def test_size_cap_evicts_least_recently_used(self, tmp_path):
+        """Test that the oldest-accessed pages are evicted above max_bytes."""
+        cache = HtmlCache(str(tmp_path), max_bytes=None)
+        pages = {f"https://groww.in/mutual-funds/{i}": os.urandom(2000).hex() for i in range(3)}
+        for i, (url, html) in enumerate(pages.items()):
+            cache.put(url, html)
+            entry = cache._entry_path(url)
+            os.utime(entry, (1000 + i, 1000 + i))
+
+        cache.max_bytes = cache._total_bytes - 1
+        cache.evict()
+
+        urls = list(pages)
+        assert cache.get(urls[0]) is None
+        assert cache.get(urls[1]) == pages[urls[1]]
+        assert cache.get(urls[2]) == pages[urls[2]]
@@ -5,6 +5,7 @@ Integration tests for worker function and Excel output generation.
 import pytest
 import queue
 import threading
+from concurrent.futures import Future
 import pandas as pd
 import os
 import sys
@@ -12,7 +13,17 @@ from unittest.mock import MagicMock, patch
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from get_mutual_fund_details import worker, FundScraper
+from get_mutual_fund_details import (
+    worker, FundScraper, ParsePipeline, REPLAY_CHUNK, REPLAY_TASKS_PER_WORKER, main, parse_page,
+    replay_archive, save_results, COLUMNS
+)
+from html_cache import HtmlCache
+from fund_record import FundRecord
+from fund_state import FundState
+from journal import JOURNAL_FILE, Journal, load_journal
+from page_archive import PageArchive
+from retry import PermanentError, RetryScheduler
+from scrape_stats import ScrapeStats
 
 
 class TestWorkerFunction:
@@ -42,8 +53,11 @@ class TestWorkerFunction:
             MockScraper.return_value.__exit__.return_value = None
             
             # Run worker
-            worker(url_queue, results_list, failed_list)
+            with patch('get_mutual_fund_details.time.sleep') as mock_sleep:
+                worker(url_queue, results_list, failed_list)
             
+            # Pacing is the rate limiter's job, not a fixed sleep per URL
+            mock_sleep.assert_not_called()
             # Verify results
             assert len(results_list) == 1
             assert results_list[0]["Fund Name"] == "Test Fund"
@@ -68,8 +82,11 @@ class TestWorkerFunction:
             MockScraper.return_value.__exit__.return_value = None
             
             # Run worker
-            worker(url_queue, results_list, failed_list)
+            with patch('get_mutual_fund_details.time.sleep') as mock_sleep:
+                worker(url_queue, results_list, failed_list)
             
+            # Pacing is the rate limiter's job, not a fixed sleep per URL
+            mock_sleep.assert_not_called()
             # Verify results
             assert len(results_list) == 0
             assert len(failed_list) == 1
@@ -114,6 +131,46 @@ class TestWorkerFunction:
             assert url_queue.empty()
 
 
+class TestWorkerRetries:
+    """Test workers handing failures to the retry scheduler."""
+
+    @pytest.mark.integration
+    def test_transient_failure_is_retried(self):
+        """Test that a timed-out URL is scraped again after its backoff and a dead one is given up on."""
+        url_queue = queue.Queue()
+        for url in ["https://example.com/flaky", "https://example.com/gone", "https://example.com/ok"]:
+            url_queue.put(url)
+        results_list, failed_list = [], []
+        retries = RetryScheduler(base_delay=0.05, max_delay=0.05)
+        calls = []
+
+        scraper = MagicMock()
+
+        def scrape(url):
+            calls.append(url)
+            if url.endswith("gone"):
+                scraper.last_error = PermanentError("HTTP 404")
+                return None
+            if url.endswith("flaky") and calls.count(url) == 1:
+                scraper.last_error = TimeoutError("page load timed out")
+                return None
+            return {"Fund Name": url, "URL": url}
+
+        scraper.scrape_url.side_effect = scrape
+        factory = MagicMock()
+        factory.return_value.__enter__.return_value = scraper
+
+        worker(url_queue, results_list, failed_list, factory, retries)
+
+        # The retry waits for its backoff instead of the URLs behind it.
+        assert calls == ["https://example.com/flaky", "https://example.com/gone", "https://example.com/ok",
+                         "https://example.com/flaky"]
+        assert sorted(r["URL"] for r in results_list) == ["https://example.com/flaky", "https://example.com/ok"]
+        assert failed_list == ["https://example.com/gone"]
+        assert retries.permanent["https://example.com/gone"]["reason"] == "HTTP 404"
+        assert url_queue.unfinished_tasks == 0
+
+
 class TestExcelOutput:
     """Test Excel output generation."""
     
@@ -198,3 +255,274 @@ class TestExcelOutput:
         assert len(data_by_fund_type["Equity"]) == 2
         assert len(data_by_fund_type["Debt"]) == 1
         assert len(data_by_fund_type["Hybrid"]) == 1
+
+
+class TestReplay:
+    """Test offline replay of an archived crawl."""
+
+    @pytest.mark.integration
+    def test_replay_archive_to_excel(self, tmp_path):
+        """Test that archived pages are parsed without a browser and saved like a live run."""
+        fixture_path = os.path.join(os.path.dirname(__file__), 'fixtures', 'sample_fund_page.html')
+        with open(fixture_path, 'r', encoding='utf-8') as f:
+            html = f.read()
+
+        archive_path = str(tmp_path / "crawl.jsonl.gz")
+        with PageArchive(archive_path) as archive:
+            archive.write("https://groww.in/mutual-funds/a", html)
+            archive.write("https://groww.in/mutual-funds/b", html)
+
+        with patch.object(FundScraper, 'setup_driver') as mock_setup:
+            results, failed = replay_archive(archive_path, max_workers=2)
+        mock_setup.assert_not_called()
+
+        assert failed == []
+        assert [r["URL"] for r in results] == ["https://groww.in/mutual-funds/a",
+                                                "https://groww.in/mutual-funds/b"]
+        assert results[0]["AUM"] == "₹5,234.56 Cr"
+
+        filename = save_results(results, str(tmp_path / "out.xlsx"))
+        df = pd.read_excel(filename, sheet_name="Large Cap")
+        expected = []
+        for col in COLUMNS:
+            expected.append(col)
+            if col.endswith(" Rank"):
+                expected.append(col.replace("Rank", "Category Size"))
+        assert list(df.columns) == expected
+        assert len(df) == 2
+        assert df["AUM"].tolist() == [5234.56, 5234.56]
+        assert df["3Y Rank"].tolist() == [32, 32]
+
+
+    @pytest.mark.integration
+    def test_replay_reads_archive_as_it_goes(self, tmp_path):
+        """Test that only a bounded window of archived pages is submitted ahead of the results."""
+        def archive_pages(path):
+            for i in range(50):
+                yield f"https://groww.in/mutual-funds/f{i}", "<html></html>"
+
+        class InlineExecutor:
+            """Runs tasks on result(), tracking how many pages were handed out but not collected."""
+            def __init__(self, **kwargs):
+                self.outstanding = self.peak = 0
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def submit(self, fn, items, parser_options):
+                self.outstanding += len(items)
+                self.peak = max(self.peak, self.outstanding)
+                future = MagicMock()
+
+                def result():
+                    self.outstanding -= len(items)
+                    return [(url, {"URL": url}, {}) for url, _ in items]
+                future.result.side_effect = result
+                executors.append(self)
+                return future
+
+        executors = []
+        with patch('get_mutual_fund_details.iter_archive', archive_pages), \
+                patch('get_mutual_fund_details.ProcessPoolExecutor', InlineExecutor):
+            results, failed = replay_archive("crawl.jsonl.gz", max_workers=2)
+
+        assert [r["URL"] for r in results] == [f"https://groww.in/mutual-funds/f{i}" for i in range(50)]
+        assert failed == []
+        assert executors[0].peak <= 2 * REPLAY_TASKS_PER_WORKER * REPLAY_CHUNK
+
+
+class TestResume:
+    """Test checkpointing a run and resuming it after a crash."""
+
+    @pytest.mark.integration
+    def test_resume_skips_journaled_urls(self, tmp_path, monkeypatch):
+        """Test that a resumed run only scrapes unfinished URLs and outputs every record."""
+        monkeypatch.chdir(tmp_path)
+        urls = [f"https://groww.in/mutual-funds/f{i}" for i in range(4)]
+        (tmp_path / "mutual_funds_links.txt").write_text("\n".join(urls) + "\n")
+        with Journal("journal.jsonl") as journal:
+            for url in urls[:2]:
+                journal.write(url, FundRecord({"Fund Name": url, "Fund Type": "Equity", "URL": url}))
+
+        scraped = []
+
+        def fake_worker(url_queue, results_list, failed_list, scraper_factory, retries=None):
+            with scraper_factory() as scraper:
+                while not url_queue.empty():
+                    url = url_queue.get()
+                    scraped.append(url)
+                    results_list.append(scraper._complete(url, FundRecord({"Fund Name": url, "Fund Type": "Equity"})))
+                    url_queue.task_done()
+
+        with patch('get_mutual_fund_details.worker', fake_worker), \
+                patch('get_mutual_fund_details.save_results') as mock_save:
+            main(['--engine', 'http', '--workers', '1', '--rate', '0', '--resume', '--journal', 'journal.jsonl',
+                  '--stats-json', '', '--failures-json', ''])
+
+        assert scraped == urls[2:]
+        saved = mock_save.call_args[0][0]
+        assert sorted(r["URL"] for r in saved) == urls
+        # The results are saved, so the checkpoint is gone.
+        assert not os.path.exists("journal.jsonl")
+
+    @pytest.mark.integration
+    def test_back_to_back_runs_with_default_journal(self, tmp_path, monkeypatch):
+        """Test that a finished run's journal doesn't stop the next run from scraping."""
+        monkeypatch.chdir(tmp_path)
+        urls = [f"https://groww.in/mutual-funds/f{i}" for i in range(3)]
+        (tmp_path / "mutual_funds_links.txt").write_text("\n".join(urls) + "\n")
+        scraped = []
+
+        def fake_worker(url_queue, results_list, failed_list, scraper_factory, retries=None):
+            with scraper_factory() as scraper:
+                while not url_queue.empty():
+                    url = url_queue.get()
+                    scraped.append(url)
+                    results_list.append(scraper._complete(url, FundRecord({"Fund Name": url, "Fund Type": "Equity"})))
+                    url_queue.task_done()
+
+        with patch('get_mutual_fund_details.worker', fake_worker), \
+                patch('get_mutual_fund_details.save_results') as mock_save:
+            for _ in range(2):
+                main(['--engine', 'http', '--workers', '1', '--rate', '0', '--state-db', '',
+                      '--stats-json', '', '--failures-json', ''])
+
+        assert scraped == urls + urls
+        assert mock_save.call_count == 2
+        assert not os.path.exists(JOURNAL_FILE)
+
+    @pytest.mark.integration
+    def test_journal_kept_when_saving_fails(self, tmp_path, monkeypatch):
+        """Test that a run whose results can't be saved keeps its journal for --resume."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "mutual_funds_links.txt").write_text("https://groww.in/mutual-funds/f0\n")
+
+        def fake_worker(url_queue, results_list, failed_list, scraper_factory, retries=None):
+            with scraper_factory() as scraper:
+                url = url_queue.get()
+                results_list.append(scraper._complete(url, FundRecord({"Fund Name": "F0", "Fund Type": "Equity"})))
+                url_queue.task_done()
+
+        with patch('get_mutual_fund_details.worker', fake_worker), \
+                patch('get_mutual_fund_details.save_results', side_effect=OSError("disk full")):
+            with pytest.raises(OSError):
+                main(['--engine', 'http', '--workers', '1', '--rate', '0', '--journal', 'journal.jsonl',
+                      '--state-db', '', '--stats-json', '', '--failures-json', ''])
+
+        assert list(load_journal("journal.jsonl")) == ["https://groww.in/mutual-funds/f0"]
+
+    @pytest.mark.integration
+    def test_restart_without_resume_keeps_journal(self, tmp_path, monkeypatch):
+        """Test that forgetting --resume stops the run instead of wiping the checkpoint."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "mutual_funds_links.txt").write_text("https://groww.in/mutual-funds/f0\n")
+        with Journal("journal.jsonl") as journal:
+            journal.write("https://groww.in/mutual-funds/f0", FundRecord({"Fund Name": "F0"}))
+
+        with patch('get_mutual_fund_details.worker') as mock_worker, \
+                patch('get_mutual_fund_details.save_results') as mock_save:
+            main(['--engine', 'http', '--rate', '0', '--journal', 'journal.jsonl', '--state-db', '',
+                  '--stats-json', '', '--failures-json', ''])
+
+        mock_worker.assert_not_called()
+        mock_save.assert_not_called()
+        assert list(load_journal("journal.jsonl")) == ["https://groww.in/mutual-funds/f0"]
+
+    @pytest.mark.integration
+    def test_incremental_run_only_scrapes_stale_funds(self, tmp_path, monkeypatch):
+        """Test that funds scraped within the TTL are reused from the state db instead of re-scraped."""
+        monkeypatch.chdir(tmp_path)
+        urls = [f"https://groww.in/mutual-funds/f{i}" for i in range(4)]
+        (tmp_path / "mutual_funds_links.txt").write_text("\n".join(urls) + "\n")
+        with FundState("state.db") as state:
+            state.record([FundRecord({"Fund Name": url, "Fund Type": "Equity", "URL": url}) for url in urls[:3]])
+            state.record([FundRecord({"Fund Name": "Renamed", "Fund Type": "Equity", "URL": urls[2]})])
+
+        scraped = []
+
+        def fake_worker(url_queue, results_list, failed_list, scraper_factory, retries=None):
+            while not url_queue.empty():
+                url = url_queue.get()
+                scraped.append(url)
+                results_list.append(FundRecord({"Fund Name": "Renamed", "Fund Type": "Equity", "URL": url}))
+                url_queue.task_done()
+
+        with patch('get_mutual_fund_details.worker', fake_worker), \
+                patch('get_mutual_fund_details.save_results') as mock_save:
+            main(['--engine', 'http', '--workers', '1', '--rate', '0', '--incremental', '--state-db', 'state.db',
+                  '--journal', '', '--stats-json', '', '--failures-json', ''])
+
+        # f2's name changed last time, f3 was never scraped.
+        assert scraped == urls[2:]
+        assert sorted(r["URL"] for r in mock_save.call_args[0][0]) == urls
+        with FundState("state.db") as state:
+            assert state.due(urls, ttl=3600) == []
+
+    @pytest.mark.integration
+    def test_pipeline_journals_parsed_records(self, tmp_path):
+        """Test that records parsed in other processes are checkpointed as they come back."""
+        path = str(tmp_path / "journal.jsonl")
+        with Journal(path) as journal:
+            pipeline = ParsePipeline(max_workers=1, journal=journal)
+            pipeline._collect("https://groww.in/mutual-funds/a", FundRecord({"Fund Name": "A"}))
+            pipeline._collect("https://groww.in/mutual-funds/b", None)
+            pipeline.close()
+
+        assert list(load_journal(path)) == ["https://groww.in/mutual-funds/a"]
+
+
+class TestParsePipeline:
+    """Test parsing captured pages in separate processes."""
+
+    @pytest.mark.integration
+    def test_workers_hand_pages_to_parser_processes(self, tmp_path):
+        """Test that fetch threads only capture pages and the pipeline returns the parsed records."""
+        fixture_path = os.path.join(os.path.dirname(__file__), 'fixtures', 'sample_fund_page.html')
+        with open(fixture_path, 'r', encoding='utf-8') as f:
+            html = f.read()
+
+        cache = HtmlCache(str(tmp_path / "cache"))
+        urls = [f"https://groww.in/mutual-funds/f{i}" for i in range(5)]
+        url_queue = queue.Queue()
+        for url in urls:
+            cache.put(url, html)
+            url_queue.put(url)
+
+        results_list, failed_list = [], []
+        stats = ScrapeStats()
+        with ParsePipeline(max_workers=2, max_pending=2, stats=stats) as pipeline:
+            factory = lambda: FundScraper(cache=cache, offline=True, parse_pipeline=pipeline)
+            with patch('get_mutual_fund_details.time.sleep'), \
+                 patch.object(FundScraper, '_parse_html', side_effect=AssertionError("parsed in thread")):
+                worker(url_queue, results_list, failed_list, factory)
+            results, failed = pipeline.close()
+
+        assert results_list == []
+        assert failed_list == [] and failed == []
+        assert sorted(r["URL"] for r in results) == urls
+        assert all(r == parse_page(r["URL"], html) for r in results)
+        assert stats.stages['parse'][0] == 5
+        assert stats.fields["Fund Name"]["primary"] == 5
+
+    @pytest.mark.unit
+    def test_submit_blocks_when_queue_full(self):
+        """Test that fetchers wait once max_pending pages are unparsed."""
+        pipeline = ParsePipeline(max_workers=1, max_pending=1)
+        pipeline._executor.shutdown()
+        futures = []
+        pipeline._executor = MagicMock()
+        pipeline._executor.submit.side_effect = lambda *a: futures.append(Future()) or futures[-1]
+
+        pipeline.submit("https://groww.in/mutual-funds/a", "<html></html>")
+        second = threading.Thread(target=pipeline.submit, args=("https://groww.in/mutual-funds/b", "<html></html>"))
+        second.start()
+        second.join(timeout=0.2)
+        assert second.is_alive()
+
+        futures[0].set_result(("https://groww.in/mutual-funds/a", {"URL": "https://groww.in/mutual-funds/a"}, {}))
+        second.join(timeout=2)
+        assert not second.is_alive()
+        assert pipeline.results == [{"URL": "https://groww.in/mutual-funds/a"}]
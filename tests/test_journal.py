@@ -0,0 +1,75 @@
+"""
+Unit tests for the checkpoint journal (journal.py).
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fund_record import FundRecord
+from journal import Journal, load_journal
+
+
+class TestJournal:
+    """Test checkpointing records and reading them back."""
+
+    @pytest.mark.unit
+    def test_round_trip(self, tmp_path):
+        """Test that every written record is loaded back by URL."""
+        path = str(tmp_path / "journal.jsonl")
+        record = FundRecord({"Fund Name": "Fund A ₹", "AUM": "₹5,234.56 Cr", "URL": "https://groww.in/a"})
+        with Journal(path) as journal:
+            journal.write("https://groww.in/a", record)
+            journal.write("https://groww.in/b", {"Fund Name": "Fund B", "URL": "https://groww.in/b"})
+
+        completed = load_journal(path)
+        assert list(completed) == ["https://groww.in/a", "https://groww.in/b"]
+        assert isinstance(completed["https://groww.in/a"], FundRecord)
+        assert completed["https://groww.in/a"] == record
+        assert completed["https://groww.in/b"]["Fund Name"] == "Fund B"
+        assert load_journal(str(tmp_path / "missing.jsonl")) == {}
+
+    @pytest.mark.unit
+    def test_resume_after_torn_write(self, tmp_path):
+        """Test that a line torn by a crash is skipped and resuming appends cleanly after it."""
+        path = str(tmp_path / "journal.jsonl")
+        with Journal(path) as journal:
+            journal.write("https://groww.in/a", {"Fund Name": "A"})
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write('{"url": "https://groww.in/b", "record": {"Fund')
+
+        with Journal(path, resume=True) as journal:
+            journal.write("https://groww.in/c", {"Fund Name": "C"})
+
+        assert list(load_journal(path)) == ["https://groww.in/a", "https://groww.in/c"]
+
+    @pytest.mark.unit
+    def test_existing_journal_kept_without_resume(self, tmp_path):
+        """Test that a new run refuses to truncate a journal unless told to overwrite it."""
+        path = str(tmp_path / "journal.jsonl")
+        with Journal(path) as journal:
+            journal.write("https://groww.in/a", {"Fund Name": "A"})
+
+        with pytest.raises(FileExistsError):
+            Journal(path)
+        assert list(load_journal(path)) == ["https://groww.in/a"]
+
+        with Journal(path, overwrite=True) as journal:
+            journal.write("https://groww.in/b", {"Fund Name": "B"})
+        assert list(load_journal(path)) == ["https://groww.in/b"]
+
+    @pytest.mark.unit
+    def test_discard_removes_file(self, tmp_path):
+        """Test that a discarded journal is closed and deleted, so the next run starts clean."""
+        path = str(tmp_path / "journal.jsonl")
+        journal = Journal(path)
+        journal.write("https://groww.in/a", {"Fund Name": "A"})
+        journal.discard()
+
+        assert not os.path.exists(path)
+        with Journal(path) as journal:
+            journal.write("https://groww.in/b", {"Fund Name": "B"})
+        assert list(load_journal(path)) == ["https://groww.in/b"]
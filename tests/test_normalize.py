@@ -0,0 +1,76 @@
+"""
+Unit tests for the typed normalization of scraped fields.
+"""
+
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from normalize import normalize_frame, split_rank, to_float
+
+
+class TestToFloat:
+    """Test numeric conversion of scraped strings."""
+
+    @pytest.mark.unit
+    def test_amounts_and_percentages(self):
+        """Test that currency, thousands separators, units and signs are handled."""
+        series = pd.Series(["₹5,234.56 Cr", "1,234.5", "15.2%", "−0.4%", "+3%", "25.4"])
+
+        assert to_float(series).tolist() == [5234.56, 1234.5, 15.2, -0.4, 3.0, 25.4]
+
+    @pytest.mark.unit
+    def test_sentinels_become_null(self):
+        """Test that NA, dashes and missing cells become nulls instead of strings."""
+        result = to_float(pd.Series(["NA", "--", None, ""]))
+
+        assert str(result.dtype) == "Float64"
+        assert result.isna().all()
+
+
+class TestSplitRank:
+    """Test splitting category ranks."""
+
+    @pytest.mark.unit
+    def test_position_and_size(self):
+        """Test that '3/45' splits into 3 and 45 and a bare rank has no size."""
+        position, size = split_rank(pd.Series(["3/45", " 12 / 130", "45", "NA"]))
+
+        assert position.tolist() == [3, 12, 45, pd.NA]
+        assert size.tolist() == [45, 130, pd.NA, pd.NA]
+        assert str(position.dtype) == "Int64"
+
+
+class TestNormalizeFrame:
+    """Test normalizing an assembled results frame."""
+
+    @pytest.fixture
+    def frame(self):
+        return pd.DataFrame([
+            {"Fund Name": "Fund A", "AUM": "₹1,000 Cr", "1Y Rank": "3/45", "Sharpe": "1.45", "Benchmark": "NA"},
+            {"Fund Name": "Fund B", "AUM": "NA", "1Y Rank": "NA", "Sharpe": "NA", "Benchmark": "Nifty 50 TRI"},
+        ])
+
+    @pytest.mark.unit
+    def test_typed_columns(self, frame):
+        """Test that numeric columns are typed, ranks split and text NA nulled."""
+        result = normalize_frame(frame)
+
+        assert list(result.columns) == ["Fund Name", "AUM", "1Y Rank", "1Y Category Size", "Sharpe", "Benchmark"]
+        assert result["AUM"].tolist() == [1000.0, pd.NA]
+        assert result["1Y Category Size"].tolist() == [45, pd.NA]
+        assert result["Sharpe"].sum() == 1.45
+        assert result["Benchmark"].isna().tolist() == [True, False]
+
+    @pytest.mark.unit
+    def test_keep_raw(self, frame):
+        """Test that raw strings are only written when asked for, next to their column."""
+        result = normalize_frame(frame, keep_raw=True)
+
+        assert list(result.columns) == ["Fund Name", "AUM", "AUM (raw)", "1Y Rank", "1Y Category Size",
+                                        "1Y Rank (raw)", "Sharpe", "Sharpe (raw)", "Benchmark"]
+        assert result["AUM (raw)"].tolist() == ["₹1,000 Cr", "NA"]
@@ -0,0 +1,53 @@
+"""
+Unit tests for the page-source archive (page_archive.py).
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from page_archive import PageArchive, iter_archive
+
+
+class TestPageArchive:
+    """Test writing and reading archived page sources."""
+
+    @pytest.mark.unit
+    def test_round_trip(self, tmp_path):
+        """Test that pages come back in the order they were archived."""
+        path = str(tmp_path / "crawl.jsonl.gz")
+        with PageArchive(path) as archive:
+            archive.write("https://groww.in/mutual-funds/a", "<html>a ₹</html>")
+            archive.write("https://groww.in/mutual-funds/b", "<html>b</html>")
+
+        assert list(iter_archive(path)) == [
+            ("https://groww.in/mutual-funds/a", "<html>a ₹</html>"),
+            ("https://groww.in/mutual-funds/b", "<html>b</html>"),
+        ]
+
+    @pytest.mark.unit
+    def test_appends_across_runs(self, tmp_path):
+        """Test that reopening an archive appends instead of truncating."""
+        path = str(tmp_path / "crawl.jsonl.gz")
+        with PageArchive(path) as archive:
+            archive.write("https://groww.in/mutual-funds/a", "<html>a</html>")
+        with PageArchive(path) as archive:
+            archive.write("https://groww.in/mutual-funds/b", "<html>b</html>")
+
+        assert [url for url, _ in iter_archive(path)] == [
+            "https://groww.in/mutual-funds/a",
+            "https://groww.in/mutual-funds/b",
+        ]
+
+    @pytest.mark.unit
+    def test_unclosed_archive_is_readable(self, tmp_path):
+        """Test that records survive a run that never closed the archive."""
+        path = str(tmp_path / "crawl.jsonl.gz")
+        archive = PageArchive(path)
+        archive.write("https://groww.in/mutual-funds/a", "<html>a</html>")
+
+        assert list(iter_archive(path)) == [("https://groww.in/mutual-funds/a", "<html>a</html>")]
+        archive.close()
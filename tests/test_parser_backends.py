@@ -0,0 +1,95 @@
+"""
+Equivalence tests for the pluggable HTML parser backends and partial parsing.
+
+Every backend, with or without partial parsing, must produce exactly the
+records the full html.parser reference produces for each page in
+tests/fixtures.
+"""
+
+import glob
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from get_mutual_fund_details import FundScraper, available_parser_backends, make_soup
+
+FIXTURES = sorted(glob.glob(os.path.join(os.path.dirname(__file__), 'fixtures', '*.html')))
+ALTERNATE_BACKENDS = [b for b in available_parser_backends() if b != 'html.parser']
+
+
+@pytest.mark.unit
+@pytest.mark.skipif(not ALTERNATE_BACKENDS, reason="no alternate parser backend installed")
+@pytest.mark.parametrize("backend", ALTERNATE_BACKENDS)
+@pytest.mark.parametrize("fixture", FIXTURES, ids=os.path.basename)
+def test_backend_matches_reference(backend, fixture):
+    """Test that a backend's record matches the html.parser record field for field."""
+    with open(fixture, 'r', encoding='utf-8') as f:
+        html = f.read()
+
+    reference = FundScraper(parser_backend='html.parser')._parse_html(html)
+    result = FundScraper(parser_backend=backend)._parse_html(html)
+
+    assert result == reference
+    assert result["Fund Name"] != "NA"
+
+
+@pytest.mark.unit
+def test_unknown_backend_rejected():
+    """Test that only registered backends can be requested."""
+    with pytest.raises(ValueError):
+        make_soup("<html></html>", "selectolax")
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("backend", available_parser_backends())
+@pytest.mark.parametrize("fixture", FIXTURES, ids=os.path.basename)
+def test_partial_parse_matches_reference(backend, fixture):
+    """Test that parsing only the extractor targets yields the full-parse record."""
+    with open(fixture, 'r', encoding='utf-8') as f:
+        html = f.read()
+
+    reference = FundScraper(parser_backend='html.parser')._parse_html(html)
+    result = FundScraper(parser_backend=backend, partial_parse=True)._parse_html(html)
+
+    assert result == reference
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("backend", available_parser_backends())
+def test_partial_soup_keeps_only_targets(backend):
+    """Test that the partial tree holds the target subtrees and nothing else."""
+    html = """
+    <html><head><script>var big = 1;</script></head><body>
+      <nav><a href="/">Home</a></nav>
+      <h1 class="mfh239SchemeName">Example Fund</h1>
+      <div class="other"><table><tr><td>1</td></tr></table></div>
+      <div class="fm982CardText"><span>Manager</span></div>
+      <footer>Footer text</footer>
+    </body></html>
+    """
+    soup = make_soup(html, backend, partial=True)
+
+    assert soup.find('h1').get_text() == "Example Fund"
+    assert len(soup.find_all('table')) == 1
+    assert soup.find('span').get_text() == "Manager"
+    assert soup.find('script') is None
+    assert soup.find('nav') is None
+    assert "Footer text" not in soup.get_text()
+
+
+@pytest.mark.unit
+def test_partial_parse_aum_text_fallback():
+    """Test that the AUM text fallback still searches the full page when partial."""
+    html = """
+    <html><body>
+      <h1 class="mfh239SchemeName">Example Fund</h1>
+      <section><p>Fund size</p><p>Rs. 1,234.5 Cr</p></section>
+    </body></html>
+    """
+    reference = FundScraper()._parse_html(html)
+    result = FundScraper(partial_parse=True)._parse_html(html)
+
+    assert result["AUM"] == reference["AUM"]
@@ -0,0 +1,77 @@
+"""
+Unit tests for the per-host token-bucket rate limiter.
+"""
+
+import multiprocessing
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rate_limiter import RateLimiter, fcntl, host_of
+
+
+def _acquire_many(state_dir, n, start):
+    limiter = RateLimiter(rate=20, burst=1, state_dir=state_dir)
+    for _ in range(n):
+        limiter.acquire("https://groww.in/mutual-funds/x")
+    return time.time() - start
+
+
+class TestRateLimiter:
+    """Test token-bucket pacing."""
+
+    @pytest.mark.unit
+    def test_threads_share_one_budget(self):
+        """Test that concurrent threads are paced at the rate, not at rate x threads."""
+        limiter = RateLimiter(rate=50, burst=1)
+        start = time.monotonic()
+
+        def fetch():
+            for _ in range(5):
+                limiter.acquire("https://groww.in/mutual-funds/x")
+
+        threads = [threading.Thread(target=fetch) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        # 20 tokens at 50/s with a burst of 1: the last one is due after 19/50 s.
+        assert time.monotonic() - start == pytest.approx(19 / 50, abs=0.1)
+
+    @pytest.mark.unit
+    def test_burst_then_rate(self):
+        """Test that an idle bucket allows `burst` fetches without waiting."""
+        limiter = RateLimiter(rate=10, burst=3)
+
+        waits = [limiter.acquire("https://groww.in/a") for _ in range(4)]
+
+        assert waits[:3] == [0.0, 0.0, 0.0]
+        assert waits[3] == pytest.approx(0.1, abs=0.02)
+
+    @pytest.mark.unit
+    def test_hosts_are_independent(self):
+        """Test that each host has its own bucket."""
+        limiter = RateLimiter(rate=1, burst=1)
+
+        assert limiter.acquire("https://groww.in/a") == 0.0
+        assert limiter.acquire("https://assets-netstorage.groww.in/b") == 0.0
+        assert host_of(" https://groww.in/mutual-funds/x ") == "groww.in"
+
+    @pytest.mark.integration
+    @pytest.mark.skipif(fcntl is None, reason="shared rate limits need fcntl")
+    def test_processes_share_state_dir(self, tmp_path):
+        """Test that processes using the same state directory split one budget."""
+        ctx = multiprocessing.get_context('spawn')
+        start = time.time() + 2  # after both children have imported
+        with ctx.Pool(2) as pool:
+            time.sleep(max(0, start - time.time()))
+            elapsed = pool.starmap(_acquire_many, [(str(tmp_path), 5, start), (str(tmp_path), 5, start)])
+
+        # 10 tokens at 20/s with a burst of 1 take at least 9/20 s in total.
+        assert max(elapsed) >= 9 / 20 - 0.05
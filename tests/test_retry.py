@@ -0,0 +1,103 @@
+"""
+Unit tests for failure classification and the delayed-retry scheduler.
+"""
+
+import json
+import os
+import queue
+import sys
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from retry import PermanentError, RetryableError, RetryScheduler, classify_failure
+
+
+def http_error(status):
+    error = Exception(f"{status} error")
+    error.response = MagicMock(status_code=status)
+    return error
+
+
+class TestClassifyFailure:
+    """Test sorting failures into retryable and permanent."""
+
+    @pytest.mark.unit
+    def test_classification(self):
+        """Test that network trouble is retried and dead pages or parse bugs are not."""
+        assert classify_failure(TimeoutError("page load timed out")) == (True, "TimeoutError: page load timed out")
+        assert classify_failure(RetryableError("page blocked (empty_page)")) == (True, "page blocked (empty_page)")
+        assert classify_failure(http_error(503)) == (True, "HTTP 503")
+        assert classify_failure(http_error(429)) == (True, "HTTP 429")
+        assert classify_failure(http_error(404)) == (False, "HTTP 404")
+        assert classify_failure(PermanentError("not in cache (offline)")) == (False, "not in cache (offline)")
+        assert classify_failure(KeyError("AUM"))[0] is False
+        assert classify_failure(None) == (True, "no record")
+
+
+class TestRetryScheduler:
+    """Test per-URL attempts, backoff and the delayed-retry queue."""
+
+    @pytest.mark.unit
+    def test_backoff_grows_with_jitter(self):
+        """Test that each retry waits between half and all of a doubling, capped step."""
+        scheduler = RetryScheduler(base_delay=2, max_delay=10)
+        for attempt, step in [(1, 2), (2, 4), (3, 8), (4, 10), (9, 10)]:
+            delays = [scheduler.backoff(attempt) for _ in range(50)]
+            assert all(step / 2 <= d <= step for d in delays)
+            assert len(set(delays)) > 1
+
+    @pytest.mark.unit
+    def test_attempts_run_out(self):
+        """Test that a retryable URL is retried until max_attempts, then recorded with its reason."""
+        scheduler = RetryScheduler(max_attempts=3, base_delay=0)
+        url = "https://groww.in/mutual-funds/x"
+        assert scheduler.failed(url, TimeoutError("slow"))
+        assert scheduler.failed(url, TimeoutError("slow"))
+        assert not scheduler.failed(url, TimeoutError("slow"))
+        assert scheduler.permanent[url] == {"reason": "TimeoutError: slow", "attempts": 3, "retryable": True}
+        assert scheduler.retried == 2
+
+    @pytest.mark.unit
+    def test_permanent_failure_not_retried(self):
+        """Test that a permanent failure is given up on at once."""
+        scheduler = RetryScheduler()
+        assert not scheduler.failed("https://groww.in/mutual-funds/gone", http_error(404))
+        assert scheduler.pending == 0
+        assert scheduler.permanent["https://groww.in/mutual-funds/gone"]["reason"] == "HTTP 404"
+
+    @pytest.mark.unit
+    def test_backing_off_url_does_not_hold_up_others(self):
+        """Test that fresh URLs are handed out while a retry backs off, and the retry once it is due."""
+        scheduler = RetryScheduler(base_delay=0.2, max_delay=0.2)
+        url_queue = queue.Queue()
+        url_queue.put("https://groww.in/mutual-funds/fresh")
+        scheduler.failed("https://groww.in/mutual-funds/retry", TimeoutError("slow"))
+
+        start = time.monotonic()
+        assert scheduler.next_url(url_queue) == "https://groww.in/mutual-funds/fresh"
+        assert time.monotonic() - start < 0.05
+        assert scheduler.next_url(url_queue, wait=False) is None
+
+        assert scheduler.next_url(url_queue) == "https://groww.in/mutual-funds/retry"
+        assert 0.1 <= time.monotonic() - start < 0.5
+        assert scheduler.next_url(url_queue) is None
+
+    @pytest.mark.unit
+    def test_write_failures(self, tmp_path):
+        """Test that permanent failures are written with their reasons."""
+        scheduler = RetryScheduler()
+        scheduler.failed("https://groww.in/mutual-funds/gone", http_error(410))
+        scheduler.give_up("https://groww.in/mutual-funds/bad", "parse failed in parser process")
+
+        path = tmp_path / "failed.json"
+        scheduler.write_failures(str(path))
+
+        failures = json.loads(path.read_text())
+        assert [(f["url"], f["reason"]) for f in failures] == [
+            ("https://groww.in/mutual-funds/gone", "HTTP 410"),
+            ("https://groww.in/mutual-funds/bad", "parse failed in parser process"),
+        ]
@@ -0,0 +1,83 @@
+"""
+Unit tests for the run-wide scrape instrumentation.
+"""
+
+import json
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrape_stats import ScrapeStats
+
+
+class TestScrapeStats:
+    """Test stage timings, field sources and event counters."""
+
+    @pytest.mark.unit
+    def test_timer_records_stage(self):
+        """Test that timed stages accumulate count, total and max."""
+        stats = ScrapeStats()
+        for seconds in (0.25, 0.5):
+            stats.add_time('driver.get', seconds)
+        with stats.timer('soup'):
+            pass
+
+        data = stats.to_dict()
+        assert data["stages"]["driver.get"] == {"count": 2, "total_s": 0.75, "max_s": 0.5, "mean_ms": 375.0}
+        assert data["stages"]["soup"]["count"] == 1
+
+    @pytest.mark.unit
+    def test_concurrent_workers_aggregate(self):
+        """Test that one instance shared by worker threads loses no counts."""
+        stats = ScrapeStats()
+
+        def work():
+            for _ in range(500):
+                stats.record_fields({"AUM": "primary", "Alpha": "na"})
+                stats.count('wait.ready')
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert stats.fields["AUM"] == {"primary": 2000, "fallback": 0, "na": 0}
+        assert stats.events["wait.ready"] == 2000
+
+    @pytest.mark.unit
+    def test_merge_snapshot(self):
+        """Test that a parser process snapshot folds into the run's stats."""
+        parent, child = ScrapeStats(), ScrapeStats()
+        parent.add_time('parse', 0.1)
+        child.add_time('parse', 0.3)
+        child.record_fields({"AUM": "fallback"})
+        child.count('wait.timeout')
+
+        parent.merge(child.to_dict())
+
+        assert parent.stages['parse'][0] == 2
+        assert parent.stages['parse'][2] == pytest.approx(0.3)
+        assert parent.fields["AUM"]["fallback"] == 1
+        assert parent.events == {"wait.timeout": 1}
+
+    @pytest.mark.unit
+    def test_summary_and_json(self, tmp_path):
+        """Test the text tables and the machine-readable file."""
+        stats = ScrapeStats()
+        stats.add_time('driver.get', 1.5)
+        stats.add_time('soup', 0.05)
+        stats.record_fields({"AUM": "fallback"})
+        stats.count('http.chrome_fallback')
+
+        summary = stats.summary()
+        path = tmp_path / "stats.json"
+        stats.write_json(str(path))
+
+        assert summary.index('driver.get') < summary.index('soup')
+        assert "http.chrome_fallback" in summary
+        assert json.loads(path.read_text()) == stats.to_dict()